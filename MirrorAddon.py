@@ -9,7 +9,7 @@
 # 6. Once snapshoted edit the texture in preferred method (likely through the image editor or the texture editing mode on the object) to either use the changes as a mask for what to mirror ("Mirror Changes As Mask" button) or to mirror the changes made ("Mirror Changes" button)
 # 7. Ensure the wanted world axis for the mirror is selected using the x, y, or z buttons
 # 8. Press "Mirror Changes" or "Mirror Changes As Mask" button depending on wanted effect
-# 9. Optional: One axis can have its mirroring translations stored using the "Create Mapping" button with the wanted axis currently selected. This drastically speeds up mirroring, at the cost of a big upfront load. Only one mapping is stored at a time.
+# 9. Optional: One axis can have its mirroring translations stored using the "Create Mapping" button with the wanted axis currently selected. This drastically speeds up mirroring, at the cost of a big upfront load. Mappings for several axes and objects are kept at once.
 
 bl_info = {
     "name": "Mirrors Texture Changes",
@@ -21,7 +21,21 @@ import bpy
 import mathutils
 import math
 import time
+import tracemalloc
+import json
+import sys
+import argparse
+import struct
 import copy
+import collections
+import contextlib
+import concurrent.futures
+import multiprocessing
+import hashlib
+import os
+import shutil
+import tempfile
+import zlib
 import numpy as np
 import bmesh
 import blf
@@ -29,51 +43,846 @@ import gpu
 from gpu_extras.batch import batch_for_shader
 
 timeDebug = True # Variable for checking the run times of the functions
+mirrorRunTracing = [0, False] # how many runs are recording their peak memory, and whether they started tracemalloc (so it is left on when something else started it)
 
 
-# To Do:
-#- look into making a loading bar and having blender not freeze up when mirroring large chunks or making the map
-
 #Known issues:
 #- drawing over the mirror axis line or drawing on both sides of the mirror can cause drawing that is likely unwanted
 #- 3D mirror sometimes has small pixel gaps caused by the point acquired from geometry nodes getting stuck on edges, as they stick outward more, or it is failing to read the corresponding pixel values for edges. Bandade fix is use a subdivision modifier so more face area exists or use Pixel Gap Fill
 #- 2D mirroring will create small pixel gaps when mirroring on angles that are not multiples of 45 degrees. Bandade fix is to use Pixel Gap Fill
-#- Addon has no way of telling if object it is using as a reference has had its geometry altered in between snapshot and mirror, which can cause undesired effects.
+#- Addon has no way of telling if object it is using as a reference has had its geometry altered in between snapshot and mirror, which can cause undesired effects. (Mirror maps are checked for mesh changes and updated, but the snapshot itself is not)
 #- Geometry nodes and scripts likely run on cpu, which means expensive normally parallel computations like UV maps are far slower than they are supposed to be. Can't run cpu in parallel properly apparently in Blender (only runs one thread at a time)
 #- Likely Doesn't work if there are overlapping UVs
 
 
+class mirrorRunStats():
+
+    # Inputs: ---------------------
+    # operation is the name of what is being run (Ex. "Mirror Changes")
+    # trackMemory is whether to record the peak memory with tracemalloc, which slows python down while it is on
+    # Purpose: --------------------
+    # records how long each stage of one run of an operator takes (Ex. the diff or the write back) and how many pixels went through them
+    def __init__(self, operation, trackMemory = False):
+        self.operation = operation
+        self.stages = collections.OrderedDict() # stage name -> seconds, in the order they first ran
+        self.counts = collections.OrderedDict() # count name -> how many (Ex. pixels)
+        self.startTime = time.perf_counter()
+        self.seconds = None # the total once finished
+        self.peakBytes = None
+        self.cancelled = False
+        self.finished = False
+        self.tracing = trackMemory # until finish stops it
+        if (trackMemory):
+            if (mirrorRunTracing[0] == 0 and not tracemalloc.is_tracing()):
+                tracemalloc.start()
+                mirrorRunTracing[1] = True
+            mirrorRunTracing[0] += 1
+            if (mirrorRunTracing[0] == 1): # the peak isn't reset under a run that is already tracking, so runs at the same time share the higher peak instead of losing one
+                tracemalloc.reset_peak()
+
+    # times the code run inside the with, adding it to the stage (a stage can run more than once, Ex. each chunk of a modal mirror)
+    @contextlib.contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.addStageTime(name, time.perf_counter() - start)
+
+    # adds seconds to the stage, for stages that can't be put in a with
+    def addStageTime(self, name, seconds):
+        self.stages[name] = self.stages.get(name, 0) + seconds
+
+    # adds value to the count
+    def count(self, name, value):
+        self.counts[name] = self.counts.get(name, 0) + int(value)
+
+    # ends the run, recording the total time and the peak memory
+    def finish(self, cancelled = False):
+        self.finished = True
+        self.cancelled = cancelled
+        self.seconds = time.perf_counter() - self.startTime
+        if (self.tracing):
+            self.tracing = False
+            self.peakBytes = tracemalloc.get_traced_memory()[1]
+            mirrorRunTracing[0] -= 1
+            if (mirrorRunTracing[0] == 0 and mirrorRunTracing[1]): # the last run tracking memory stops tracemalloc if a run started it
+                tracemalloc.stop()
+                mirrorRunTracing[1] = False
+
+    # returns the fraction of the mirrored pixels whose mirror was already in the mapping (None if nothing was mirrored)
+    def mapHitRatio(self):
+        mapped = self.counts.get("mapped pixels", 0)
+        computed = self.counts.get("computed pixels", 0)
+        if (mapped + computed == 0):
+            return None
+        return mapped / (mapped + computed)
+
+    # returns the run as a dictionary for the JSON log
+    def toDict(self):
+        return {"operation": self.operation, "time": time.strftime("%Y-%m-%d %H:%M:%S"), "seconds": self.seconds, "cancelled": self.cancelled, "stages": dict(self.stages), "counts": dict(self.counts), "mapHitRatio": self.mapHitRatio(), "peakBytes": self.peakBytes}
+
+    # returns lines of text describing the run (used by the panel)
+    def describe(self):
+        lines = ["{}{}: {}s".format(self.operation, " (cancelled)" if self.cancelled else "", round(self.seconds or 0, 3))]
+        for name, seconds in self.stages.items():
+            lines.append("  {}: {}s".format(name, round(seconds, 3)))
+        for name, value in self.counts.items():
+            lines.append("  {}: {}".format(name, value))
+        if (self.mapHitRatio() is not None):
+            lines.append("  map hits: {}%".format(round(self.mapHitRatio() * 100, 1)))
+        if (self.peakBytes is not None):
+            lines.append("  peak memory: {} MB".format(round(self.peakBytes / (1024 * 1024), 1)))
+        return lines
+
+# Inputs: ------------------------
+# operation is the name of what is being run
+# context is the blender context
+# Purpose: -----------------------
+# returns a new run, which the stages and counts of the functions called inside recordingMirrorRun are added to until endMirrorRun
+# each operator or task keeps its own run, so two of them running at once (Ex. a modal mirror and a mapping) never record into each other's
+def startMirrorRun(operation, context):
+    return mirrorRunStats(operation, context.scene.snapshotObjectPointer.trackPeakMemory)
+
+# Inputs: ------------------------
+# run is the mirrorRunStats to add the stages and counts to
+# context is the blender context
+# Purpose: -----------------------
+# records into the run while the code inside the with runs (Ex. one step of a modal task), going back to the run recorded before after
+# the run is ended as cancelled if the code raises, so a failed operator never leaves tracemalloc on
+@contextlib.contextmanager
+def recordingMirrorRun(run, context):
+    previous = bpy.types.Scene.recordingMirrorRun
+    bpy.types.Scene.recordingMirrorRun = run
+    try:
+        yield run
+    except BaseException:
+        endMirrorRun(run, context, True)
+        raise
+    finally:
+        bpy.types.Scene.recordingMirrorRun = previous
+
+# records a whole run of operation while the code inside the with runs, ending it once that is done even if it raises
+@contextlib.contextmanager
+def recordMirrorRun(operation, context):
+    run = startMirrorRun(operation, context)
+    with recordingMirrorRun(run, context):
+        yield run
+    endMirrorRun(run, context)
+
+# ends the run, keeping it for the panel as the last run and adding it to the JSON log if one is set
+def endMirrorRun(run, context, cancelled = False):
+    if (run is None or run.finished):
+        return
+    run.finish(cancelled)
+    bpy.types.Scene.mirrorRun = run
+    logPath = bpy.path.abspath(context.scene.snapshotObjectPointer.mirrorRunLogPath)
+    if (logPath != ""):
+        try:
+            with open(logPath, "a") as file:
+                file.write(json.dumps(run.toDict()) + "\n") # one run a line, so runs can be appended
+        except OSError as error:
+            print("Error: Could not write to the run log: " + str(error))
+    if (timeDebug): # TIME
+        print("\n".join(run.describe()))
+
+# returns a context manager timing the stage of the run being recorded, or one that does nothing if no run is
+def mirrorStage(name):
+    run = bpy.types.Scene.recordingMirrorRun
+    if (run is None or run.finished):
+        return contextlib.nullcontext()
+    return run.stage(name)
+
+# adds seconds to the stage of the run being recorded, if there is one
+def mirrorStageTime(name, seconds):
+    run = bpy.types.Scene.recordingMirrorRun
+    if (run is not None and not run.finished):
+        run.addStageTime(name, seconds)
+
+# adds value to the count of the run being recorded, if there is one
+def mirrorCount(name, value):
+    run = bpy.types.Scene.recordingMirrorRun
+    if (run is not None and not run.finished):
+        run.count(name, value)
+
+snapshotTileSize = 64 # snapshots are stored as tiles of this many pixels square, so copies can share the tiles they haven't changed
+
+class snapshotBufferArena():
+
+    # Inputs: ---------------------
+    # maxPerSize is how many free buffers of each shape are kept for reuse
+    # Purpose: --------------------
+    # keeps the whole texture sized buffers that every mirror needs (Ex. the capture of the painted texture) so they are reused instead of allocated again, keyed by their shape (the resolution) and dtype
+    def __init__(self, maxPerSize = 2):
+        self.maxPerSize = maxPerSize
+        self.buffers = {} # (shape, dtype) to a list of free buffers
+
+    # returns a buffer of the shape and dtype, its contents are whatever was last in it
+    def take(self, shape, dtype = np.float32):
+        free = self.buffers.get((tuple(shape), np.dtype(dtype).str))
+        if (free):
+            return free.pop()
+        return np.empty(shape, dtype=dtype)
+
+    # gives a buffer back to be reused, it must not be used by the caller after this
+    def give(self, buffer):
+        free = self.buffers.setdefault((buffer.shape, buffer.dtype.str), [])
+        if (len(free) < self.maxPerSize):
+            free.append(buffer)
+
+    # returns how many bytes the free buffers take up
+    def totalBytes(self):
+        return sum(buffer.nbytes for free in self.buffers.values() for buffer in free)
+
+    # frees every buffer (Ex. when the addon is unregistered)
+    def clear(self):
+        self.buffers.clear()
+
+byteToFloat = np.arange(256, dtype=np.float32) * np.float32(1.0 / 255.0) # how blender turns the bytes of an 8 bit image into the floats of image.pixels
+
+# Input: ------------------
+# texture is an image texture
+# Purpose: ----------------
+# returns the smallest dtype that could hold the texture's pixels, uint8 for 8 bit images and float16 for float ones
+# blender's depth of a float image is its channels times 32 whether it is stored as half float or not, so float16 is always tried and compactCapture keeps float32 when it isn't lossless
+def snapshotStorageDtype(texture):
+    if (not texture.is_float):
+        return np.uint8
+    return np.float16
+
+# returns the pixel values as float32, which is what every calculation on them is done in (no copy for float32 values)
+def widenPixels(values):
+    if (values.dtype == np.uint8):
+        return byteToFloat[values]
+    return values.astype(np.float32, copy=False)
+
+# Input: ------------------
+# values is a float32 array of pixel values
+# dtype is the dtype to store them in
+# Purpose: ----------------
+# returns the values in dtype, or None if they can't be stored in it exactly (Ex. a blend between two 8 bit colours)
+def compactPixels(values, dtype):
+    if (dtype == np.float32):
+        return values
+    if (dtype == np.uint8):
+        compact = np.clip(np.rint(values * 255), 0, 255).astype(np.uint8)
+    else:
+        compact = values.astype(dtype)
+    if (not np.array_equal(widenPixels(compact), values)):
+        return None
+    return compact
+
 class textureSnapshot():
 
     # Inputs: ---------------------
     # texture is an image texture
-    # pixels is a vector
+    # pixels is a numpy array of shape (sizeY, sizeX, 4), float32 or one of the compact dtypes of snapshotStorageDtype
     # sizeX is the x size of the texture
     # sizeY is the y size of the texture
-    def __init__(self, texture = None, pixels = mathutils.Vector(), sizeX = 0, sizeY = 0):
+    # arena is the snapshotBufferArena to take the capture's buffer from, which release gives back (None allocates a new one)
+    # Note: the tiles start out as views into one array of the whole texture, a tile is only copied when a snapshot sharing it writes to it (copy on write)
+    # Note: a texture is stored in the compact dtype of its bit depth when that is lossless (an 8 bit texture takes a quarter of the memory), tiles written with values that dtype can't hold are widened to float32 on their own
+    def __init__(self, texture = None, pixels = None, sizeX = 0, sizeY = 0, arena = None):
         if (texture == None):
-            self.pixels = pixels # a vector of the pixels
+            if (pixels is None):
+                pixels = np.zeros((sizeY, sizeX, 4), dtype=np.float32)
             self.sizeX = sizeX # an int of the x size
             self.sizeY = sizeY # an int of the y size
         else:
-            self.pixels = mathutils.Vector(texture.pixels)
             self.sizeX = texture.size[0]
             self.sizeY = texture.size[1]
+            if (arena is None):
+                pixels = np.empty((self.sizeY, self.sizeX, 4), dtype=np.float32)
+            else:
+                pixels = arena.take((self.sizeY, self.sizeX, 4))
+            texture.pixels.foreach_get(pixels.reshape(-1)) # bulk copy, far faster than going through the pixels one at a time
+            compact = self.compactCapture(pixels, snapshotStorageDtype(texture), arena)
+            if (compact is not pixels):
+                if (arena is not None):
+                    arena.give(pixels) # the float capture is only needed until it is compacted
+                pixels = compact
+        self.arena = arena if texture is not None else None
+        self.buffer = pixels # the array the snapshot was made with, given back to the arena by release
+        self.bufferUsers = [1] # how many snapshots (this one and its copies) are still using the buffer, shared between them
+        self.tilesX = -(-self.sizeX // snapshotTileSize) # how many tiles across, the last column and row of tiles can be smaller
+        self.tilesY = -(-self.sizeY // snapshotTileSize)
+        self.tileUsers = []
+        self.bindTiles(pixels)
+
+    # Input: ---------------
+    # pixels is the float32 (sizeY, sizeX, 4) capture of a texture
+    # dtype is the dtype to try storing it in
+    # arena is the snapshotBufferArena to take the compact buffer from (or None)
+    # Purpose: -------------
+    # returns the capture in dtype, a band of rows at a time so the widened copy used to check it is lossless stays small, or the capture itself if it can't be stored in dtype exactly
+    def compactCapture(self, pixels, dtype, arena):
+        if (dtype == np.float32):
+            return pixels
+        shape = (self.sizeY, self.sizeX, 4)
+        compact = np.empty(shape, dtype=dtype) if arena is None else arena.take(shape, dtype)
+        for start in range(0, self.sizeY, snapshotTileSize):
+            band = compactPixels(pixels[start:start + snapshotTileSize], dtype)
+            if (band is None): # not actually of that bit depth (Ex. a byte image that was painted on in float)
+                if (arena is not None):
+                    arena.give(compact)
+                return pixels
+            compact[start:start + snapshotTileSize] = band
+        return compact
+
+    # Input: ---------------
+    # pixels is a (sizeY, sizeX, 4) array that this snapshot owns
+    # Purpose: -------------
+    # makes the tiles views into pixels, which becomes the base array that whole texture reads can use directly
+    def bindTiles(self, pixels):
+        size = snapshotTileSize
+        self.releaseTiles()
+        self.base = pixels # None once a tile stops being a view into it
+        self.tiles = [pixels[y:y + size, x:x + size] for y in range(0, self.sizeY, size) for x in range(0, self.sizeX, size)]
+        self.tileUsers = [[1] for tile in self.tiles] # how many snapshots are using each tile, shared between them like bufferUsers so a tile above 1 must be copied before being written
+        self.tileChecksums = [None] * len(self.tiles) # crc32 of each tile's content, worked out when first needed
+
+    # returns the (minX, minY, maxX, maxY) rectangle of the tile, max exclusive
+    def tileBounds(self, tileNum):
+        x = (tileNum % self.tilesX) * snapshotTileSize
+        y = (tileNum // self.tilesX) * snapshotTileSize
+        return x, y, min(x + snapshotTileSize, self.sizeX), min(y + snapshotTileSize, self.sizeY)
+
+    # returns the checksum of a tile's content, cached until the tile is written
+    def tileChecksum(self, tileNum):
+        if (self.tileChecksums[tileNum] is None):
+            self.tileChecksums[tileNum] = (self.tiles[tileNum].dtype.str, zlib.crc32(np.ascontiguousarray(self.tiles[tileNum])))
+        return self.tileChecksums[tileNum]
+
+    # Input: ---------------
+    # pixelNums is an array of pixel numbers (not multiplied by 4)
+    # Purpose: -------------
+    # splits the pixels up by the tile they are in, yielding (tileNum, positions in pixelNums, y in the tile, x in the tile) for each tile touched
+    def tileGroups(self, pixelNums):
+        pixelNums = np.asarray(pixelNums, dtype=np.int64)
+        if (len(pixelNums) == 0):
+            return
+        x = pixelNums % self.sizeX
+        y = pixelNums // self.sizeX
+        tileNums = (y // snapshotTileSize) * self.tilesX + x // snapshotTileSize
+        order = np.argsort(tileNums, kind='stable') # stable so later writes to the same pixel still win
+        sortedTiles = tileNums[order]
+        starts = np.flatnonzero(np.diff(sortedTiles, prepend=-1))
+        ends = np.append(starts[1:], len(order))
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            select = order[start:end]
+            yield int(sortedTiles[start]), select, y[select] % snapshotTileSize, x[select] % snapshotTileSize
+
+    # Input: ---------------
+    # pixelNums is an array of pixel numbers (not multiplied by 4)
+    # Purpose: -------------
+    # returns an (N, 4) array of the values of the pixels
+    def gather(self, pixelNums):
+        if (self.base is not None):
+            return widenPixels(self.base.reshape(-1, 4)[pixelNums])
+        values = np.empty((len(pixelNums), 4), dtype=np.float32)
+        for tileNum, select, tileY, tileX in self.tileGroups(pixelNums):
+            values[select] = widenPixels(self.tiles[tileNum][tileY, tileX])
+        return values
+
+    # Input: ---------------
+    # pixelNums is an array of pixel numbers (not multiplied by 4)
+    # values is an (N, 4) array of the new values of the pixels
+    # Purpose: -------------
+    # writes the values into the pixels, copying any tile that is shared with another snapshot first
+    # a compact tile is widened to float32 if the values can't be stored in its dtype exactly, so only the changed tiles take up the extra memory
+    def scatter(self, pixelNums, values):
+        values = np.asarray(values, dtype=np.float32)
+        for tileNum, select, tileY, tileX in self.tileGroups(pixelNums):
+            tile = self.tiles[tileNum]
+            tileValues = compactPixels(values[select], tile.dtype)
+            if (tileValues is None):
+                tile = widenPixels(tile).copy() # copy as widening a float32 tile wouldn't
+                tileValues = values[select]
+            elif (self.tileUsers[tileNum][0] > 1):
+                tile = tile.copy()
+            if (tile is not self.tiles[tileNum]):
+                self.tiles[tileNum] = tile
+                self.tileUsers[tileNum][0] -= 1 # the other snapshots keep the old tile
+                self.tileUsers[tileNum] = [1]
+                self.base = None # the tile is no longer a view into the base array
+            tile[tileY, tileX] = tileValues
+            self.tileChecksums[tileNum] = None
+
+    # returns a copy of the snapshot that shares all of its tiles until either one writes to them, so it costs almost nothing
+    def copy(self):
+        snapshot = copy.copy(self)
+        self.bufferUsers[0] += 1
+        snapshot.tiles = list(self.tiles)
+        snapshot.tileChecksums = list(self.tileChecksums)
+        for users in self.tileUsers:
+            users[0] += 1 # both snapshots have to copy the tile before writing to it now, until one of them lets go of it
+        snapshot.tileUsers = list(self.tileUsers)
+        return snapshot
+
+    # stops using the tiles, so the snapshots sharing them can write to them again without copying once they are the last user
+    def releaseTiles(self):
+        for users in self.tileUsers:
+            users[0] -= 1
+        self.tileUsers = []
+
+    # returns how many bytes of memory the snapshot's tiles take up, not counting the ones spilled to disk
+    def residentBytes(self):
+        return sum(tile.nbytes for tile in self.tiles if not isinstance(tile, np.memmap))
+
+    # Input: ---------------
+    # path is the .npy file to write the pixels to
+    # Purpose: -------------
+    # moves the pixels out of memory into a memory mapped file, which the operating system reads back in only as far as they are used
+    def spill(self, path):
+        checksums = self.tileChecksums
+        if (self.base is not None):
+            np.save(path, self.base)
+        else: # tiles of different dtypes have to be saved as one float32 array
+            np.save(path, self.densePixels())
+            checksums = None
+        self.bindTiles(np.load(path, mmap_mode='c')) # copy on write, so writes stay in memory and never reach the file
+        if (checksums is not None):
+            self.tileChecksums = checksums # same content in the same dtype
+
+    # says the snapshot won't be used anymore, giving its buffer back to the arena once none of its copies are using it either
+    def release(self):
+        if (self.buffer is None):
+            return
+        self.bufferUsers[0] -= 1
+        if (self.arena is not None and self.bufferUsers[0] == 0):
+            self.arena.give(self.buffer)
+        self.buffer = None
+        self.base = None
+        self.releaseTiles()
+        self.tiles = []
+        self.tileChecksums = []
+
+    # Input: ---------------
+    # minX, minY, maxX, maxY are the rectangle of pixels to read, max exclusive
+    # out is a float32 array of the rectangle's shape to read into (None makes one when needed)
+    # Purpose: -------------
+    # returns the pixels of the rectangle as a float32 (maxY - minY, maxX - minX, 4) array, which must not be written to
+    def readRegion(self, minX, minY, maxX, maxY, out = None):
+        if (self.base is not None and self.base.dtype == np.float32 and out is None):
+            return self.base[minY:maxY, minX:maxX]
+        region = np.empty((maxY - minY, maxX - minX, 4), dtype=np.float32) if out is None else out
+        if (self.base is not None):
+            region[:] = widenPixels(self.base[minY:maxY, minX:maxX])
+            return region
+        size = snapshotTileSize
+        for tileY in range(minY // size, -(-maxY // size)):
+            for tileX in range(minX // size, -(-maxX // size)):
+                x0, y0, x1, y1 = self.tileBounds(tileY * self.tilesX + tileX)
+                left = max(x0, minX)
+                bottom = max(y0, minY)
+                right = min(x1, maxX)
+                top = min(y1, maxY)
+                region[bottom - minY:top - minY, left - minX:right - minX] = widenPixels(self.tiles[tileY * self.tilesX + tileX][bottom - y0:top - y0, left - x0:right - x0])
+        return region
+
+    # returns a (sizeY, sizeX, 4) array of the whole texture for reading, which is only put together from the tiles if they aren't all views into one array
+    def densePixels(self):
+        return self.readRegion(0, 0, self.sizeX, self.sizeY)
+
+    # the float32 (sizeY, sizeX, 4) array of the pixels for code that edits the whole texture at once
+    # the snapshot stops sharing its tiles and being compact when this is used, and the checksums are forgotten as the array can be written through
+    @property
+    def pixels(self):
+        if (self.base is None or self.base.dtype != np.float32 or any(users[0] > 1 for users in self.tileUsers)):
+            self.bindTiles(np.array(self.densePixels(), dtype=np.float32)) # a copy, widened to float32 for the code editing it
+        else:
+            self.tileChecksums = [None] * len(self.tiles)
+        return self.base
 
     # Input: ---------------
     # snapShot1 is the first texture snapshot TYPE: textureSnapshot
     # snapShot2 is the second texture snapshot TYPE: textureSnapshot
     # Purpose: -------------
-    # returns the changes between the first and second texture
+    # returns the changes between the first and second texture as a textureDiff (None if the sizes don't match)
+    # tiles shared between the snapshots or with the same content are skipped, so snapshots that barely changed are compared quickly
+    # a matching checksum is only a hint, the tiles are still compared before being skipped as different content can have the same crc32
     def snapshotDifference(self, snapShot2):
-        tempDiff = []
         # checks compatibility by size
         if (self.sizeX == snapShot2.sizeX and self.sizeY == snapShot2.sizeY):
-            tempDiff = self.pixels - snapShot2.pixels
-            return  tempDiff # returns difference between pixels
+            indexParts = [np.zeros(0, dtype=np.int64)]
+            for tileNum in range(len(self.tiles)):
+                if (self.tiles[tileNum] is snapShot2.tiles[tileNum]):
+                    continue
+                tile1 = self.tiles[tileNum]
+                tile2 = snapShot2.tiles[tileNum]
+                if (tile1.dtype != tile2.dtype): # a widened tile against a compact one
+                    tile1 = widenPixels(tile1)
+                    tile2 = widenPixels(tile2)
+                elif (self.tileChecksum(tileNum) == snapShot2.tileChecksum(tileNum) and np.array_equal(tile1, tile2)):
+                    continue
+                minX, minY, maxX, maxY = self.tileBounds(tileNum)
+                y, x = np.nonzero(np.any(tile1 != tile2, axis=2))
+                indexParts.append((y + minY).astype(np.int64) * self.sizeX + x + minX)
+            indices = np.sort(np.concatenate(indexParts)) # in pixel order like a pass over the whole texture
+            values = self.gather(indices) - snapShot2.gather(indices)
+            return textureDiff(indices, values, self.sizeX, self.sizeY) # returns difference between pixels
         else:
             print("Error: sizes of textures do not match")
-            return [0]# return a pixel array for texture2's size that is all zeros
+            return None
+
+    # Input: ---------------
+    # snapShot2 is the second texture snapshot TYPE: textureSnapshot
+    # pixelNums is an array of the pixel numbers that could differ between the snapshots (Ex. the pixels written by a mirror)
+    # Purpose: -------------
+    # same as snapshotDifference, but only compares the given pixels so the work is bounded by what was written instead of the texture size
+    def snapshotDifferenceAt(self, snapShot2, pixelNums):
+        if (self.sizeX != snapShot2.sizeX or self.sizeY != snapShot2.sizeY):
+            print("Error: sizes of textures do not match")
+            return None
+        indices = np.unique(np.asarray(pixelNums, dtype=np.int64)) # sorted like the full difference
+        before = self.gather(indices)
+        after = snapShot2.gather(indices)
+        changed = np.any(before != after, axis=1)
+        return textureDiff(indices[changed], before[changed] - after[changed], self.sizeX, self.sizeY)
+
+    # returns a flat view of the pixels (every 4 values are one pixel's RGBA), useful for code working on pixel numbers
+    def flatPixels(self):
+        return self.pixels.reshape(-1)
+
+    # Input: ---------------
+    # texture is the image texture to write the snapshot's pixels into
+    # Purpose: -------------
+    # writes the snapshot back into the texture in one bulk transfer, returns False if the sizes don't match
+    def writeToTexture(self, texture):
+        if (texture.size[0] != self.sizeX or texture.size[1] != self.sizeY):
+            print("Error: Current texture and snapshot are of different sizes")
+            return False
+        if (self.arena is not None and (self.base is None or self.base.dtype != np.float32)): # the widened pixels go in a reused buffer
+            pixels = self.arena.take((self.sizeY, self.sizeX, 4))
+            texture.pixels.foreach_set(self.readRegion(0, 0, self.sizeX, self.sizeY, out = pixels).reshape(-1))
+            self.arena.give(pixels)
+        else:
+            texture.pixels.foreach_set(self.densePixels().reshape(-1))
+        texture.update() # foreach_set doesn't tag the image for redrawing
+        return True
+
+    # Input: ---------------
+    # texture is the image texture to write the snapshot's pixels into
+    # regions is a list of (minX, minY, maxX, maxY) rectangles from pixelRegions, the only places the texture and snapshot differ
+    # Purpose: -------------
+    # writes only the regions back into the texture, falling back to the bulk write when the regions cover a large part of it
+    # every slice assignment to texture.pixels goes through the whole image, so the texture is read once, the regions are patched in numpy, and it is written back once
+    def writeRegionsToTexture(self, texture, regions):
+        if (texture.size[0] != self.sizeX or texture.size[1] != self.sizeY):
+            print("Error: Current texture and snapshot are of different sizes")
+            return False
+        if (len(regions) == 0):
+            return True
+        area = sum((maxX - minX) * (maxY - minY) for minX, minY, maxX, maxY in regions)
+        if (area * regionWriteFraction > self.sizeX * self.sizeY): # widening every tile is cheaper than reading the texture back past this point
+            return self.writeToTexture(texture)
+        if (self.arena is not None):
+            pixels = self.arena.take((self.sizeY, self.sizeX, 4))
+        else:
+            pixels = np.empty((self.sizeY, self.sizeX, 4), dtype=np.float32)
+        texture.pixels.foreach_get(pixels.reshape(-1))
+        for minX, minY, maxX, maxY in regions:
+            self.readRegion(minX, minY, maxX, maxY, out = pixels[minY:maxY, minX:maxX]) # only the tiles under the regions are widened
+        texture.pixels.foreach_set(pixels.reshape(-1))
+        if (self.arena is not None):
+            self.arena.give(pixels)
+        texture.update() # foreach_set doesn't tag the image for redrawing
+        return True
+
+class textureDiff():
+
+    # Inputs: ---------------------
+    # indices is an array of the pixel numbers (not multiplied by 4) that are different between two snapshots
+    # values is an (N, 4) float32 array of how much each of those pixels changed
+    # sizeX is the x size of the texture
+    # sizeY is the y size of the texture
+    # Note: only the changed pixels are stored, so a small stroke takes up very little memory compared to a whole texture
+    def __init__(self, indices = None, values = None, sizeX = 0, sizeY = 0):
+        if (indices is None):
+            indices = np.zeros(0, dtype=np.int64)
+        if (values is None):
+            values = np.zeros((0, 4), dtype=np.float32)
+        self.indices = indices
+        self.values = values
+        self.sizeX = sizeX
+        self.sizeY = sizeY
+
+    # returns a (sizeY, sizeX) boolean array that is True for every changed pixel
+    def changedMask(self):
+        mask = np.zeros(self.sizeX * self.sizeY, dtype=bool)
+        mask[self.indices] = True
+        return mask.reshape(self.sizeY, self.sizeX)
+
+    # returns how many pixels are changed
+    def changedCount(self):
+        return len(self.indices)
+
+# returns what the snapshots of the image are stored under, which stays the same when the image is renamed and is never used by another image in the same session
+def snapshotImageKey(image):
+    return image.session_uid
+
+class textureSnapshotStore():
+
+    # Purpose: --------------------
+    # holds the snapshots of every image, several per image as a history with one of them active (the one mirrors and reverts use)
+    # the images are told apart by snapshotImageKey instead of their names, so renaming an image keeps its history
+    # snapshots past the memory budget are spilled to memory mapped files in a temporary folder, least recently used first
+    def __init__(self):
+        self.entries = collections.OrderedDict() # (image key, snapshot name) -> textureSnapshot, least recently used first
+        self.active = {} # image key -> name of its active snapshot
+        self.counts = {} # image key -> how many snapshots have been taken of it, used to name them
+        self.spillDirectory = None # made the first time a snapshot is spilled
+
+    # Inputs: ---------------
+    # imageKey is the snapshotImageKey of the image the snapshot is of
+    # snapshot is the textureSnapshot to store
+    # maxBytes is the most memory the snapshots can use before the least recently used ones are spilled to disk
+    # maxHistory is how many snapshots of each image are kept, the oldest are removed
+    # Purpose: --------------
+    # stores the snapshot as the newest and active one of the image, returning its name
+    def put(self, imageKey, snapshot, maxBytes, maxHistory):
+        self.counts[imageKey] = self.counts.get(imageKey, 0) + 1
+        name = "Snapshot " + str(self.counts[imageKey])
+        self.entries[(imageKey, name)] = snapshot
+        self.active[imageKey] = name
+        for oldName in self.history(imageKey)[:-maxHistory]:
+            self.remove(imageKey, oldName)
+        self.spillToFit(maxBytes)
+        return name
+
+    # returns the named snapshot of the image (the active one if no name is given), or None, and marks it as recently used
+    def get(self, imageKey, name = None):
+        if (name is None):
+            name = self.active.get(imageKey)
+        key = (imageKey, name)
+        if (key not in self.entries):
+            return None
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    # makes the named snapshot the one mirrors and reverts of the image use
+    def setActive(self, imageKey, name):
+        if ((imageKey, name) in self.entries):
+            self.active[imageKey] = name
+
+    # returns the names of the image's snapshots, oldest first
+    def history(self, imageKey):
+        names = [name for image, name in self.entries.keys() if image == imageKey]
+        return sorted(names, key = lambda name: int(name.split(" ")[-1]))
+
+    # removes the named snapshot of the image, the newest one left becomes active if it was
+    def remove(self, imageKey, name):
+        snapshot = self.entries.pop((imageKey, name), None)
+        if (snapshot is None):
+            return
+        if (self.active.get(imageKey) == name):
+            history = self.history(imageKey)
+            if (len(history) > 0):
+                self.active[imageKey] = history[-1]
+            else:
+                del self.active[imageKey]
+        path = self.spillPath((imageKey, name)) # not released, as a mirror still running can be using it
+        if (os.path.exists(path)):
+            try:
+                os.remove(path)
+            except OSError: # still mapped by a copy of the snapshot (Windows can't remove it then), clear removes the folder later
+                pass
+
+    # returns how much memory the snapshots use in bytes
+    def residentBytes(self):
+        return sum(snapshot.residentBytes() for snapshot in self.entries.values())
+
+    # spills the least recently used snapshots to disk until they fit in maxBytes, the most recently used one is always kept in memory
+    def spillToFit(self, maxBytes):
+        totalBytes = self.residentBytes() # added up once, then each spilled snapshot's bytes are taken off
+        keys = list(self.entries.keys())[:-1]
+        for key in keys:
+            if (totalBytes <= maxBytes):
+                break
+            snapshot = self.entries[key]
+            resident = snapshot.residentBytes()
+            if (resident > 0):
+                snapshot.spill(self.spillPath(key))
+                totalBytes -= resident - snapshot.residentBytes()
+
+    # returns the file the snapshot stored under key is spilled to
+    def spillPath(self, key):
+        if (self.spillDirectory is None):
+            self.spillDirectory = tempfile.mkdtemp(prefix="mirror_snapshots_")
+        return os.path.join(self.spillDirectory, hashlib.sha1(repr(key).encode()).hexdigest() + ".npy")
+
+    # removes every snapshot and the spill folder (Ex. when the addon is unregistered)
+    def clear(self):
+        self.entries.clear()
+        self.active.clear()
+        if (self.spillDirectory is not None):
+            shutil.rmtree(self.spillDirectory, ignore_errors=True)
+            self.spillDirectory = None
+
+    # returns (name, line of text) for each snapshot of the image, newest first (used by the panel)
+    def describe(self, imageKey):
+        lines = []
+        for name in reversed(self.history(imageKey)):
+            snapshot = self.entries[(imageKey, name)]
+            resident = snapshot.residentBytes()
+            line = "{} {}x{}: {} MB".format(name, snapshot.sizeX, snapshot.sizeY, round(resident / (1024 * 1024), 1))
+            if (resident == 0 and len(snapshot.tiles) > 0):
+                line = "{} {}x{}: on disk".format(name, snapshot.sizeX, snapshot.sizeY)
+            lines.append((name, line))
+        return lines
+
+# Input: ------------------
+# image is the image in the image editor
+# Purpose: ----------------
+# returns the active snapshot of the image, or None (with an error) if it has not been snapshotted
+def originalSnapshot(image):
+    snapshot = None
+    if (image is not None):
+        snapshot = bpy.types.Scene.textureSnapshotStore.get(snapshotImageKey(image))
+    if (snapshot is None):
+        print("Error: There is no snapshot of this image")
+    return snapshot
+
+# UDIM tiles ---------------------------------------------
+# blender's python can only reach the pixels of the first tile of a tiled image, so the tiles are read from and saved to their files (the image's path has <UDIM> where the tile number goes)
+# this means the tiles have to be saved after painting, which also lets a mirror only read the tiles whose files changed since the snapshot
+
+# returns whether the image is a tiled (UDIM) image
+def isTiledImage(image):
+    return image is not None and image.source == 'TILED'
+
+# returns the path of the file of one tile of a tiled image
+def udimTilePath(image, tileNumber):
+    return bpy.path.abspath(image.filepath_raw.replace("<UDIM>", str(tileNumber)))
+
+# returns the (u, v) of the corner of the tile in UV space (Ex. 1001 is (0, 0), 1002 is (1, 0) and 1011 is (0, 1))
+def udimTileOffset(tileNumber):
+    return np.array([(tileNumber - 1001) % 10, (tileNumber - 1001) // 10], dtype=np.float64)
+
+# returns the tile numbers of an (N, 2) array of UV cordinates
+def udimTileNumbers(uvs):
+    return 1001 + np.floor(uvs[:, 0]).astype(np.int64) + 10 * np.floor(uvs[:, 1]).astype(np.int64)
+
+# returns (modified time, size) of the file, which changes whenever the tile is saved, or None if there is no file
+def udimTileStamp(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+# loads one tile of the tiled image as an image of its own, which saveUDIMTile saves back and removes
+def loadUDIMTile(image, tileNumber):
+    tileImage = bpy.data.images.load(udimTilePath(image, tileNumber), check_existing = False)
+    tileImage.colorspace_settings.name = image.colorspace_settings.name # read the same way as the tiled image
+    return tileImage
+
+# saves the tile loaded by loadUDIMTile back to its file and removes it from the .blend
+def saveUDIMTile(tileImage, save = True):
+    if (save):
+        tileImage.save()
+    bpy.data.images.remove(tileImage)
+
+# returns the error explaining why the tiles of the image can't be used, or None if they can
+def udimTileError(image):
+    if ("<UDIM>" not in image.filepath_raw):
+        return "Error: The tiles of a tiled image have to be saved to files named with <UDIM> first"
+    if (image.is_dirty):
+        return "Error: Save the tiles of the image (Image > Save) before snapshotting or mirroring it, as the tiles are read from their files"
+    return None
+
+class udimSnapshot():
+
+    # Inputs: ---------------------
+    # image is a tiled image whose tiles are saved to their files
+    # Purpose: --------------------
+    # snapshots every tile of a tiled image, remembering when each tile's file was saved so unchanged tiles don't need to be read again
+    # is stored in the textureSnapshotStore the same as a textureSnapshot
+    def __init__(self, image):
+        self.udimTiles = {} # tile number -> textureSnapshot of the tile
+        self.stamps = {} # tile number -> udimTileStamp of the tile's file when it was snapshotted
+        for tile in image.tiles:
+            path = udimTilePath(image, tile.number)
+            stamp = udimTileStamp(path)
+            if (stamp is None):
+                print("Error: The tile " + str(tile.number) + " has no file at " + path)
+                continue
+            tileImage = loadUDIMTile(image, tile.number)
+            self.udimTiles[tile.number] = textureSnapshot(tileImage)
+            self.stamps[tile.number] = stamp
+            saveUDIMTile(tileImage, save = False)
+        first = self.udimTiles[min(self.udimTiles)] if self.udimTiles else textureSnapshot()
+        self.sizeX = first.sizeX # the size shown in the panel, tiles can have their own sizes
+        self.sizeY = first.sizeY
+
+    # every tile of every tile snapshot, so the panel can tell when the snapshot is on disk
+    @property
+    def tiles(self):
+        return [tile for snapshot in self.udimTiles.values() for tile in snapshot.tiles]
+
+    # returns the numbers of the tiles whose files were saved since the snapshot, in order
+    def changedTiles(self, image):
+        return sorted(number for number in self.udimTiles if udimTileStamp(udimTilePath(image, number)) != self.stamps[number])
+
+    # returns how many bytes of memory the tile snapshots take up
+    def residentBytes(self):
+        return sum(snapshot.residentBytes() for snapshot in self.udimTiles.values())
+
+    # spills every tile snapshot to a file next to path (see textureSnapshot.spill)
+    def spill(self, path):
+        for number, snapshot in self.udimTiles.items():
+            snapshot.spill(path[:-len(".npy")] + "_" + str(number) + ".npy")
+
+    # releases every tile snapshot
+    def release(self):
+        for snapshot in self.udimTiles.values():
+            snapshot.release()
+
+    # writes the snapshot back into the tiles that changed since it was taken, saving them and reloading the tiled image
+    def writeToTexture(self, image):
+        error = udimTileError(image)
+        if (error is not None):
+            print(error)
+            return False
+        for number in self.changedTiles(image):
+            tileImage = loadUDIMTile(image, number)
+            written = self.udimTiles[number].writeToTexture(tileImage)
+            saveUDIMTile(tileImage, save = written)
+        image.reload() # shows the saved tiles
+        return True
+
+regionWriteFraction = 4 # regions covering more than 1/regionWriteFraction of the texture are written back from the whole snapshot instead of patched into a read back of the texture
+
+# Inputs: --------------
+# pixelGroups is a list of arrays of pixel numbers (Ex. the changed pixels and the pixels mirrored into), each group gets its own bounding rectangle
+# sizeX is the x size of the texture
+# sizeY is the y size of the texture
+# margin is how many pixels to grow each rectangle by (Ex. 1 for a gap fill that changes the neighbours of the pixels)
+# Purpose: -------------
+# returns the bounding rectangles (minX, minY, maxX, maxY), max exclusive, of the groups with the overlapping ones merged, so the work after a stroke is bounded by where it touched
+def pixelRegions(pixelGroups, sizeX, sizeY, margin = 0):
+    regions = []
+    for pixelNums in pixelGroups:
+        if (pixelNums is None or len(pixelNums) == 0):
+            continue
+        x = pixelNums % sizeX
+        y = pixelNums // sizeX
+        regions.append([max(int(x.min()) - margin, 0), max(int(y.min()) - margin, 0), min(int(x.max()) + 1 + margin, sizeX), min(int(y.max()) + 1 + margin, sizeY)])
+    merged = True
+    while (merged): # keeps merging until no two rectangles overlap, there are only ever a few of them
+        merged = False
+        for i in range(len(regions)):
+            for j in range(i + 1, len(regions)):
+                a = regions[i]
+                b = regions[j]
+                if (a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]):
+                    regions[i] = [min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])]
+                    del regions[j]
+                    merged = True
+                    break
+            if (merged):
+                break
+    return [tuple(region) for region in regions]
 
 # Converts a pixel cordinate ((x, y) position) to the number it would be in a 1 dimensional list/array
 # Assumes pixelNum is not made up of pixels split into 4 parts in a sequence, so multiply this by 4 to get the start of a pixel sequence
@@ -119,10 +928,9 @@ def updatePixel(snapshot, pixelLoc, pixelValue):
     displace = 4
     sizeX = snapshot.sizeX
     sizeY = snapshot.sizeY
-    pixels = snapshot.pixels
 
     tempLoc = pixelLoc[0] + sizeX * pixelLoc[1]
-    pixels[tempLoc * displace: tempLoc * displace + displace] = pixelValue
+    snapshot.scatter(np.array([tempLoc]), np.array([pixelValue], dtype=np.float32).reshape(1, displace)) # only copies the pixel's tile if it is shared
 
 
 def find_UV_cord_from_3D_point_on_model(ob, bm, cord, uv_layer, faces, testAgainst3DValue = False, threshold = 0.0005): # will return possibly weird values if given faces that align with the point, but the point isn't on (due to barymetric transform projecting). Fix is to use the testAgainst3DValue = True.
@@ -282,113 +1090,98 @@ def selectAllFacesOfBmesh(tempBmesh):
             facesList.append(f)
     return facesList
 
+# neighbouring pixel offsets (x, y) checked by the pixel gap fills, in the order their colors are added together
+gapFillNeighborOffsets = [(-1, 1), (0, 1), (1, 1), (-1, 0), (1, 0), (-1, -1), (0, -1), (1, -1)] # topLeft, top, topRight, left, right, bottomLeft, bottom, bottomRight
+gapFillHorizontalNeighborOffsets = [(-1, 0), (1, 0)] # left, right
+
+# Inputs: --------------
+# dx and dy are the offset of the neighbouring pixel
+# sizeX and sizeY are the size of the texture
+# Purpose: --------------
+# returns the smallest and largest x and y a neighbouring pixel can be at to be counted for the gap fill
+# Note: the neighbours to the left and below are only counted if they are past the first column/row, which is kept so the fill matches the results it has always given at the edges
+def gapFillNeighborBounds(dx, dy, sizeX, sizeY):
+    minX = 1 if dx == -1 else 0
+    minY = 1 if dy == -1 else 0
+    return minX, sizeX - 1, minY, sizeY - 1
+
+# Inputs: --------------
+# changed is a (sizeY, sizeX) boolean array of the changed pixels
+# offsets is a list of (x, y) neighbour offsets to count
+# Purpose: --------------
+# counts how many changed neighbours every pixel has at once by adding up shifted copies of the changed mask
+def countChangedNeighbors(changed, offsets):
+    sizeY, sizeX = changed.shape
+    count = np.zeros((sizeY, sizeX), dtype=np.uint8)
+    for dx, dy in offsets:
+        minX, maxX, minY, maxY = gapFillNeighborBounds(dx, dy, sizeX, sizeY)
+        # range of pixels whose neighbour at (x + dx, y + dy) is within the bounds
+        x0 = max(minX - dx, 0)
+        x1 = min(maxX - dx, sizeX - 1) + 1
+        y0 = max(minY - dy, 0)
+        y1 = min(maxY - dy, sizeY - 1) + 1
+        if (x0 < x1 and y0 < y1):
+            count[y0:y1, x0:x1] += changed[y0 + dy:y1 + dy, x0 + dx:x1 + dx]
+    return count
+
+# Inputs: --------------
+# diff is the textureDiff of the before mirror snapshot and the one after mirroring
+# snapshot is the textureSnapshot that is being edited (one after mirroring)
+# offsets is a list of (x, y) neighbour offsets to check
+# threshold is an integer for how many of those neighbours must be changed to fill the pixel
+# selfBlend is a boolean for whether the unchanged pixel should factor in its own value to the blend
+# Purpose: --------------
+# shared vectorized gap fill: finds every unchanged pixel with enough changed neighbours, then averages the neighbours' colors for all of them together
+def pixelGapFillFromNeighbors(diff, snapshot, offsets, threshold, selfBlend=False):
+    displace = 4
+    sizeX = snapshot.sizeX
+    sizeY = snapshot.sizeY
+    changed = diff.changedMask()
+    count = countChangedNeighbors(changed, offsets)
+    pixelsToFill = np.flatnonzero(~changed & (count >= threshold)) # only the unchanged pixels with enough changed pixels bordering them
+    if (timeDebug): # TIME
+        print("PixelsToFill: " + str(len(pixelsToFill)))
+    if (len(pixelsToFill) == 0):
+        return snapshot
+    changed = changed.reshape(-1)
+    x = pixelsToFill % sizeX
+    y = pixelsToFill // sizeX
+    newValue = np.zeros((len(pixelsToFill), displace)) # summed in float64 in the same order as the neighbours are listed
+    for dx, dy in offsets: # builds the value for the pixels using their changed neighbors
+        minX, maxX, minY, maxY = gapFillNeighborBounds(dx, dy, sizeX, sizeY)
+        neighborX = x + dx
+        neighborY = y + dy
+        valid = (neighborX >= minX) & (neighborX <= maxX) & (neighborY >= minY) & (neighborY <= maxY)
+        neighbor = pixelCordToPixelNum([neighborX[valid], neighborY[valid]], sizeX, sizeY)
+        neighborChanged = changed[neighbor]
+        valid[valid] = neighborChanged
+        newValue[valid] += snapshot.gather(neighbor[neighborChanged])
+    neighborCount = count.reshape(-1)[pixelsToFill].astype(np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'): # a threshold of 0 can fill pixels with no changed neighbours, which divides by zero like it always has
+        if (selfBlend): # factors itself into the blending
+            newValue = (newValue + snapshot.gather(pixelsToFill)) / (neighborCount + 1)[:, None]
+        else:
+            newValue = newValue / neighborCount[:, None]
+    snapshot.scatter(pixelsToFill, newValue) # updates pixels in snapshot, only widening the tiles that were filled
+    return snapshot # returns the snapshot it was given to edit
+
 # Inputs: --------------
-# diff is the difference of the before mirror snapshot and the one after mirroring)
+# diff is the textureDiff of the before mirror snapshot and the one after mirroring
 # snapshot is the textureSnapshot that is being edited (one after mirroring)
 # selfBlend is a boolean for whether the unchanged pixel should factor in its own value to the blend
 # This function takes the diff (the difference between snapshots made in things like the mirror functions) and the new snapshot to be able to try and guess which pixels need to be filled in to fix random gaps made in mirroring
 # This function only checks the left and right pixel, as this is the pixelGapFill used for the 3D mirroring, which due to distortion on curved surfaces and floating point precision issues will have vertical pixel gaps (likely from converting back into a UV cordinate)
 def pixelGapFill(diff, snapshot, selfBlend=False):
-    displace = 4
-    pixelsToCheck = [] # list of pixels to check if needed to blend
-    length = math.floor(len(diff) / displace)
-    for i in range(length):
-        if diff[i * displace: i * displace + displace] == (0, 0, 0, 0): # if there isn't change in a pixel
-            pixelsToCheck.append(i)
-    # check through the list of pixels to see how many of the pixels bordering it are changed
-    length2 = len(pixelsToCheck)
-    print("PixelsToCheck: " + str(length2)) # TIME
-    for i in range(length2):
-        changedPixels = []
-        currentPixel = pixelNumToPixelCord(pixelsToCheck[i] * displace, snapshot.sizeX, snapshot.sizeY)
-        left = pixelCordToPixelNum([currentPixel[0] - 1, currentPixel[1]], snapshot.sizeX, snapshot.sizeY)
-        right = pixelCordToPixelNum([currentPixel[0] + 1, currentPixel[1]], snapshot.sizeX, snapshot.sizeY)
-
-        if ((currentPixel[0] - 1) > 0): # check if pixel is possible (left)
-            if diff[left * displace: left * displace + displace] != (0, 0, 0, 0):
-                changedPixels.append(left)
-        if ((currentPixel[0] + 1) < snapshot.sizeX): # check if pixel is possible (right)
-            if diff[right * displace: right * displace + displace] != (0, 0, 0, 0):
-                changedPixels.append(right)
-
-        # if enough pixels are changed, then update the pixel to be a mix of its changed neighbors
-        if (len(changedPixels) >= 2):
-            newValue = np.array([0, 0, 0, 0])
-            for j in range(len(changedPixels)): # builds the value for the pixel using its neighbors
-                tempNum = np.array(snapshot.pixels[changedPixels[j] * displace: changedPixels[j] * displace + displace])
-                newValue = newValue + tempNum
-            if (selfBlend): # factors itself into the blending
-                newValue = newValue + np.array(snapshot.pixels[pixelsToCheck[i] * displace: pixelsToCheck[i] * displace + displace])
-                newValue = newValue / (len(changedPixels) + 1)
-            else:
-                newValue = newValue / len(changedPixels)
-            updatePixel(snapshot, currentPixel, newValue) # updates pixel in snapshot
-    return snapshot # returns the snapshot it was given to edit
+    return pixelGapFillFromNeighbors(diff, snapshot, gapFillHorizontalNeighborOffsets, 2, selfBlend) # both the left and right pixel have to be changed
 
 # Inputs: --------------
-# diff is the difference of the before mirror snapshot and the one after mirroring)
+# diff is the textureDiff of the before mirror snapshot and the one after mirroring
 # snapshot is the textureSnapshot that is being edited (one after mirroring)
 # threshold is an integer for how many adjacent pixels must be different in the snapshot to require blending (averaging the pixels value to nearby ones)
 # selfBlend is a boolean for whether the unchanged pixel should factor in its own value to the blend
 # This function takes the diff (the difference between snapshots made in things like the mirror functions) and the new snapshot to be able to try and guess which pixels need to be filled in to fix random gaps made in mirroring
 def pixelGapFillThreshold(diff, snapshot, threshold=6, selfBlend=False):
-    displace = 4
-    pixelsToCheck = [] # list of pixels to check if needed to blend
-    length = math.floor(len(diff) / displace)
-    for i in range(length):
-        if diff[i * displace: i * displace + displace] == (0, 0, 0, 0): # if there isn't change in a pixel
-            pixelsToCheck.append(i)
-    # check through the list of pixels to see how many of the pixels bordering it are changed
-    length2 = len(pixelsToCheck)
-    print("PixelsToCheck: " + str(length2)) # TIME
-    for i in range(length2):
-        changedPixels = []
-        currentPixel = pixelNumToPixelCord(pixelsToCheck[i] * displace, snapshot.sizeX, snapshot.sizeY)
-        topLeft = pixelCordToPixelNum([currentPixel[0] - 1, currentPixel[1] + 1], snapshot.sizeX, snapshot.sizeY)
-        top = pixelCordToPixelNum([currentPixel[0], currentPixel[1] + 1], snapshot.sizeX, snapshot.sizeY)
-        topRight = pixelCordToPixelNum([currentPixel[0] + 1, currentPixel[1] + 1], snapshot.sizeX, snapshot.sizeY)
-        left = pixelCordToPixelNum([currentPixel[0] - 1, currentPixel[1]], snapshot.sizeX, snapshot.sizeY)
-        right = pixelCordToPixelNum([currentPixel[0] + 1, currentPixel[1]], snapshot.sizeX, snapshot.sizeY)
-        bottomLeft = pixelCordToPixelNum([currentPixel[0] - 1, currentPixel[1] - 1], snapshot.sizeX, snapshot.sizeY)
-        bottom = pixelCordToPixelNum([currentPixel[0], currentPixel[1] - 1], snapshot.sizeX, snapshot.sizeY)
-        bottomRight = pixelCordToPixelNum([currentPixel[0] + 1, currentPixel[1] - 1], snapshot.sizeX, snapshot.sizeY)
-        if ((currentPixel[0] - 1) > 0 and (currentPixel[1] + 1) < snapshot.sizeY): # check if pixel is possible (topleft)
-            if diff[topLeft * displace: topLeft * displace + displace] != (0, 0, 0, 0): # if the pixel is changed, add it to the list
-                changedPixels.append(topLeft)
-        if ((currentPixel[1] + 1) < snapshot.sizeY): # check if pixel is possible (top)
-            if diff[top * displace: top * displace + displace] != (0, 0, 0, 0):
-                changedPixels.append(top)
-        if ((currentPixel[0] + 1) < snapshot.sizeX and (currentPixel[1] + 1) < snapshot.sizeY): # check if pixel is possible (topRight)
-            if diff[topRight * displace: topRight * displace + displace] != (0, 0, 0, 0):
-                changedPixels.append(topRight)
-        if ((currentPixel[0] - 1) > 0): # check if pixel is possible (left)
-            if diff[left * displace: left * displace + displace] != (0, 0, 0, 0):
-                changedPixels.append(left)
-        if ((currentPixel[0] + 1) < snapshot.sizeX): # check if pixel is possible (right)
-            if diff[right * displace: right * displace + displace] != (0, 0, 0, 0):
-                changedPixels.append(right)
-        if ((currentPixel[0] - 1) > 0 and (currentPixel[1] - 1) > 0): # check if pixel is possible (bottomleft)
-            if diff[bottomLeft * displace: bottomLeft * displace + displace] != (0, 0, 0, 0):
-                changedPixels.append(bottomLeft)
-        if ((currentPixel[1] - 1) > 0): # check if pixel is possible (bottom)
-            if diff[bottom * displace: bottom * displace + displace] != (0, 0, 0, 0):
-                changedPixels.append(bottom)
-        if ((currentPixel[0] + 1) < snapshot.sizeX and (currentPixel[1] - 1) > 0): # check if pixel is possible (bottomRight)
-            if diff[bottomRight * displace: bottomRight * displace + displace] != (0, 0, 0, 0):
-                changedPixels.append(bottomRight)
-        # if enough pixels are changed, then update the pixel to be a mix of its changed neighbors
-        if (len(changedPixels) >= threshold):
-            newValue = np.array([0, 0, 0, 0])
-            for j in range(len(changedPixels)): # builds the value for the pixel using its neighbors
-                tempNum = np.array(snapshot.pixels[changedPixels[j] * displace: changedPixels[j] * displace + displace])
-                newValue = newValue + tempNum
-            if (selfBlend): # factors itself into the blending
-                newValue = newValue + np.array(snapshot.pixels[pixelsToCheck[i] * displace: pixelsToCheck[i] * displace + displace])
-                newValue = newValue / (len(changedPixels) + 1)
-            else:
-                newValue = newValue / len(changedPixels)
-            updatePixel(snapshot, currentPixel, newValue) # updates pixel in snapshot
-    return snapshot # returns the snapshot it was given to edit
+    return pixelGapFillFromNeighbors(diff, snapshot, gapFillNeighborOffsets, threshold, selfBlend)
 
 
 # Inputs: ------------
@@ -412,114 +1205,1387 @@ def mirror3dCordinate(object, point, axis):
     tempPoint = tempPoint + object.location # adds the object's displacement back
     return tempPoint
 
+# same as mirror3dCordinate, but mirrors an (N, 3) array of points at once
+def mirror3dCordinates(object, points, axis):
+    return mirror3dCordinatesAboutPoint(points, np.array(object.location), axis)
+
+# same as mirror3dCordinates, but given the location of the object instead of the object (so it can be used off of the main thread)
+def mirror3dCordinatesAboutPoint(points, location, axis):
+    axisNum = {'x': 0, 'y': 1, 'z': 2}.get(axis)
+    if (axisNum is None):
+        print("Error: axis input not valid")
+        return points
+    tempPoints = points - location # moves the origin to be where the object is
+    tempPoints[:, axisNum] = tempPoints[:, axisNum] * -1
+    return tempPoints + location # adds the object's displacement back
+
 # Inputs: ------------
 # snapshot1 is a textureSnapshot
 # snapshot2 is a textureSnapshot, expected to be of the same image dimensions of snapshot1
 # object is an object from the scene
-# tempBmesh is the bmesh of the object that holds the faces
+# tempBmesh is no longer used (the faces come from the object's UV grid index), kept so older calls still work
 # texture is a image texture
 # axis is a character, expected to be x, y, or z
 # uv is the string for the name of the UV map used
-# faces is the list of faces from the bmesh to check against
+# faces is no longer used, see selectedOnly
 # mask is a boolean for whether the changes are used as a mask or not
-# pixelMap is a 2D list or array of how the pixels are mapped to their mirror (stores the mirror cordinate)
+# pixelMap is an array of how the pixels are mapped to their mirror (stores the mirror's pixel number, see newPixelMap)
 # pixelMapAxis is the axis the mirror cordinates used in the pixelMap (Ex. 'x', 'y', or 'z')
+# mapHoles is the mirrorMapHoles of the pixelMap, used to fill in the pixels that have no mirror, or with its mirrorMapInverse to mirror into every pixel whose mirror changed instead
+# selectedOnly is a boolean for whether only the faces with all of their vertices selected are mirrored from
 # Purpose: ---------
 # This function performs the changes or the mirroring of information from the snapshots
-def mirrorChangesFromSnapshots(snapshot1, snapshot2, object, tempBmesh, texture, axis, uv = "UVMap", faces = [], mask = False, pixelMap = None, pixelMapAxis = None):
-    displace = 4
-    if (bpy.types.Scene.snapshotObject == object): # ensures the same object is still selected from snapshots
-        diff = snapshot1.snapshotDifference(snapshot2)
+def mirrorChangesFromSnapshots(snapshot1, snapshot2, object, tempBmesh, texture, axis, uv = "UVMap", faces = [], mask = False, pixelMap = None, pixelMapAxis = None, mapHoles = None, selectedOnly = False):
+    task = mirrorChangesTask(snapshot1, snapshot2.copy(), object, texture, axis, uv, mask, pixelMap, pixelMapAxis, mapHoles, selectedOnly) # the task releases its copy, snapshot2 is still the caller's
+    task.step() # runs all of it at once
+
+class mirrorChangesTask():
+
+    # Inputs: ---------------------
+    # the same as mirrorChangesFromSnapshots, the task releases snapshot2 once it is done with it
+    # chunkSize is how many pixels without a mirror in the mapping are found at a time
+    # Purpose: --------------------
+    # the mirroring of mirrorChangesFromSnapshots split up so it can be done a bit at a time with step (Ex. from a modal operator so blender doesn't freeze)
+    def __init__(self, snapshot1, snapshot2, object, texture, axis, uv = "UVMap", mask = False, pixelMap = None, pixelMapAxis = None, mapHoles = None, selectedOnly = False, chunkSize = 1 << 16):
+        self.progress = 0 # fraction of the changed pixels mirrored (0 to 1)
+        self.lazyPixels = np.zeros(0, dtype=np.int64)
+        self.lazyStart = 0
+        self.inverse = None
+        self.gatherPixels = np.zeros(0, dtype=np.int64)
+        self.gatherCords = np.zeros((0, 2), dtype=np.float32)
+        self.chunkSize = chunkSize
+        self.finished = True
+        if (bpy.types.Scene.snapshotObject != object): # ensures the same object is still selected from snapshots
+            print("Error: Given object doesn't match object used to create snapshot")
+            return
+        with mirrorStage("diff"):
+            diff = snapshot1.snapshotDifference(snapshot2)
+        if (diff is None): # sizes of the snapshots don't match
+            return
+        self.finished = False
+        self.snapshot1 = snapshot1
+        self.snapshot2 = snapshot2
+        self.object = object
+        self.texture = texture
+        self.axis = axis
+        self.mask = mask
+        self.pixelMapAxis = pixelMapAxis
+        self.mapHoles = mapHoles
+        self.diff = diff
+        self.sizeX = snapshot1.sizeX
+        self.sizeY = snapshot1.sizeY
+        length = self.sizeX * self.sizeY
+        changedPixels = diff.indices
+        if (pixelMap is None and len(changedPixels) > 0):
+            pixelMap = newPixelMap(length)
+        self.pixelMap = pixelMap
+        # do it using the pixel map if able (TODO: add check to see if valid map for current texture)
+        inMap = np.zeros(len(changedPixels), dtype=bool)
+        mappedTargets = np.zeros(0, dtype=np.int64)
+        mappedSources = np.zeros(0, dtype=np.int64)
+        if (axis == pixelMapAxis and pixelMap is not None):
+            with mirrorStage("map lookup"):
+                mappedTargets = np.take(pixelMap, changedPixels) # every changed pixel's mirror in one gather
+                inMap = mappedTargets != -1
+                forward = inMap
+                if (mapHoles is not None and mapHoles.inverse is not None): # goes from the pixels mirrored into instead, so every one of them is filled
+                    self.inverse = mapHoles.inverse
+                    self.gatherPixels, self.gatherCords, gathered = self.inverse.find(changedPixels)
+                    forward = inMap & ~gathered # the changed pixels no pixel gathers from (Ex. a thin stroke on the squashed side of a curve, or pixels mapped before the inverse was made) still go to their mirror in the pixelMap
+                    inMap = inMap | gathered
+                mappedSources = changedPixels[forward]
+                mappedTargets = mappedTargets[forward].astype(np.int64)
+        mirrorCount("changed pixels", len(changedPixels))
+        mirrorCount("mapped pixels", np.count_nonzero(inMap))
+        self.sourceParts = [mappedSources]
+        self.writtenParts = [mappedTargets]
+        # the mirror of the pixels not stored in the mapping is calculated a chunk at a time in step, which updates or replaces the existing mapping to store this mirror
+        self.lazyPixels = changedPixels[~inMap]
+        if (len(self.lazyPixels) > 0):
+            with mirrorStage("mesh index"):
+                self.meshData = getUVMeshData(object, uv) # reuses the UV grid and surface grid from earlier mirrors if the mesh hasn't changed
+            self.triangleMask = self.meshData.selectedTriangles(object) if selectedOnly else None
+
+    # Inputs: ---------------
+    # timeBudget is roughly how many seconds to spend before returning (None to finish all of it)
+    # Purpose: --------------
+    # mirrors the next chunks of pixels, returning True once all of them are done and the texture is updated
+    def step(self, timeBudget = None):
+        startTime = time.time()
+        while (not self.finished and self.lazyStart < len(self.lazyPixels)):
+            if (timeBudget is not None and time.time() - startTime > timeBudget):
+                return False
+            lazyPixels = self.lazyPixels[self.lazyStart:self.lazyStart + self.chunkSize]
+            self.lazyStart += self.chunkSize
+            self.progress = min(self.lazyStart / len(self.lazyPixels), 1)
+            mirrorCount("computed pixels", len(lazyPixels))
+            with mirrorStage("mirror compute"):
+                triangleNums, weights = self.meshData.getGridIndex().findTriangles(pixelNumsToUVs(lazyPixels, self.sizeX, self.sizeY), self.triangleMask)
+                onModel = triangleNums != -1 # prevents trying to mirror points that didn't land on the model
+                lazyPixels = lazyPixels[onModel]
+                points = self.meshData.pointsFromBarycentric(triangleNums[onModel], weights[onModel])
+                pointsMirror = mirror3dCordinates(self.object, points, self.axis)
+                uvsMirror, found = self.meshData.findUVsFromPoints(pointsMirror, 0.0005) # every mirrored point of the chunk is looked up in the surface grid together
+                lazyTargets = uvsToPixelNums(uvsMirror, self.sizeX, self.sizeY)
+                found = found & (lazyTargets != -1) # prevents trying to mirror for when the mirror doesn't land (Ex. when the mesh isn't symmetric or isn't symmetric on the currently selected axis)
+                lazyPixels = lazyPixels[found]
+                lazyTargets = lazyTargets[found]
+                self.pixelMap[lazyPixels] = lazyTargets # updates the pixelMap to contain the mapping for pixel A to pixel B
+                self.pixelMap[lazyTargets] = lazyPixels # set pixel B's mirror to pixel A
+            self.sourceParts.append(lazyPixels)
+            self.writtenParts.append(lazyTargets)
+        if (not self.finished):
+            self.finish()
+        return True
+
+    # mirrors the pixels into a copy of the snapshot and updates the texture
+    def finish(self):
+        self.finished = True
+        self.progress = 1
+        displace = 4
         snapshot3 = None
-        if (mask == False):
-            snapshot3 = copy.deepcopy(snapshot2)
+        if (self.mask == False):
+            snapshot3 = self.snapshot2.copy() # shares the tiles, only the ones mirrored into get copied
         else:
-            snapshot3 = copy.deepcopy(snapshot1)
-        length = math.floor(len(diff) / displace)
-        for i in range(length):
-            if diff[i * displace: i * displace + displace] != (0, 0, 0, 0): # if there is a change in a pixel
-                if (pixelMap is None):
-                    pixelMap = np.full([length, 2], -1)
-                if (axis == pixelMapAxis and not(pixelMap[i].tolist() == [-1, -1])): # do it using the pixel map if able (TODO: add check to see if valid map for current texture)
-                    if mask == False:
-                        updatePixel(snapshot3, pixelMap[i].tolist(), snapshot2.pixels[i * displace : i * displace + displace])
-                    else:
-                        updatePixel(snapshot3, pixelMap[i].tolist(), snapshot1.pixels[i * displace : i * displace + displace])
-                else: # calculates the mirror if not stored in the mapping and updates or replaces the existing mapping to store this mirror
-                    #print("Length: " + str(len(faces)))
-                    tempUV = pixelToUV(i * displace, texture.size[0], texture.size[1])
-                    tempUV = mathutils.Vector(tempUV) # converts the list to a vector
-                    tempPoint = find_coord_on_3D_face_from_UV(tempUV, faces, object, tempBmesh.loops.layers.uv[uv])
-                    #print("TempPoint: " + str(tempPoint)) # REMOVE
-                    if (tempPoint != None): # prevents trying to mirror points that didn't land on the model
-                        tempPointMirror = mirror3dCordinate(object, tempPoint, axis)
-                        #print("TempPointMirror: " + str(tempPointMirror)) # REMOVE
-                        tempUVMirror = find_UV_cord_from_3D_point_on_model(object, tempBmesh, tempPointMirror, tempBmesh.loops.layers.uv[uv], tempBmesh.faces, True, 0.0005)
-                        #print("tempUVMirror: " + str(tempUVMirror)) # REMOVE
-                        if (tempUVMirror != None): # prevents trying to mirror for when the mirror doesn't land (Ex. when the mesh isn't symmetric or isn't symmetric on the currently selected axis)
-                            tempPixelLoc = uvToPixel(tempUVMirror, texture.size[0], texture.size[1])
-                            pixelMap[i] = tempPixelLoc # updates the pixelMap to contain the mapping for pixel A to pixel B
-                            pixelMap[pixelCordToPixelNum(tempPixelLoc, texture.size[0])] = pixelNumToPixelCord(pixelNum = i * displace, sizeX = texture.size[0], sizeY = texture.size[1]) # set pixel B's mirror to pixel A
-                            if mask == False: # copies changes found in the pixel between snapshot1 and snapshot2 over the mirror axis
-                                updatePixel(snapshot3, tempPixelLoc, snapshot2.pixels[i * displace : i * displace + displace])
-                            else: # uses changed pixels as a mask for what to copy from snapshot1
-                                updatePixel(snapshot3, tempPixelLoc, snapshot1.pixels[i * displace : i * displace + displace])
-
-
-        bpy.types.Scene.snapshotDiff = snapshot2.snapshotDifference(snapshot3) # stores difference for pixelGapFilling
-        bpy.types.Scene.snapshotMapping = pixelMap # updates the pixelMapping with what was learned in this mirroring
+            snapshot3 = self.snapshot1.copy()
+        sourcePixels = np.concatenate(self.sourceParts)
+        writtenPixels = np.concatenate(self.writtenParts) # the pixels mirrored into, also used for filling the mapping's holes
+        if self.mask == False: # copies changes found in the pixel between snapshot1 and snapshot2 over the mirror axis
+            sourceSnapshot = self.snapshot2
+        else: # uses changed pixels as a mask for what to copy from snapshot1
+            sourceSnapshot = self.snapshot1
+        with mirrorStage("mirror scatter"):
+            snapshot3.scatter(writtenPixels, sourceSnapshot.gather(sourcePixels))
+        if (len(self.gatherPixels) > 0):
+            with mirrorStage("mirror gather"):
+                snapshot3.scatter(self.gatherPixels, sampleSnapshot(sourceSnapshot, self.gatherCords, True, self.inverse.islandBits)) # blends the pixels around each mirror, all in one gather
+            writtenPixels = np.concatenate([writtenPixels, self.gatherPixels])
+        mirrorCount("written pixels", len(writtenPixels))
+
+        filledPixels = np.zeros(0, dtype=np.int64)
+        if (self.axis == self.pixelMapAxis): # fills the known holes of the mapping instead of needing a gap fill over the whole image
+            skipPixels = self.diff.indices if self.mask == False else None # keeps what the user drew
+            with mirrorStage("gap fill"):
+                filledPixels = fillMirrorMapHoles(snapshot3, self.mapHoles, writtenPixels, skipPixels)
+            mirrorCount("filled pixels", len(filledPixels))
+
+        # snapshot3 can only differ from snapshot2 where it was mirrored into, hole filled, or (with the mask) where the user drew
+        touchedPixels = [self.diff.indices if self.mask else None, writtenPixels, filledPixels]
+        with mirrorStage("diff"):
+            bpy.types.Scene.snapshotDiff = self.snapshot2.snapshotDifferenceAt(snapshot3, np.concatenate([pixels for pixels in touchedPixels if pixels is not None])) # stores difference for pixelGapFilling
+        bpy.types.Scene.snapshotMapping = self.pixelMap # updates the pixelMapping with what was learned in this mirroring
         #if (pixelGapFillVerticalLines): # does pixel gap fill if toggled
             #pixelGapFill(snapshot2.snapshotDifference(snapshot3), snapshot3, selfBlend)
-        texture.pixels = snapshot3.pixels # updates the textures pixels (very time expensive, so only done once at end)
+        with mirrorStage("write back"):
+            snapshot3.writeRegionsToTexture(self.texture, pixelRegions(touchedPixels, self.sizeX, self.sizeY)) # only the regions that could have changed are read from the snapshot
+        snapshot3.release()
+        self.snapshot2.release() # the task owns snapshot2, so its buffer can be reused by the next mirror
+
+    # stops mirroring without changing the texture, but keeps the mirrors found so far in the mapping
+    def cancel(self):
+        if (not self.finished):
+            self.finished = True
+            bpy.types.Scene.snapshotMapping = self.pixelMap
+            self.snapshot2.release()
+
+# Inputs: ------------
+# meshData is the uvMeshData of the object, with its UV grid and surface grid already made
+# sourceOriginal and sourceChanged are the textureSnapshots of one tile before and after the changes
+# tileNumber is the number of the tile
+# location is the location of the object
+# axis is axis letter ex. 'x', 'y', or 'z'
+# triangleMask is an optional boolean array of which triangles can be mirrored from (Ex. only the selected ones)
+# Purpose: ---------
+# finds where on the whole tiled image the changed pixels of one tile mirror to, without touching blender so tiles can be done on separate threads
+# returns the changed pixels, the ones that were mirrored, and the UV cordinates (across every tile) they mirror to
+def mirrorTileUDIM3D(meshData, sourceOriginal, sourceChanged, tileNumber, location, axis, triangleMask = None):
+    changedPixels = sourceOriginal.snapshotDifference(sourceChanged).indices
+    uvs = pixelNumsToUVs(changedPixels, sourceOriginal.sizeX, sourceOriginal.sizeY) + udimTileOffset(tileNumber) # the mesh's UVs go past 1 into the other tiles
+    triangleNums, weights = meshData.getGridIndex().findTriangles(uvs, triangleMask)
+    onModel = triangleNums != -1
+    sourcePixels = changedPixels[onModel]
+    points = meshData.pointsFromBarycentric(triangleNums[onModel], weights[onModel])
+    uvsMirror, found = meshData.findUVsFromPoints(mirror3dCordinatesAboutPoint(points, location, axis), 0.0005)
+    return changedPixels, sourcePixels[found], uvsMirror[found]
+
+class udimMirrorTask():
+
+    # Inputs: ---------------------
+    # original is the udimSnapshot of the tiled image before the changes
+    # image is the tiled image, whose changed tiles have been saved
+    # object, axis, uv, mask and selectedOnly are the same as mirrorChangesFromSnapshots
+    # threads is how many tiles are mirrored at once (defaults to the number of cpu cores)
+    # Purpose: --------------------
+    # the 3D mirror of a tiled image, where a pixel can mirror into another tile. Only the tiles that changed are read, each is mirrored on a thread pool, and only the tiles mirrored into are read and saved after
+    # has the same step, progress and cancel as mirrorChangesTask so it runs from the same modal operators
+    def __init__(self, original, image, object, axis, uv = "UVMap", mask = False, selectedOnly = False, threads = None):
+        self.progress = 0
+        self.finished = True
+        self.pool = None
+        self.tileImages = {}
+        self.current = {}
+        error = udimTileError(image)
+        if (error is not None):
+            print(error)
+            return
+        changed = original.changedTiles(image)
+        if (len(changed) == 0):
+            print("Error: None of the tiles were saved since the snapshot")
+            return
+        self.finished = False
+        self.original = original
+        self.image = image
+        self.mask = mask
+        self.changed = changed
+        with mirrorStage("tile read"):
+            for number in changed:
+                self.readTile(number)
+        with mirrorStage("mesh index"):
+            meshData = getUVMeshData(object, uv)
+            # made here so the threads share them instead of each making their own
+            meshData.getGridIndex()
+            meshData.getSurfaceGrid(0.0005)
+        triangleMask = meshData.selectedTriangles(object) if selectedOnly else None
+        location = np.array(object.location)
+        self.pool = concurrent.futures.ThreadPoolExecutor(max_workers = threads or os.cpu_count() or 1)
+        self.futures = [self.pool.submit(mirrorTileUDIM3D, meshData, original.udimTiles[number], self.current[number], number, location, axis, triangleMask) for number in changed]
+        self.results = [] # (tile number, changed pixels, source pixels, mirrored UVs) of each tile done
+        mirrorCount("changed tiles", len(changed))
+
+    # loads a tile and snapshots it, if it hasn't been already
+    def readTile(self, number):
+        if (number not in self.tileImages):
+            self.tileImages[number] = loadUDIMTile(self.image, number)
+            self.current[number] = textureSnapshot(self.tileImages[number], arena = bpy.types.Scene.snapshotBufferArena)
+
+    # Inputs: ---------------
+    # timeBudget is roughly how many seconds to spend before returning (None to finish all of it)
+    # Purpose: --------------
+    # collects the tiles the threads have finished, returning True once all of them are done and the tiles are saved
+    def step(self, timeBudget = None):
+        while (not self.finished and len(self.results) < len(self.futures)):
+            future = self.futures[len(self.results)]
+            if (timeBudget is not None and not future.done()):
+                return False # comes back to it next step instead of waiting on the threads (collecting a finished tile takes no time)
+            with mirrorStage("mirror compute"):
+                self.results.append((self.changed[len(self.results)],) + future.result())
+            self.progress = len(self.results) / len(self.futures)
+        if (not self.finished):
+            self.finish()
+        return True
+
+    # mirrors the pixels into the tiles they landed on and saves those tiles
+    def finish(self):
+        self.finished = True
+        self.progress = 1
+        self.pool.shutdown()
+        self.pool = None
+        destinations = {} # tile number -> (source tile, source pixels, mirrored UVs) of what lands on it
+        for number, changedPixels, sourcePixels, uvsMirror in self.results:
+            mirrorCount("changed pixels", len(changedPixels))
+            tileNumbers = udimTileNumbers(uvsMirror)
+            for destination in np.unique(tileNumbers).tolist():
+                if (destination in self.original.udimTiles): # mirrors landing outside of every tile are dropped
+                    inTile = tileNumbers == destination
+                    destinations.setdefault(destination, []).append((number, sourcePixels[inTile], uvsMirror[inTile]))
+        if (self.mask):
+            for number in self.changed: # the mask painted on a tile is removed even if nothing mirrors onto it
+                destinations.setdefault(number, [])
+        with mirrorStage("tile read"):
+            for destination in destinations:
+                self.readTile(destination)
+        mirrorCount("tiles read", len(self.tileImages))
+        mirrored = [] # (tile number, mirrored textureSnapshot, touched pixels) of each tile mirrored into
+        with mirrorStage("mirror scatter"):
+            for destination, parts in destinations.items():
+                if (self.mask == False):
+                    snapshot3 = self.current[destination].copy()
+                else:
+                    snapshot3 = self.original.udimTiles[destination].copy()
+                touchedPixels = []
+                for number, sourcePixels, uvsMirror in parts:
+                    targetPixels = uvsToPixelNums(uvsMirror - udimTileOffset(destination), snapshot3.sizeX, snapshot3.sizeY)
+                    onTile = targetPixels != -1
+                    sourceSnapshot = self.current[number] if self.mask == False else self.original.udimTiles[number]
+                    snapshot3.scatter(targetPixels[onTile], sourceSnapshot.gather(sourcePixels[onTile]))
+                    touchedPixels.append(targetPixels[onTile])
+                if (self.mask):
+                    touchedPixels.append(self.original.udimTiles[destination].snapshotDifference(self.current[destination]).indices)
+                mirrored.append((destination, snapshot3, touchedPixels))
+        written = set()
+        with mirrorStage("write back"):
+            for destination, snapshot3, touchedPixels in mirrored:
+                if (sum(len(pixels) for pixels in touchedPixels) > 0):
+                    snapshot3.writeRegionsToTexture(self.tileImages[destination], pixelRegions(touchedPixels, snapshot3.sizeX, snapshot3.sizeY)) # only the regions that could have changed are read from the snapshot
+                    written.add(destination)
+                    mirrorCount("written pixels", sum(len(pixels) for pixels in touchedPixels))
+                snapshot3.release()
+        with mirrorStage("tile save"):
+            for number, tileImage in self.tileImages.items():
+                saveUDIMTile(tileImage, save = number in written)
+                self.current[number].release()
+            self.image.reload() # shows the saved tiles
+        mirrorCount("tiles written", len(written))
+        bpy.types.Scene.snapshotDiff = None # the gap fill works on single images
+
+    # stops mirroring without changing any tile
+    def cancel(self):
+        if (not self.finished):
+            self.finished = True
+            self.pool.shutdown(wait = False, cancel_futures = True)
+            self.pool = None
+            for number, tileImage in self.tileImages.items():
+                saveUDIMTile(tileImage, save = False)
+                self.current[number].release()
+
+# Inputs: ------------
+# pixelNums is an array of pixel numbers (not multiplied by 4)
+# sizeX and sizeY are the size of the texture
+# Purpose: ---------
+# returns an (N, 2) array of the UV cordinates of the centers of the pixels
+# Note: the center is used so a pixel and its mirror convert back and forth to each other, which lets the mirror reach the last row and column of the texture
+def pixelNumsToUVs(pixelNums, sizeX, sizeY):
+    uvs = np.empty((len(pixelNums), 2))
+    uvs[:, 0] = (pixelNums % sizeX + 0.5) / sizeX
+    uvs[:, 1] = (pixelNums // sizeX + 0.5) / sizeY
+    return uvs
+
+# Inputs: ------------
+# uvs is an (N, 2) array of UV cordinates
+# sizeX and sizeY are the size of the texture
+# Purpose: ---------
+# returns an array of the pixel numbers the UV cordinates land in, -1 for the ones outside of the texture
+def uvsToPixelNums(uvs, sizeX, sizeY):
+    x = np.floor(uvs[:, 0] * sizeX).astype(np.int64)
+    y = np.floor(uvs[:, 1] * sizeY).astype(np.int64)
+    inside = (x >= 0) & (x < sizeX) & (y >= 0) & (y < sizeY)
+    return np.where(inside, x + y * sizeX, -1)
+
+# Inputs: ------------
+# uvs is an (N, 2) array of UV cordinates
+# sizeX and sizeY are the size of the texture
+# Purpose: ---------
+# returns an (N, 2) float32 array of the pixel cordinates of the UV cordinates, which can be between pixels (the centers of the pixels are whole numbers, like in sampleSnapshot)
+def uvsToPixelCords(uvs, sizeX, sizeY):
+    return (uvs * np.array([sizeX, sizeY]) - 0.5).astype(np.float32)
+
+# Inputs: ------------
+# object is a MESH object from the scene
+# uv is the string for the name of the UV map used
+# Purpose: ---------
+# returns the mesh as blender stores it, copied out in bulk: the object space vertex positions, the vertices and loops of each triangle, the UVs of each loop, and the object's world matrix and location
+def exportUVMesh(object, uv):
+    mesh = object.data
+    mesh.calc_loop_triangles()
+    triangleCount = len(mesh.loop_triangles)
+    positions = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", positions)
+    triangleVertices = np.empty(triangleCount * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("vertices", triangleVertices)
+    triangleLoops = np.empty(triangleCount * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("loops", triangleLoops)
+    loopUVs = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+    mesh.uv_layers[uv].data.foreach_get("uv", loopUVs)
+    return positions, triangleVertices, triangleLoops, loopUVs, np.array(object.matrix_world), np.array(object.location, dtype=np.float64)
+
+# returns the hash of an exportUVMesh, which changes whenever anything in it does
+def uvMeshExportKey(export):
+    hasher = hashlib.sha1()
+    for array in export:
+        hasher.update(np.ascontiguousarray(array).tobytes())
+    return hasher.hexdigest()
+
+class uvMeshData():
+
+    # Inputs: ---------------------
+    # object is a MESH object from the scene
+    # uv is the string for the name of the UV map used
+    # export is the exportUVMesh of the object if it was already made (Ex. by getUVMeshData to check its cache), or None to make it
+    # Purpose: --------------------
+    # copies the triangulated mesh into numpy arrays (world positions and UVs of each triangle's corners) so it can be worked on in bulk
+    def __init__(self, object = None, uv = "UVMap", export = None):
+        self.trianglePositions = np.zeros((0, 3, 3)) # (triangles, corners, xyz) in world space
+        self.triangleUVs = np.zeros((0, 3, 2)) # (triangles, corners, uv)
+        self.triangleVertices = np.zeros((0, 3), dtype=np.int32) # the mesh vertex used by each corner
+        self.vertexPositions = np.zeros((0, 3)) # world positions of the mesh vertices
+        self.surfaceGrid = None # made the first time a 3D point needs to be found on the mesh
+        self.gridIndex = None # made the first time a UV point needs to be found on the mesh
+        self.key = None # uvMeshExportKey of the mesh, used to tell if a cached copy is still valid
+        self.objectKey = None # hash of the mesh in object space and of where it is mirrored about, used to name the mappings cached on disk
+        self.fingerprints = np.zeros(0, dtype=np.uint64) # hash of each triangle's object space positions and UVs and of where it is mirrored about, used to find which triangles changed
+        if (object is None and export is None):
+            return
+        if (export is None):
+            export = exportUVMesh(object, uv)
+        self.key = uvMeshExportKey(export)
+        objectPositions, triangleVertices, triangleLoops, loopUVs, matrix, location = export
+        triangleCount = len(triangleVertices) // 3
+        positions = objectPositions.reshape(-1, 3).astype(np.float64)
+        positions = positions.dot(matrix[:3, :3].T) + matrix[:3, 3] # brings the positions to world space like find_coord_3D_from_UV does
+        self.triangleVertices = triangleVertices.reshape(-1, 3)
+        # a mapping mirrors the world positions about the object's location, so moving the object along with its location doesn't change it
+        # it only depends on the object space mesh, the rotation and scale of the object and where its location is from its origin, which are hashed as blender stores them so rounding in the transform never changes the key
+        transform = np.concatenate([matrix[:3, :3].reshape(-1), location - matrix[:3, 3]])
+        hasher = hashlib.sha1()
+        for array in (objectPositions, self.triangleVertices, triangleLoops, loopUVs, transform):
+            hasher.update(np.ascontiguousarray(array).tobytes())
+        self.objectKey = hasher.hexdigest()
+        self.vertexPositions = positions
+        self.trianglePositions = positions[self.triangleVertices]
+        self.triangleUVs = loopUVs.reshape(-1, 2)[triangleLoops.reshape(-1, 3)].astype(np.float64)
+        # FNV-1a over the 15 numbers of each triangle (the bits of its object space positions and UVs), started from the hash of the transform so moving the object like objectKey ignores leaves them the same
+        seed = 14695981039346656037
+        for word in transform.view(np.uint64).tolist():
+            seed = ((seed ^ word) * 1099511628211) & 0xFFFFFFFFFFFFFFFF
+        trianglePositions = objectPositions.reshape(-1, 3).astype(np.float64)[self.triangleVertices]
+        words = np.concatenate([trianglePositions.reshape(-1, 9), self.triangleUVs.reshape(-1, 6)], axis=1).view(np.uint64)
+        self.fingerprints = np.full(triangleCount, seed, dtype=np.uint64)
+        for k in range(words.shape[1]):
+            self.fingerprints = (self.fingerprints ^ words[:, k]) * np.uint64(1099511628211)
+
+    # Inputs: ---------------
+    # triangleNums is an array of which triangle each point is on
+    # weights is an (N, 3) array of the barycentric weights of the points on their triangles
+    # Purpose: --------------
+    # returns an (N, 3) array of the world positions of the points
+    def pointsFromBarycentric(self, triangleNums, weights):
+        return np.einsum('nk,nkd->nd', weights, self.trianglePositions[triangleNums])
+
+    # same as pointsFromBarycentric, but returns the (N, 2) UV cordinates of the points
+    def uvsFromBarycentric(self, triangleNums, weights):
+        return np.einsum('nk,nkd->nd', weights, self.triangleUVs[triangleNums])
+
+    # returns the 3D grid of the triangles (in world space) for finding points within threshold of the surface, making it if it hasn't been made yet
+    def getSurfaceGrid(self, threshold = 0.0005):
+        if (self.surfaceGrid is None or self.surfaceGrid.threshold != threshold):
+            self.surfaceGrid = surfaceGrid3D(self.trianglePositions, threshold)
+        return self.surfaceGrid
+
+    # returns the UV grid index of the triangles, making it if it hasn't been made yet
+    def getGridIndex(self):
+        if (self.gridIndex is None):
+            self.gridIndex = uvGridIndex(self.triangleUVs)
+        return self.gridIndex
+
+    # Inputs: ---------------
+    # object is the object the mesh data was made from
+    # Purpose: --------------
+    # returns a boolean array of the triangles that have all of their vertices selected (matches selectFacesFromEditModeSelectionUsingVerticeSelection)
+    def selectedTriangles(self, object):
+        selected = np.zeros(len(object.data.vertices), dtype=bool)
+        object.data.vertices.foreach_get("select", selected)
+        return selected[self.triangleVertices].all(axis=1)
+
+    # Inputs: ---------------
+    # points is an (N, 3) array of world positions
+    # threshold is how far a point can be from the surface of the mesh and still count as on it
+    # Purpose: --------------
+    # finds the UV cordinates of the nearest points on the mesh using the surface grid, so each point is only tested against the few triangles near it
+    # returns an (N, 2) array of the UV cordinates and a boolean array of which points were found on the mesh
+    def findUVsFromPoints(self, points, threshold = 0.0005):
+        triangleNums, weights = self.getSurfaceGrid(threshold).findNearest(points)
+        found = triangleNums != -1
+        uvs = np.zeros((len(points), 2))
+        if (found.any()):
+            uvs[found] = self.uvsFromBarycentric(triangleNums[found], weights[found])
+        return uvs, found
+
+# Inputs: ------------
+# points is an (N, 3) array of points
+# triangles is an (N, 3, 3) array of the corners of the triangle to test each point against
+# Purpose: ---------
+# returns the (N, 3) barycentric weights of the closest point on each triangle to its point (from Real-Time Collision Detection by Christer Ericson)
+# the weights are nan for triangles with no area
+def closestPointWeights(points, triangles):
+    a = triangles[:, 0]
+    b = triangles[:, 1]
+    c = triangles[:, 2]
+    ab = b - a
+    ac = c - a
+    d1 = np.einsum('nd,nd->n', ab, points - a)
+    d2 = np.einsum('nd,nd->n', ac, points - a)
+    d3 = np.einsum('nd,nd->n', ab, points - b)
+    d4 = np.einsum('nd,nd->n', ac, points - b)
+    d5 = np.einsum('nd,nd->n', ab, points - c)
+    d6 = np.einsum('nd,nd->n', ac, points - c)
+    va = d3 * d6 - d5 * d4
+    vb = d5 * d2 - d1 * d6
+    vc = d1 * d4 - d3 * d2
+    zeros = np.zeros(len(points))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # the regions are set from the last checked to the first, so the first region a point is in wins
+        v = vb / (va + vb + vc) # inside the triangle
+        w = vc / (va + vb + vc)
+        weights = np.stack([1 - v - w, v, w], axis=1)
+        t = (d4 - d3) / ((d4 - d3) + (d5 - d6)) # edge bc
+        region = (va <= 0) & (d4 - d3 >= 0) & (d5 - d6 >= 0)
+        weights[region] = np.stack([zeros, 1 - t, t], axis=1)[region]
+        t = d2 / (d2 - d6) # edge ac
+        region = (vb <= 0) & (d2 >= 0) & (d6 <= 0)
+        weights[region] = np.stack([1 - t, zeros, t], axis=1)[region]
+        weights[(d6 >= 0) & (d5 <= d6)] = [0, 0, 1] # corner c
+        t = d1 / (d1 - d3) # edge ab
+        region = (vc <= 0) & (d1 >= 0) & (d3 <= 0)
+        weights[region] = np.stack([1 - t, t, zeros], axis=1)[region]
+        weights[(d3 >= 0) & (d4 <= d3)] = [0, 1, 0] # corner b
+        weights[(d1 <= 0) & (d2 <= 0)] = [1, 0, 0] # corner a
+    return weights
+
+class surfaceGrid3D():
+
+    # Inputs: ---------------------
+    # trianglePositions is a (triangles, 3, 3) array of the world positions of each triangle's corners
+    # threshold is how far a point can be from the surface of the mesh and still count as on it
+    # maxCells is the most cells used along each side of the grid
+    # Purpose: --------------------
+    # buckets the triangles into a uniform 3D grid by their bounding boxes (grown by threshold), so a point only has to be tested against the triangles in its cell
+    # it only uses numpy (which lets go of the GIL), so unlike a mathutils BVH tree it can be searched from several threads at once
+    def __init__(self, trianglePositions, threshold = 0.0005, maxCells = 256):
+        self.trianglePositions = trianglePositions
+        self.threshold = threshold
+        self.cells = np.ones(3, dtype=np.int64)
+        self.low = np.zeros(3)
+        self.cellSize = np.ones(3)
+        self.cellStarts = np.zeros(2, dtype=np.int64) # where each cell's triangles start in cellTriangles
+        self.cellTriangles = np.zeros(0, dtype=np.int64) # the triangles of each cell, one cell after another
+        if (len(trianglePositions) == 0):
+            return
+        triangleLow = trianglePositions.min(axis=1) - threshold
+        triangleHigh = trianglePositions.max(axis=1) + threshold
+        self.low = triangleLow.min(axis=0)
+        span = triangleHigh.max(axis=0) - self.low
+        size = max(np.cbrt(np.prod(span) / len(trianglePositions)), span.max() / maxCells) # cube cells, about one triangle per cell
+        self.cells = np.clip(np.ceil(span / size), 1, maxCells).astype(np.int64)
+        self.cellSize = span / self.cells
+        minCell = np.clip(np.floor((triangleLow - self.low) / self.cellSize), 0, self.cells - 1).astype(np.int64)
+        maxCell = np.clip(np.floor((triangleHigh - self.low) / self.cellSize), 0, self.cells - 1).astype(np.int64)
+        extent = maxCell - minCell + 1
+        counts = extent.prod(axis=1)
+        triangles = np.repeat(np.arange(len(trianglePositions)), counts)
+        local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) # position of the cell within its triangle's bounding box
+        cellX = minCell[triangles, 0] + local % extent[triangles, 0]
+        cellY = minCell[triangles, 1] + (local // extent[triangles, 0]) % extent[triangles, 1]
+        cellZ = minCell[triangles, 2] + local // (extent[triangles, 0] * extent[triangles, 1])
+        cellIds = cellX + (cellY + cellZ * self.cells[1]) * self.cells[0]
+        order = np.argsort(cellIds, kind='stable')
+        self.cellTriangles = triangles[order]
+        self.cellStarts = np.zeros(self.cells.prod() + 1, dtype=np.int64)
+        self.cellStarts[1:] = np.cumsum(np.bincount(cellIds, minlength=self.cells.prod()))
+
+    # Inputs: ---------------
+    # points is an (N, 3) array of world positions
+    # maxCandidates is roughly how many point and triangle pairs are tested at a time, which keeps the memory used bounded
+    # Purpose: --------------
+    # finds the nearest triangle within threshold of each point (like BVHTree.find_nearest), returning an array of the triangle numbers (-1 for points not near the surface) and an (N, 3) array of the barycentric weights of the nearest point on it
+    def findNearest(self, points, maxCandidates = 1 << 21):
+        triangleNums = np.full(len(points), -1, dtype=np.int64)
+        weights = np.zeros((len(points), 3))
+        if (len(points) == 0 or len(self.cellTriangles) == 0):
+            return triangleNums, weights
+        cell = np.floor((points - self.low) / self.cellSize).astype(np.int64)
+        inGrid = ((cell >= 0) & (cell < self.cells)).all(axis=1) # points outside of the grid are too far from every triangle
+        cellIds = np.where(inGrid, cell[:, 0] + (cell[:, 1] + cell[:, 2] * self.cells[1]) * self.cells[0], 0)
+        counts = np.where(inGrid, self.cellStarts[cellIds + 1] - self.cellStarts[cellIds], 0)
+        cumulativeCounts = np.cumsum(counts)
+        start = 0
+        while (start < len(points)):
+            # takes the next group of points that test about maxCandidates triangles together (at least one point)
+            end = np.searchsorted(cumulativeCounts, cumulativeCounts[start] - counts[start] + maxCandidates, side='right')
+            end = max(int(end), start + 1)
+            group = np.arange(start, end)
+            start = end
+            groupCounts = counts[group]
+            total = groupCounts.sum()
+            if (total == 0):
+                continue
+            candidatePoint = np.repeat(group, groupCounts)
+            local = np.arange(total) - np.repeat(np.cumsum(groupCounts) - groupCounts, groupCounts)
+            candidateTriangle = self.cellTriangles[self.cellStarts[cellIds[candidatePoint]] + local]
+            corners = self.trianglePositions[candidateTriangle]
+            candidateWeights = closestPointWeights(points[candidatePoint], corners)
+            closest = np.einsum('nk,nkd->nd', candidateWeights, corners)
+            distance = np.linalg.norm(closest - points[candidatePoint], axis=1)
+            near = np.flatnonzero(distance <= self.threshold) # nan distances (triangles with no area) are never near
+            if (len(near) == 0):
+                continue
+            order = near[np.lexsort((distance[near], candidatePoint[near]))] # by point, then nearest first
+            nearPoints, first = np.unique(candidatePoint[order], return_index=True)
+            triangleNums[nearPoints] = candidateTriangle[order[first]]
+            weights[nearPoints] = candidateWeights[order[first]]
+        return triangleNums, weights
+
+# Inputs: ------------
+# object is a MESH object from the scene
+# uv is the string for the name of the UV map used
+# Purpose: ---------
+# returns the uvMeshData of the object, reusing the cached one (with its surface grid and UV grid already made) if the triangles haven't changed since it was made
+# only the bulk copy of the mesh and its hash are made to check the cache, the uvMeshData is only worked out again (from the same copy) when the mesh changed
+def getUVMeshData(object, uv = "UVMap"):
+    export = exportUVMesh(object, uv)
+    cacheKey = (object.name, uv)
+    cached = bpy.types.Scene.uvMeshDataCache.get(cacheKey)
+    if (cached is not None and cached.key == uvMeshExportKey(export)):
+        return cached
+    meshData = uvMeshData(object, uv, export)
+    bpy.types.Scene.uvMeshDataCache[cacheKey] = meshData
+    return meshData
+
+class uvGridIndex():
+
+    # Inputs: ---------------------
+    # triangleUVs is a (triangles, 3, 2) array of the UV cordinates of each triangle's corners
+    # maxCells is the most cells used along each side of the grid
+    # Purpose: --------------------
+    # buckets the triangles into a uniform grid over the UVs by their bounding boxes, so a UV point only has to be tested against the triangles in its cell
+    def __init__(self, triangleUVs, maxCells = 1024):
+        self.triangleUVs = triangleUVs
+        self.cells = int(np.clip(np.sqrt(len(triangleUVs)), 1, maxCells)) # about one triangle per cell
+        self.low = np.zeros(2)
+        self.cellSize = np.ones(2)
+        self.cellStarts = np.zeros(self.cells * self.cells + 1, dtype=np.int64) # where each cell's triangles start in cellTriangles
+        self.cellTriangles = np.zeros(0, dtype=np.int64) # the triangles of each cell, one cell after another
+        if (len(triangleUVs) == 0):
+            return
+        self.low = triangleUVs.min(axis=(0, 1))
+        self.cellSize = np.maximum(triangleUVs.max(axis=(0, 1)) - self.low, 1e-12) / self.cells
+        minCell = np.clip(np.floor((triangleUVs.min(axis=1) - self.low) / self.cellSize), 0, self.cells - 1).astype(np.int64)
+        maxCell = np.clip(np.floor((triangleUVs.max(axis=1) - self.low) / self.cellSize), 0, self.cells - 1).astype(np.int64)
+        width = maxCell[:, 0] - minCell[:, 0] + 1
+        counts = width * (maxCell[:, 1] - minCell[:, 1] + 1)
+        triangles = np.repeat(np.arange(len(triangleUVs)), counts)
+        local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) # position of the cell within its triangle's bounding box
+        cellIds = (minCell[triangles, 0] + local % width[triangles]) + (minCell[triangles, 1] + local // width[triangles]) * self.cells
+        order = np.argsort(cellIds, kind='stable') # stable keeps each cell's triangles in order, so the first face found matches the old face loop
+        self.cellTriangles = triangles[order]
+        self.cellStarts[1:] = np.cumsum(np.bincount(cellIds, minlength=self.cells * self.cells))
+
+    # Inputs: ---------------
+    # uvs is an (N, 2) array of UV cordinates
+    # triangleMask is an optional boolean array of which triangles can be found (Ex. only the selected ones)
+    # maxCandidates is roughly how many point and triangle pairs are tested at a time, which keeps the memory used bounded
+    # Purpose: --------------
+    # finds the triangle each UV point is on, returning an array of the triangle numbers (-1 for points not on any triangle) and an (N, 3) array of their barycentric weights
+    def findTriangles(self, uvs, triangleMask = None, maxCandidates = 1 << 22):
+        triangleNums = np.full(len(uvs), -1, dtype=np.int64)
+        weights = np.zeros((len(uvs), 3))
+        if (len(uvs) == 0 or len(self.cellTriangles) == 0):
+            return triangleNums, weights
+        cell = np.floor((uvs - self.low) / self.cellSize).astype(np.int64)
+        cell = np.where(cell == self.cells, self.cells - 1, cell) # points right on the top edge of the grid go in the last cell
+        inGrid = ((cell >= 0) & (cell < self.cells)).all(axis=1)
+        cellIds = np.where(inGrid, cell[:, 0] + cell[:, 1] * self.cells, 0)
+        counts = np.where(inGrid, self.cellStarts[cellIds + 1] - self.cellStarts[cellIds], 0)
+        cumulativeCounts = np.cumsum(counts)
+        start = 0
+        while (start < len(uvs)):
+            # takes the next group of points that test about maxCandidates triangles together (at least one point)
+            end = np.searchsorted(cumulativeCounts, cumulativeCounts[start] - counts[start] + maxCandidates, side='right')
+            end = max(int(end), start + 1)
+            group = np.arange(start, end)
+            start = end
+            groupCounts = counts[group]
+            total = groupCounts.sum()
+            if (total == 0):
+                continue
+            candidatePoint = np.repeat(group, groupCounts)
+            local = np.arange(total) - np.repeat(np.cumsum(groupCounts) - groupCounts, groupCounts)
+            candidateTriangle = self.cellTriangles[self.cellStarts[cellIds[candidatePoint]] + local]
+            # barycentric weights of the points on the candidate triangles
+            corner = self.triangleUVs[candidateTriangle]
+            edge1 = corner[:, 1] - corner[:, 0]
+            edge2 = corner[:, 2] - corner[:, 0]
+            pointX = uvs[candidatePoint, 0] - corner[:, 0, 0]
+            pointY = uvs[candidatePoint, 1] - corner[:, 0, 1]
+            denominator = edge1[:, 0] * edge2[:, 1] - edge2[:, 0] * edge1[:, 1]
+            valid = np.abs(denominator) > 1e-18 # skips triangles with no area in the UV
+            denominator = np.where(valid, denominator, 1)
+            weight1 = (pointX * edge2[:, 1] - edge2[:, 0] * pointY) / denominator
+            weight2 = (edge1[:, 0] * pointY - pointX * edge1[:, 1]) / denominator
+            weight0 = 1 - weight1 - weight2
+            epsilon = -1e-9 # lets points right on an edge count like intersect_point_tri_2d does
+            inside = valid & (weight0 >= epsilon) & (weight1 >= epsilon) & (weight2 >= epsilon)
+            if (triangleMask is not None):
+                inside = inside & triangleMask[candidateTriangle]
+            hits = np.flatnonzero(inside)
+            points, first = np.unique(candidatePoint[hits], return_index=True) # the first triangle found for each point
+            hits = hits[first]
+            triangleNums[points] = candidateTriangle[hits]
+            weights[points] = np.stack([weight0[hits], weight1[hits], weight2[hits]], axis=1)
+        return triangleNums, weights
+
+# Inputs: ------------
+# triangleUVs is a (triangles, 3, 2) array of the UV cordinates of each triangle's corners
+# sizeX and sizeY are the size of the texture
+# triangleNums is an optional array of which triangles to rasterize (defaults to all of them)
+# maxCandidates is roughly how many pixels are tested at a time, which keeps the memory used bounded for large textures
+# rowStart and rowEnd limit the rasterizing to a band of rows of the texture (Ex. so bands can be done on separate threads)
+# Purpose: ---------
+# rasterizes the UV triangles over the pixel grid, yielding (pixelNums, triangleNums, weights) for the pixel centers that are inside each triangle
+# weights is an (N, 3) array of the barycentric weights of the pixel centers on their triangle, so every covered pixel's 3D position can be found in bulk
+# pixels outside of every UV island are never visited, so the work is proportional to the pixels covered plus the triangles instead of pixels times faces
+def rasterizeUVTriangles(triangleUVs, sizeX, sizeY, triangleNums = None, maxCandidates = 1 << 22, rowStart = 0, rowEnd = None):
+    if (triangleNums is None):
+        triangleNums = np.arange(len(triangleUVs))
+    corners = triangleUVs[triangleNums] * np.array([sizeX, sizeY]) # in pixel units, where pixel x covers x to x + 1 and its center is x + 0.5
+    # bounding box of the pixel centers each triangle could cover
+    minX = np.clip(np.ceil(corners[:, :, 0].min(axis=1) - 0.5), 0, sizeX).astype(np.int64)
+    maxX = np.clip(np.floor(corners[:, :, 0].max(axis=1) - 0.5), -1, sizeX - 1).astype(np.int64)
+    if (rowEnd is None):
+        rowEnd = sizeY
+    minY = np.clip(np.ceil(corners[:, :, 1].min(axis=1) - 0.5), rowStart, rowEnd).astype(np.int64)
+    maxY = np.clip(np.floor(corners[:, :, 1].max(axis=1) - 0.5), rowStart - 1, rowEnd - 1).astype(np.int64)
+    width = np.maximum(maxX - minX + 1, 0)
+    height = np.maximum(maxY - minY + 1, 0)
+    counts = width * height
+    cumulativeCounts = np.cumsum(counts)
+    start = 0
+    while (start < len(counts)):
+        # takes the next group of triangles that test about maxCandidates pixels together (at least one triangle)
+        end = np.searchsorted(cumulativeCounts, cumulativeCounts[start] - counts[start] + maxCandidates, side='right')
+        end = max(int(end), start + 1)
+        group = np.arange(start, end)
+        start = end
+        groupCounts = counts[group]
+        total = groupCounts.sum()
+        if (total == 0):
+            continue
+        candidateTriangle = np.repeat(group, groupCounts)
+        local = np.arange(total) - np.repeat(np.cumsum(groupCounts) - groupCounts, groupCounts) # position of the pixel within its triangle's bounding box
+        x = minX[candidateTriangle] + local % width[candidateTriangle]
+        y = minY[candidateTriangle] + local // width[candidateTriangle]
+        # barycentric weights of the pixel centers
+        corner = corners[candidateTriangle]
+        edge1 = corner[:, 1] - corner[:, 0]
+        edge2 = corner[:, 2] - corner[:, 0]
+        pointX = x + 0.5 - corner[:, 0, 0]
+        pointY = y + 0.5 - corner[:, 0, 1]
+        denominator = edge1[:, 0] * edge2[:, 1] - edge2[:, 0] * edge1[:, 1]
+        valid = np.abs(denominator) > 1e-12 # skips triangles with no area in the UV
+        denominator = np.where(valid, denominator, 1)
+        weight1 = (pointX * edge2[:, 1] - edge2[:, 0] * pointY) / denominator
+        weight2 = (edge1[:, 0] * pointY - pointX * edge1[:, 1]) / denominator
+        weight0 = 1 - weight1 - weight2
+        epsilon = -1e-9 # lets pixel centers right on a shared edge count
+        inside = valid & (weight0 >= epsilon) & (weight1 >= epsilon) & (weight2 >= epsilon)
+        if (not inside.any()):
+            continue
+        weights = np.stack([weight0[inside], weight1[inside], weight2[inside]], axis=1)
+        yield (x[inside] + y[inside] * sizeX), triangleNums[candidateTriangle[inside]], weights
+
+# Inputs: ------------
+# length is the number of pixels in the texture
+# Purpose: ---------
+# returns an empty pixelMap, which holds the pixel number of each pixel's mirror (-1 for pixels that aren't mapped yet)
+# int32 pixel numbers are used instead of (x, y) pairs, which is 4 times less memory and lets the whole map be applied with one gather
+def newPixelMap(length):
+    return np.full(length, -1, dtype=np.int32)
+
+# Inputs: ------------
+# meshData is the uvMeshData of the object
+# pixelNums is an array of pixel numbers
+# sizeX and sizeY are the size of the texture
+# Purpose: ---------
+# yields the (pixelNums, triangleNums, weights) of the pixels that are on a UV triangle, like rasterizeUVTriangles but for a given set of pixels
+def pixelsOnUVTriangles(meshData, pixelNums, sizeX, sizeY):
+    triangleNums, weights = meshData.getGridIndex().findTriangles(pixelNumsToUVs(pixelNums, sizeX, sizeY))
+    onModel = triangleNums != -1
+    yield pixelNums[onModel], triangleNums[onModel], weights[onModel]
+
+# Inputs: ------------
+# meshData is the uvMeshData of the object
+# batches is an iterable of (pixelNums, triangleNums, weights) of pixels on the UV triangles (Ex. from rasterizeUVTriangles)
+# location is the location of the object
+# axis is axis letter ex. 'x', 'y', or 'z'
+# sizeX and sizeY are the size of the texture
+# mappedBefore is a boolean array of the pixels that were mapped before the mapping was started, which are skipped, or None to map every pixel again
+# Purpose: ---------
+# finds the mirror of every pixel in the batches, returning the pixels on the UV islands, the pairs of pixels and their mirrors, and the pixels with a mirror along with the pixel cordinates of their mirrors (for the mirrorMapInverse)
+# only uses numpy and never touches bpy, so it is run on several threads at once by createSnapshotMapping
+# mappedBefore doesn't change while the bands run, so a pixel mapped by another band is still found here and the inverse of a fresh mapping has every pixel
+def mirrorPixelBatches(meshData, batches, location, axis, sizeX, sizeY, mappedBefore):
+    islandParts = [np.zeros(0, dtype=np.int64)]
+    pixelParts = [np.zeros(0, dtype=np.int64)]
+    mirrorParts = [np.zeros(0, dtype=np.int64)]
+    inverseParts = [np.zeros(0, dtype=np.int64)]
+    cordParts = [np.zeros((0, 2), dtype=np.float32)]
+    for pixelNums, triangleNums, weights in batches:
+        islandParts.append(pixelNums)
+        if (mappedBefore is not None):
+            toMap = ~mappedBefore[pixelNums]
+            pixelNums = pixelNums[toMap]
+            triangleNums = triangleNums[toMap]
+            weights = weights[toMap]
+        points = meshData.pointsFromBarycentric(triangleNums, weights) # the 3D position of every covered pixel at once
+        pointsMirror = mirror3dCordinatesAboutPoint(points, location, axis)
+        uvsMirror, found = meshData.findUVsFromPoints(pointsMirror, 0.0005)
+        mirrorPixelNums = uvsToPixelNums(uvsMirror, sizeX, sizeY)
+        found = found & (mirrorPixelNums != -1) # prevents trying to mirror for when the mirror doesn't land (Ex. when the mesh isn't symmetric or isn't symmetric on the currently selected axis)
+        inverseParts.append(pixelNums[found])
+        cordParts.append(uvsToPixelCords(uvsMirror[found], sizeX, sizeY))
+        pixelParts.append(pixelNums[found])
+        mirrorParts.append(mirrorPixelNums[found])
+    return np.concatenate(islandParts), np.concatenate(pixelParts), np.concatenate(mirrorParts), np.concatenate(inverseParts), np.concatenate(cordParts)
+
+mirrorMapWorkerState = None # the (meshData, location, axis, sizeX, sizeY, mappedBefore) of the mapping being made, which forked worker processes inherit instead of having it sent to them
+
+# Inputs: ------------
+# state is the (meshData, location, axis, sizeX, sizeY, mappedBefore) of the mapping being made
+# job is ("rows", rowStart, rowEnd) for a band of rows of the texture, or ("pixels", pixelNums) for a set of pixels to remap
+# Purpose: ---------
+# returns the mirrorPixelBatches of one band of a mapping, never touching bpy so it can run on a thread or in a worker process
+def mirrorMapBand(state, job):
+    meshData, location, axis, sizeX, sizeY, mappedBefore = state
+    if (job[0] == "rows"):
+        batches = rasterizeUVTriangles(meshData.triangleUVs, sizeX, sizeY, rowStart = job[1], rowEnd = job[2])
     else:
-        print("Error: Given object doesn't match object used to create snapshot")
+        batches = pixelsOnUVTriangles(meshData, job[1], sizeX, sizeY)
+    return mirrorPixelBatches(meshData, batches, location, axis, sizeX, sizeY, mappedBefore)
+
+# mirrorMapBand in a worker process, with the pixel numbers sent back as int32 to halve what goes through the pipe
+def mirrorMapBandInProcess(job):
+    return tuple(array.astype(np.int32) if array.dtype == np.int64 else array for array in mirrorMapBand(mirrorMapWorkerState, job))
+
+# Inputs: ------------
+# workers is how many workers the mapping is split across
+# Purpose: ---------
+# returns a process pool for the bands of a mapping, or None where threads are used instead
+# the workers are forked so they inherit the mesh and its grids without them being pickled, which is only done on Linux as forking isn't available on Windows and isn't safe on macOS
+# (the python in Blender can't start fresh worker processes, as they would import this addon and bpy)
+def mirrorMapProcessPool(workers):
+    if (workers < 2 or not sys.platform.startswith("linux")):
+        return None
+    try:
+        return concurrent.futures.ProcessPoolExecutor(max_workers = workers, mp_context = multiprocessing.get_context("fork"))
+    except (OSError, ValueError):
+        return None
 
 # Inputs --------------------------
-# object is a scene object
-# tempBmehs is the bmesh of the object
+# object is a scene object, or None to only find the holes of the given pixelMap
 # texture is an image texture
 # snapshot is an textureSnapshot (used as a faster alternative to the texture)
+# sizeX and sizeY are the size of the texture, used when neither texture nor snapshot is given (Ex. remapping a mapping kept in memory)
+# axis is axis letter ex. 'x', 'y', or 'z'
+# uv is the string for the name of the UV map used
+# pixelMap is the array for storing the pixel number a pixel corresponds to (see newPixelMap)
+# remapPixels is an optional array of the only pixels to map (Ex. the pixels on triangles that changed), which are found through the UV grid index instead of rasterizing every triangle
+# islandMask is the boolean array of the pixels on a UV island from when the pixelMap was made, needed with remapPixels to find the holes without rasterizing every triangle
+# threads is how many workers the pixels are split across (defaults to the number of cpu cores), worker processes on Linux and threads elsewhere
+# inverse is the mirrorMapInverse of the pixelMap, needed with remapPixels so only the remapped pixels are found again
+# remapAll is whether to map the pixels already in pixelMap again too (Ex. a pixelMap made for another axis), otherwise only the unmapped pixels are mapped and the mapped ones are never written over
+# Output: ------------------------
+# returns the pixelMap and a mirrorMapHoles of the pixels on the UV islands that have no mirror, which holds the mirrorMapInverse made with the pixelMap
+def createSnapshotMapping(object = None, texture = None, snapshot = None, axis = 'x', uv = "UVMap", pixelMap = None, remapPixels = None, islandMask = None, threads = None, inverse = None, sizeX = 0, sizeY = 0, remapAll = False):
+    builder = mirrorMapBuilder(object, texture, snapshot, axis, uv, pixelMap, remapPixels, islandMask, threads, inverse, sizeX, sizeY, remapAll)
+    builder.step() # runs all of it at once
+    return builder.pixelMap, builder.mapHoles
+
+class mirrorMapBuilder():
+
+    # Inputs: ---------------------
+    # the same as createSnapshotMapping
+    # Purpose: --------------------
+    # starts making a pixelMap on a pool of workers, which can then be finished a bit at a time with step (Ex. from a modal operator so blender doesn't freeze)
+    def __init__(self, object = None, texture = None, snapshot = None, axis = 'x', uv = "UVMap", pixelMap = None, remapPixels = None, islandMask = None, threads = None, inverse = None, sizeX = 0, sizeY = 0, remapAll = False):
+        length = sizeX * sizeY
+        if texture != None:
+            sizeX = texture.size[0]
+            sizeY = texture.size[1]
+            length = sizeX * sizeY # avoids going through texture.pixels, which is slow to access
+        elif snapshot != None:
+            sizeX = snapshot.sizeX
+            sizeY = snapshot.sizeY
+            length = sizeX * sizeY
+        self.sizeX = sizeX
+        self.sizeY = sizeY
+
+        if (pixelMap is None):
+            pixelMap = newPixelMap(length) # Make it so the pixelMap is the size of the full mapping, but set to an out of bounds index like -1. Then add all of the mappings, but skip it if the corresponding pair of pixels are already mapped (known by if the number in them isn't -1). Also bind pairs together, so once you find a mapping for pixelA in pixelB, then pixelB can be set to have pixelA as its mapping.
+        self.pixelMap = pixelMap
+        self.mapHoles = None # found once every band is done
+        self.remapAll = remapAll # only updates the pixels that haven't been mapped unless told to remap them all
+        if (islandMask is None):
+            islandMask = np.zeros(length, dtype=bool) # marks the pixels that are on a UV island (landed on a face)
+        self.islandMask = islandMask
+        if (remapPixels is None):
+            inverse = None # made from scratch
+        elif (inverse is not None):
+            inverse = inverse.without(remapPixels) # found again with the rest of the remapped pixels
+        self.inverse = inverse
+        self.makeInverse = object != None and (remapPixels is None or inverse is not None) # an inverse of only the remapped pixels would be missing the rest
+        self.inverseParts = [] # the destinations and source cordinates found by each band
+        self.bands = [] # futures of the mirrorPixelBatches of each band, merged in order
+        self.merged = 0
+        self.progress = 0 # fraction of the bands merged (0 to 1)
+        self.pool = None
+        if (object != None):
+            meshData = getUVMeshData(object, uv)
+            # made here so the workers share them instead of each making their own
+            meshData.getSurfaceGrid(0.0005)
+            location = np.array(object.location)
+            if (threads is None):
+                threads = os.cpu_count() or 1
+            if (remapPixels is None):
+                # splits the texture into bands of rows, going through the pixels covered by each UV triangle instead of testing every pixel against every face
+                bandRows = max(1, -(-sizeY // (threads * 4))) # several bands per worker so the workers finish close together
+                jobs = [("rows", rowStart, min(rowStart + bandRows, sizeY)) for rowStart in range(0, sizeY, bandRows)]
+            else:
+                islandMask[remapPixels] = False # found again below, as they may no longer be on a triangle
+                meshData.getGridIndex()
+                jobs = [("pixels", chunk) for chunk in np.array_split(remapPixels, threads * 4)]
+            mappedBefore = None if self.remapAll else pixelMap != -1 # read by the workers instead of pixelMap, which changes as the bands are merged
+            state = (meshData, location, axis, sizeX, sizeY, mappedBefore)
+            global mirrorMapWorkerState
+            mirrorMapWorkerState = state # set before the workers are forked by the first submit
+            self.pool = mirrorMapProcessPool(threads)
+            if (self.pool is not None):
+                self.bands = [self.pool.submit(mirrorMapBandInProcess, job) for job in jobs]
+            else: # numpy lets go of the GIL for the larger steps, but the python between them doesn't, so threads scale less well than processes
+                self.pool = concurrent.futures.ThreadPoolExecutor(max_workers = threads)
+                self.bands = [self.pool.submit(mirrorMapBand, state, job) for job in jobs]
+            mirrorMapWorkerState = None # the workers have their own copy, this one would keep the mesh alive
+
+    # Inputs: ---------------
+    # timeBudget is roughly how many seconds to spend before returning (None to finish all of it)
+    # Purpose: --------------
+    # merges the bands the threads have finished into the pixelMap, returning True once the whole mapping is made
+    def step(self, timeBudget = None):
+        with mirrorStage("map build"):
+            return self.stepBands(timeBudget)
+
+    # does the work of step
+    def stepBands(self, timeBudget):
+        startTime = time.time()
+        while (self.merged < len(self.bands)):
+            band = self.bands[self.merged]
+            if (timeBudget is not None and (not band.done() or time.time() - startTime > timeBudget)):
+                return False # comes back to it next step instead of waiting on the threads
+            islandPixels, pixelNums, mirrorPixelNums, inversePixels, inverseCords = band.result()
+            self.inverseParts.append((inversePixels, inverseCords))
+            self.bands[self.merged] = None # lets the band's arrays be freed
+            self.merged += 1
+            self.progress = self.merged / len(self.bands)
+            self.islandMask[islandPixels] = True # merged in order so the result doesn't depend on which thread finished first
+            if (not self.remapAll): # another band may have mapped these since
+                toMap = self.pixelMap[pixelNums] == -1
+                pixelNums = pixelNums[toMap]
+                mirrorPixelNums = mirrorPixelNums[toMap]
+            self.pixelMap[pixelNums] = mirrorPixelNums # sets pixel A's mirror
+            self.pixelMap[mirrorPixelNums] = pixelNums # set pixel B's mirror to pixel A
+        if (self.pool is not None):
+            self.pool.shutdown()
+            self.pool = None
+        mapped = self.pixelMap != -1
+        self.islandMask = self.islandMask | mapped # pixels skipped because they were already mapped are on an island too
+        self.mapHoles = findMirrorMapHoles(mapped, self.islandMask, self.sizeX, self.sizeY)
+        if (self.makeInverse):
+            destinations = np.concatenate([np.zeros(0, dtype=np.int64)] + [part[0] for part in self.inverseParts])
+            sourceCords = np.concatenate([np.zeros((0, 2), dtype=np.float32)] + [part[1] for part in self.inverseParts])
+            if (self.inverse is not None):
+                destinations = np.concatenate([self.inverse.destinations, destinations])
+                sourceCords = np.concatenate([self.inverse.sourceCords, sourceCords])
+            self.mapHoles.inverse = mirrorMapInverse(destinations, sourceCords, self.sizeX, self.sizeY, np.packbits(self.islandMask))
+        self.inverseParts = []
+        self.progress = 1
+        return True
+
+    # stops making the mapping, leaving the pixelMap with the bands merged so far (mapHoles stays None as the mapping isn't finished)
+    def cancel(self):
+        if (self.pool is not None):
+            self.pool.shutdown(wait = False, cancel_futures = True)
+            self.pool = None
+        self.bands = []
+
+class mirrorMapHoles():
+
+    # Inputs: ---------------------
+    # holePixels is an array of the pixel numbers on a UV island that have no mirror in the mapping
+    # neighborPixels is an (N, 8) array of the mapped pixels bordering each hole (-1 where there isn't one)
+    # neighborWeights is an (N, 8) array of how much each of those neighbours counts when filling the hole
+    # coverage is the fraction of the pixels on the UV islands that are mapped (0 to 1)
+    # inverse is the mirrorMapInverse made along with the mapping, or None
+    def __init__(self, holePixels = None, neighborPixels = None, neighborWeights = None, coverage = 0, inverse = None):
+        if (holePixels is None):
+            holePixels = np.zeros(0, dtype=np.int64)
+        if (neighborPixels is None):
+            neighborPixels = np.full((0, 8), -1, dtype=np.int64)
+        if (neighborWeights is None):
+            neighborWeights = np.zeros((0, 8), dtype=np.float32)
+        self.holePixels = holePixels
+        self.neighborPixels = neighborPixels
+        self.neighborWeights = neighborWeights
+        self.coverage = coverage
+        self.inverse = inverse
+
+# Inputs: ------------------------
+# mapped is a boolean array that is True for every pixel with a mirror in the mapping
+# islandMask is a boolean array that is True for every pixel on a UV island
+# sizeX and sizeY are the size of the texture
+# Purpose: -----------------------
+# finds the pixels on the UV islands that have no mirror (holes) and works out which of their neighbours can be used to fill them in
+# this is done once when the mapping is made so mirroring only has to fill in these known holes instead of guessing from the whole image
+def findMirrorMapHoles(mapped, islandMask, sizeX, sizeY):
+    holePixels = np.flatnonzero(islandMask & ~mapped)
+    islandCount = np.count_nonzero(islandMask)
+    coverage = 0
+    if (islandCount > 0):
+        coverage = 1 - len(holePixels) / islandCount
+    x = holePixels % sizeX
+    y = holePixels // sizeX
+    neighborPixels = np.full((len(holePixels), len(gapFillNeighborOffsets)), -1, dtype=np.int64)
+    neighborWeights = np.zeros((len(holePixels), len(gapFillNeighborOffsets)), dtype=np.float32)
+    for j, (dx, dy) in enumerate(gapFillNeighborOffsets):
+        neighborX = x + dx
+        neighborY = y + dy
+        valid = (neighborX >= 0) & (neighborX < sizeX) & (neighborY >= 0) & (neighborY < sizeY)
+        neighbor = pixelCordToPixelNum([neighborX[valid], neighborY[valid]], sizeX, sizeY)
+        neighborMapped = mapped[neighbor]
+        valid[valid] = neighborMapped
+        neighborPixels[valid, j] = neighbor[neighborMapped]
+        neighborWeights[valid, j] = 1 / math.sqrt(dx * dx + dy * dy) # diagonal neighbours are further away so count for less
+    return mirrorMapHoles(holePixels, neighborPixels, neighborWeights, coverage)
+
+class mirrorMapInverse():
+
+    # Inputs: ---------------------
+    # destinations is an array of the pixel numbers that have a mirror
+    # sourceCords is an (N, 2) float32 array of the pixel cordinates of each one's mirror, which can be between pixels (where its value is read from when mirroring)
+    # sizeX and sizeY are the size of the texture
+    # islandBits is np.packbits of the boolean array of the pixels on a UV island, so sampling between pixels only blends pixels on the model
+    # sources is the nearest pixel number of each sourceCords, only given when the arrays are already sorted by it (Ex. loaded from the cache)
+    # Purpose: --------------------
+    # the destination to source map of a pixelMap, going from every pixel to where its mirror is instead of rounding every pixel onto its mirror
+    # every pixel on the islands gets a value this way, so mirroring through it leaves none of the gaps the pixelMap's pairs leave on curved areas
+    # the arrays are kept sorted by the source pixel, so the pixels mirrored from the changed pixels are found with a binary search instead of a pass over the whole texture
+    def __init__(self, destinations, sourceCords, sizeX, sizeY, islandBits = None, sources = None):
+        if (sources is None):
+            nearest = np.rint(sourceCords).astype(np.int64)
+            sources = np.clip(nearest[:, 0], 0, sizeX - 1) + np.clip(nearest[:, 1], 0, sizeY - 1) * sizeX
+            order = np.argsort(sources, kind='stable')
+            destinations = destinations[order].astype(np.int32)
+            sourceCords = sourceCords[order].astype(np.float32)
+            sources = sources[order].astype(np.int32)
+        self.destinations = destinations
+        self.sourceCords = sourceCords
+        self.sources = sources
+        self.sizeX = sizeX
+        self.sizeY = sizeY
+        self.islandBits = islandBits
+
+    # Inputs: ---------------
+    # changedPixels is a sorted array of the changed pixel numbers
+    # Purpose: --------------
+    # returns the pixels whose mirror is nearest to a changed pixel, the cordinates of their mirrors, and a boolean array of which changed pixels were mirrored from
+    def find(self, changedPixels):
+        starts = np.searchsorted(self.sources, changedPixels, side='left')
+        counts = np.searchsorted(self.sources, changedPixels, side='right') - starts
+        ends = np.cumsum(counts)
+        entries = np.repeat(starts - (ends - counts), counts) + np.arange(ends[-1] if len(ends) > 0 else 0) # the range of entries of every changed pixel, all at once
+        return self.destinations[entries].astype(np.int64), self.sourceCords[entries], counts > 0
+
+    # returns a copy without the entries of the given destination pixels (Ex. ones being remapped after the mesh changed)
+    def without(self, pixelNums):
+        keep = ~np.isin(self.destinations, pixelNums)
+        return mirrorMapInverse(self.destinations[keep], self.sourceCords[keep], self.sizeX, self.sizeY, self.islandBits, self.sources[keep])
+
+# Mirror map disk cache ---------------------------------------------
+mirrorMapCacheVersion = 3 # changed whenever the saved format changes, so older mappings are never loaded (2: int32 pixel numbers, 3: the inverse)
+mirrorMapCacheFiles = ["pixelMap", "holePixels", "neighborPixels", "neighborWeights", "coverage", "inverseDestinations", "inverseSourceCords", "inverseSources", "islandBits", "size"] # the arrays saved for each mapping, one .npy file each
+
+# returns the directory the mirror maps are cached in, making it if needed
+def mirrorMapCacheDirectory():
+    return bpy.utils.user_resource('DATAFILES', path="mirror_map_cache", create=True)
+
+# Inputs: ------------------------
+# meshData is the uvMeshData of the object the mapping is for
+# uv is the string for the name of the UV map used
+# sizeX and sizeY are the size of the texture
+# axis is axis letter ex. 'x', 'y', or 'z'
+# Purpose: -----------------------
+# returns the name a mapping is cached under, which changes whenever anything the mapping depends on changes
+def mirrorMapCacheKey(meshData, uv, sizeX, sizeY, axis):
+    return hashlib.sha1("{}|{}|{}|{}x{}|{}".format(mirrorMapCacheVersion, meshData.objectKey, uv, sizeX, sizeY, axis).encode()).hexdigest()
+
+# Inputs: ------------------------
+# key is the name from mirrorMapCacheKey
+# pixelMap and mapHoles are the mapping and its mirrorMapHoles to save
+# maxBytes is the most space the whole cache can use before the least recently used mappings are removed
+# Purpose: -----------------------
+# saves the mapping to the disk cache as uncompressed .npy files so it can be memory mapped when loaded
+def saveMirrorMapToCache(key, pixelMap, mapHoles, maxBytes):
+    if (maxBytes <= 0): # the cache is turned off
+        return
+    directory = mirrorMapCacheDirectory()
+    path = os.path.join(directory, key)
+    tempPath = path + ".tmp" # written to the side first so a half written mapping is never loaded
+    shutil.rmtree(tempPath, ignore_errors=True)
+    os.makedirs(tempPath)
+    inverse = mapHoles.inverse
+    if (inverse is None): # saved empty, and loaded back as None
+        inverse = mirrorMapInverse(np.zeros(0, dtype=np.int32), np.zeros((0, 2), dtype=np.float32), 0, 0, np.zeros(0, dtype=np.uint8), np.zeros(0, dtype=np.int32))
+    arrays = [pixelMap, mapHoles.holePixels, mapHoles.neighborPixels, mapHoles.neighborWeights, np.array(mapHoles.coverage), inverse.destinations, inverse.sourceCords, inverse.sources, inverse.islandBits, np.array([inverse.sizeX, inverse.sizeY])]
+    for name, array in zip(mirrorMapCacheFiles, arrays):
+        np.save(os.path.join(tempPath, name + ".npy"), array)
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tempPath, path)
+    evictMirrorMapCache(directory, maxBytes)
+
+# Inputs: ------------------------
+# key is the name from mirrorMapCacheKey
+# Purpose: -----------------------
+# returns the cached pixelMap and mirrorMapHoles, or (None, None) if the mapping isn't cached
+# the arrays are memory mapped copy on write, so a large map opens instantly, only the parts used are read from disk, and mirroring can still add to it without changing the file
+def loadMirrorMapFromCache(key):
+    path = os.path.join(mirrorMapCacheDirectory(), key)
+    if (not os.path.isdir(path)):
+        return None, None
+    try:
+        arrays = [np.load(os.path.join(path, name + ".npy"), mmap_mode='c') for name in mirrorMapCacheFiles]
+    except (OSError, ValueError):
+        print("Error: cached mirror map could not be read, it will be remade")
+        shutil.rmtree(path, ignore_errors=True)
+        return None, None
+    os.utime(path) # marks it as recently used for the eviction
+    inverse = None
+    if (len(arrays[5]) > 0):
+        inverse = mirrorMapInverse(arrays[5], arrays[6], int(arrays[9][0]), int(arrays[9][1]), arrays[8], arrays[7])
+    return arrays[0], mirrorMapHoles(arrays[1], arrays[2], arrays[3], float(arrays[4]), inverse)
+
+# Inputs: ------------------------
+# directory is the cache directory
+# maxBytes is the most space the cache can use
+# Purpose: -----------------------
+# removes the least recently used mappings until the cache fits in maxBytes
+def evictMirrorMapCache(directory, maxBytes):
+    entries = []
+    totalBytes = 0
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        if (not os.path.isdir(path) or name.endswith(".tmp")):
+            continue
+        size = sum(os.path.getsize(os.path.join(path, file)) for file in os.listdir(path))
+        entries.append((os.path.getmtime(path), size, path))
+        totalBytes += size
+    entries.sort() # oldest first
+    for modified, size, path in entries:
+        if (totalBytes <= maxBytes):
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        totalBytes -= size
+
+# Mirror map memory cache ---------------------------------------------
+class mirrorMapEntry():
+
+    # Inputs: ---------------------
+    # pixelMap is the mapping
+    # mapHoles is the mirrorMapHoles of the mapping (None if it was made lazily)
+    # meshData is the uvMeshData of the mesh the mapping was made for
+    # Purpose: --------------------
+    # a mapping kept in the mirrorMapMemoryCache, along with the fingerprint and UVs of each triangle it was made for so mesh changes can be found later
+    def __init__(self, pixelMap, mapHoles, meshData):
+        self.pixelMap = pixelMap
+        self.mapHoles = mapHoles
+        self.fingerprints = meshData.fingerprints
+        self.triangleUVs = meshData.triangleUVs
+
+    # returns every array of the mapping
+    def arrays(self):
+        arrays = [self.pixelMap, self.fingerprints, self.triangleUVs]
+        if (self.mapHoles is not None):
+            arrays += [self.mapHoles.holePixels, self.mapHoles.neighborPixels, self.mapHoles.neighborWeights]
+            inverse = self.mapHoles.inverse
+            if (inverse is not None):
+                arrays += [inverse.destinations, inverse.sourceCords, inverse.sources] + ([inverse.islandBits] if inverse.islandBits is not None else [])
+        return arrays
+
+    # returns how much memory the mapping uses in bytes, not counting the arrays memory mapped from the disk cache (the operating system pages those in and out itself)
+    def nbytes(self):
+        return sum(array.nbytes for array in self.arrays() if not isinstance(array, np.memmap))
+
+    # returns how many bytes of the mapping are memory mapped from the disk cache
+    def mappedBytes(self):
+        return sum(array.nbytes for array in self.arrays() if isinstance(array, np.memmap))
+
+class mirrorMapMemoryCache():
+
+    # Purpose: --------------------
+    # holds several mappings at once (Ex. every axis of several objects) so switching between them doesn't throw any away
+    def __init__(self):
+        self.entries = collections.OrderedDict() # key -> mirrorMapEntry, least recently used first
+
+    # returns the mirrorMapEntry stored for the key, or None, and marks it as recently used
+    def get(self, key):
+        if (key not in self.entries):
+            return None
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    # Inputs: ---------------
+    # key is the tuple from mirrorMapKeysForSelection
+    # entry is the mirrorMapEntry to store
+    # maxBytes is the most memory all of the mappings can use before the least recently used ones are removed
+    def put(self, key, entry, maxBytes):
+        if (key is None or entry.pixelMap is None):
+            return
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while (len(self.entries) > 1 and self.totalBytes() > maxBytes): # the newest mapping is always kept as it is the one in use
+            self.entries.popitem(last=False)
+
+    # removes the mapping stored for the key if there is one
+    def remove(self, key):
+        self.entries.pop(key, None)
+
+    # returns how much memory all of the mappings use in bytes
+    def totalBytes(self):
+        return sum(entry.nbytes() for entry in self.entries.values())
+
+    # returns a line of text describing each stored mapping, most recently used first (used by the panel)
+    def describe(self):
+        lines = []
+        for key, entry in reversed(self.entries.items()):
+            objectName, uv, sizeX, sizeY, axis = key
+            line = "{} ({}) {}x{} {}: {} MB".format(objectName, uv, sizeX, sizeY, axis, round(entry.nbytes() / (1024 * 1024), 1))
+            if (entry.mappedBytes() > 0):
+                line += " + {} MB on disk".format(round(entry.mappedBytes() / (1024 * 1024), 1))
+            if (entry.mapHoles is None):
+                line += " (lazy)"
+            lines.append(line)
+        return lines
+
+# Inputs: ------------------------
+# context is the blender context
+# axis is axis letter ex. 'x', 'y', or 'z'
+# Purpose: -----------------------
+# returns the key the selected object, UV map and image's mapping is stored under in memory, the name it is cached under on disk and the uvMeshData of the object, or (None, None, None) if nothing usable is selected
+# the disk name has the mesh hash in it so only a mapping made for exactly this mesh is loaded, while the mapping in memory is checked triangle by triangle and updated when the mesh changes
+def mirrorMapKeysForSelection(context, axis):
+    myPointers = context.scene.snapshotObjectPointer
+    for area in context.screen.areas:
+        if area.type == 'IMAGE_EDITOR':
+            image = area.spaces.active.image
+            if (image is not None):
+                return mirrorMapKeys(myPointers.selectedObject, myPointers.selectedUV, image, axis)
+    return None, None, None
+
+# the same as mirrorMapKeysForSelection, but for the given object, UV map and image instead of the selected ones (Ex. for a batch job)
+def mirrorMapKeys(object, uv, image, axis):
+    if (object is None or object.type != 'MESH'):
+        return None, None, None
+    meshData = getUVMeshData(object, uv)
+    memoryKey = (object.name, uv, image.size[0], image.size[1], axis)
+    return memoryKey, mirrorMapCacheKey(meshData, uv, image.size[0], image.size[1], axis), meshData
+
+# Inputs: ------------------------
+# entry is the mirrorMapEntry of the mapping made before the mesh changed
+# meshData is the uvMeshData of the changed mesh
+# object is the object the mapping is for
 # axis is axis letter ex. 'x', 'y', or 'z'
 # uv is the string for the name of the UV map used
-# pixelMap is the array for storing the cordinates a pixel corresponds to
-def createSnapshotMapping(object = None, tempBmesh = None, texture = None, snapshot = None, axis = 'x', uv = "UVMap", pixelMap = None):
+# sizeX and sizeY are the size of the texture
+# Purpose: -----------------------
+# brings a mapping up to date with the changed mesh by only remapping the pixels covered by the triangles that changed and the pixels mirrored to them, instead of remaking the whole mapping
+# triangles are compared by their index, so the whole mapping is remade when triangles were added or removed
+# returns the updated pixelMap and mirrorMapHoles (None for lazily made mappings, which relearn the removed pixels the next time they are mirrored)
+def updateMirrorMapForMeshChanges(entry, meshData, object, axis, uv, sizeX, sizeY):
+    if (len(entry.fingerprints) != len(meshData.fingerprints)):
+        if (entry.mapHoles is None):
+            return newPixelMap(sizeX * sizeY), None
+        return createSnapshotMapping(object = object, sizeX = sizeX, sizeY = sizeY, axis = axis, uv = uv)
+    changedTriangles = np.flatnonzero(entry.fingerprints != meshData.fingerprints)
+    affected = [np.zeros(0, dtype=np.int64)]
+    for pixelNums, triangleNums, weights in rasterizeUVTriangles(meshData.triangleUVs, sizeX, sizeY, changedTriangles):
+        affected.append(pixelNums)
+    for pixelNums, triangleNums, weights in rasterizeUVTriangles(entry.triangleUVs, sizeX, sizeY, changedTriangles): # where the triangles were before
+        affected.append(pixelNums)
+    affected = np.unique(np.concatenate(affected))
+    pixelMap = entry.pixelMap
+    partners = pixelMap[affected]
+    partners = partners[partners != -1] # the pixels that were mirrored to the changed ones
+    affected = np.union1d(affected, partners)
+    islandMask = None
+    if (entry.mapHoles is not None):
+        islandMask = pixelMap != -1
+        islandMask[entry.mapHoles.holePixels] = True
+    pixelMap[affected] = -1
+    if (entry.mapHoles is None):
+        return pixelMap, None
+    remapPixels = np.union1d(affected, entry.mapHoles.holePixels) # the old holes are tried again as the change may have given them a mirror
+    return createSnapshotMapping(object = object, sizeX = sizeX, sizeY = sizeY, axis = axis, uv = uv, pixelMap = pixelMap, remapPixels = remapPixels, islandMask = islandMask, inverse = entry.mapHoles.inverse, remapAll = False) # the pixels outside remapPixels keep their mirrors
+
+# Inputs: ------------------------
+# context is the blender context
+# axis is axis letter ex. 'x', 'y', or 'z'
+# Purpose: -----------------------
+# makes the mapping of the selected object, UV map and image on the given axis the one in use, taking it from memory, then from the disk cache, or leaving it None to be made lazily
+# a mapping in memory made before the mesh was changed is updated for the changed triangles first, so an outdated mapping is never used
+def activateMirrorMapForSelection(context, axis):
+    activateMirrorMap(context.scene.snapshotObjectPointer, mirrorMapKeysForSelection(context, axis), axis)
+
+# Inputs: ------------------------
+# myPointers is the MirrorAddonPointers with the cache settings
+# keys is the (memoryKey, diskKey, meshData) from mirrorMapKeys of the mapping
+# axis is axis letter ex. 'x', 'y', or 'z'
+# Purpose: -----------------------
+# the work of activateMirrorMapForSelection for any object, UV map and image
+def activateMirrorMap(myPointers, keys, axis):
+    memoryKey, diskKey, meshData = keys
+    pixelMap, mapHoles = None, None
+    entry = bpy.types.Scene.mirrorMapMemoryCache.get(memoryKey)
+    if (entry is not None):
+        pixelMap, mapHoles = entry.pixelMap, entry.mapHoles
+        if (not np.array_equal(entry.fingerprints, meshData.fingerprints)): # the mesh changed since the mapping was made
+            startTime = time.time()
+            pixelMap, mapHoles = updateMirrorMapForMeshChanges(entry, meshData, bpy.data.objects[memoryKey[0]], axis, memoryKey[1], memoryKey[2], memoryKey[3])
+            if (mapHoles is not None):
+                saveMirrorMapToCache(diskKey, pixelMap, mapHoles, myPointers.mirrorMapCacheSize * 1024 * 1024)
+            bpy.types.Scene.mirrorMapMemoryCache.put(memoryKey, mirrorMapEntry(pixelMap, mapHoles, meshData), myPointers.mirrorMapMemoryBudget * 1024 * 1024)
+            if (timeDebug): # TIME
+                print("updateMirrorMapForMeshChanges time: " + str(time.time() - startTime))
+    elif (diskKey is not None and myPointers.mirrorMapCacheSize > 0):
+        pixelMap, mapHoles = loadMirrorMapFromCache(diskKey)
+        if (pixelMap is not None):
+            bpy.types.Scene.mirrorMapMemoryCache.put(memoryKey, mirrorMapEntry(pixelMap, mapHoles, meshData), myPointers.mirrorMapMemoryBudget * 1024 * 1024)
+    bpy.types.Scene.snapshotMapping = pixelMap
+    bpy.types.Scene.snapshotMappingHoles = mapHoles
+    bpy.types.Scene.snapshotMappingAxis = axis
+    bpy.types.Scene.snapshotMappingKey = memoryKey
+    bpy.types.Scene.snapshotMappingMeshData = meshData
+
+# stores the mapping in use in the memory cache (Ex. after mirroring added to it or made it)
+def storeActiveMirrorMap(context):
+    myPointers = context.scene.snapshotObjectPointer
+    if (bpy.types.Scene.snapshotMapping is None or bpy.types.Scene.snapshotMappingMeshData is None):
+        return
+    entry = mirrorMapEntry(bpy.types.Scene.snapshotMapping, bpy.types.Scene.snapshotMappingHoles, bpy.types.Scene.snapshotMappingMeshData)
+    bpy.types.Scene.mirrorMapMemoryCache.put(bpy.types.Scene.snapshotMappingKey, entry, myPointers.mirrorMapMemoryBudget * 1024 * 1024)
+
+# Inputs: ------------------------
+# snapshot is the textureSnapshot being mirrored into
+# mapHoles is the mirrorMapHoles from the mapping used
+# writtenPixels is an array of the pixel numbers that were mirrored into
+# skipPixels is an array of pixel numbers that should not be filled (Ex. pixels changed by the user)
+# Purpose: -----------------------
+# fills in the holes of the mapping that border mirrored pixels by blending those neighbours, all in one gather
+# returns the pixel numbers that were filled
+def fillMirrorMapHoles(snapshot, mapHoles, writtenPixels, skipPixels = None):
     displace = 4
-    length = 0
-    pixels = None
-    sizeX = 0
-    sizeY = 0
-    if texture != None:
-        length = math.floor(len(texture.pixels) / displace)
-        #pixelMap = np.full([length, 2], -1)
-        sizeX = texture.size[0]
-        sizeY = texture.size[1]
-        pixels = texture.pixels
-    elif snapshot != None:
-        length = math.floor(len(snapshot.pixels) / displace)
-        #pixelMap = np.full([length, 2], -1)
-        sizeX = snapshot.sizeX
-        sizeY = snapshot.sizeY
-        pixels = snapshot.pixels
-
-
-    if (pixelMap is None):
-        pixelMap = np.full([length, 2], -1) # Make it so the pixelMap is the size of the full mapping, but set to an out of bounds index like -1, -1. Then add all of the mappings, but skip it if the corresponding pair of pixels are already mapped (known by if the numbers in them aren't -1, -1). Also bind pairs together, so once you find a mapping for pixelA in pixelB, then pixelB can be set to have pixelA as its mapping.
-
-    if (tempBmesh != None):
-        for i in range(length):
-            if (pixelMap[i].tolist() == [-1, -1] or axis != bpy.types.Scene.snapshotMappingAxis): # only updates the mapping if it hasn't already been done
-                tempUV = pixelToUV(i * displace, sizeX, sizeY)
-                tempUV = mathutils.Vector(tempUV) # converts the list to a vector
-                tempPoint = find_coord_on_3D_face_from_UV(tempUV, tempBmesh.faces, object, tempBmesh.loops.layers.uv[uv])
-                if (tempPoint != None): # prevents trying to mirror points that didn't land on the model (This means some pixels will not have a corresponding mirrored pixel value mapped)
-                    tempPointMirror = mirror3dCordinate(object, tempPoint, axis)
-                    tempUVMirror = find_UV_cord_from_3D_point_on_model(object, tempBmesh, tempPointMirror, tempBmesh.loops.layers.uv[uv], tempBmesh.faces, True, 0.0005)
-                    if (tempUVMirror != None): # prevents trying to mirror for when the mirror doesn't land (Ex. when the mesh isn't symmetric or isn't symmetric on the currently selected axis)
-                        mirrorPixel = uvToPixel(tempUVMirror, sizeX, sizeY)
-                        pixelMap[i] = mirrorPixel # sets pixel A's mirror
-                        pixelMap[pixelCordToPixelNum(mirrorPixel, sizeX)] = pixelNumToPixelCord(pixelNum = i * 4, sizeX = sizeX, sizeY = sizeY) # set pixel B's mirror to pixel A
-
-    return pixelMap
+    if (mapHoles is None or len(mapHoles.holePixels) == 0 or len(writtenPixels) == 0):
+        return np.zeros(0, dtype=np.int64)
+    written = bpy.types.Scene.snapshotBufferArena.take((snapshot.sizeX * snapshot.sizeY,), bool) # reused between mirrors, so it has to be cleared
+    written[:] = False
+    written[writtenPixels] = True
+    neighbors = mapHoles.neighborPixels
+    weights = np.where((neighbors >= 0) & written[neighbors], mapHoles.neighborWeights, 0) # only the neighbours that were mirrored into this time
+    bpy.types.Scene.snapshotBufferArena.give(written)
+    totalWeight = weights.sum(axis=1)
+    toFill = totalWeight > 0
+    if (skipPixels is not None and len(skipPixels) > 0):
+        toFill = toFill & ~np.isin(mapHoles.holePixels, skipPixels)
+    fillNeighbors = np.maximum(neighbors[toFill], 0)
+    neighborValues = snapshot.gather(fillNeighbors.reshape(-1)).reshape(fillNeighbors.shape + (displace,)) # (N, 8, 4), the unused neighbours have a weight of 0
+    filledPixels = mapHoles.holePixels[toFill]
+    snapshot.scatter(filledPixels, (neighborValues * weights[toFill][:, :, None]).sum(axis=1) / totalWeight[toFill][:, None])
+    return filledPixels
 
 # Input: -----------------------------------------
 # degrees is a float that is the measure of an angle in degrees
@@ -542,6 +2608,99 @@ def newBasis(degrees):
     vector[1] = normalVectorFromAngle(degrees + 90)
     return vector
 
+# Inputs: ------------
+# axisAngle is the angle of the 2D axis in degrees
+# xPosition and yPosition are the UV position the axis goes through
+# sizeX and sizeY are the size of the texture
+# Purpose: ---------
+# returns the matrix and offset that reflect a pixel cordinate over the 2D axis (mirroredPixel = pixel @ matrix + offset)
+# This is the same as converting into the axis' basis, inverting the y value and converting back, but only needs to be built once per mirror
+def reflectionAffine2D(axisAngle, xPosition, yPosition, sizeX, sizeY):
+    lineVector = normalVectorFromAngle(axisAngle)
+    matrix = 2 * np.outer(lineVector, lineVector) - np.identity(2) # reflection over the line going through the origin
+    origin = np.array([xPosition * (sizeX - 1), yPosition * (sizeY - 1)]) # moves the origin to be on the axis
+    offset = origin - origin.dot(matrix)
+    return matrix, offset
+
+# Inputs: ------------
+# pixelNums is an array of pixel numbers (not multiplied by 4) to mirror
+# sizeX and sizeY are the size of the texture
+# matrix and offset are from reflectionAffine2D
+# preventOutsidePixels is a boolean for whether mirrors landing outside the texture are dropped (True) or clipped to its edge (False)
+# Purpose: ---------
+# mirrors every pixel number at once, returning the source pixel numbers that are kept and the pixel numbers they mirror to
+def mirrorPixelNums2D(pixelNums, sizeX, sizeY, matrix, offset, preventOutsidePixels = False):
+    cords = np.empty((len(pixelNums), 2))
+    cords[:, 0] = pixelNums % sizeX
+    cords[:, 1] = pixelNums // sizeX
+    newCords = np.rint(cords.dot(matrix) + offset) # rounds half to even like round() did for the single pixels
+    if (preventOutsidePixels): # for preventing placing pixels that are outside the visible tile to preventing accidental tiling in 2D mirror
+        inside = ((newCords[:, 0] >= 0) & (newCords[:, 0] <= sizeX - 1) & (newCords[:, 1] >= 0) & (newCords[:, 1] <= sizeY - 1))
+        pixelNums = pixelNums[inside]
+        newCords = newCords[inside]
+    else:
+        newCords[:, 0] = np.clip(newCords[:, 0], 0, sizeX - 1)
+        newCords[:, 1] = np.clip(newCords[:, 1], 0, sizeY - 1)
+    newPixelNums = newCords[:, 0].astype(np.int64) + newCords[:, 1].astype(np.int64) * sizeX
+    return pixelNums, newPixelNums
+
+# Inputs: ------------
+# changedPixels is a sorted array of the changed pixel numbers (not multiplied by 4), Ex. the indices of a textureDiff
+# sizeX and sizeY are the size of the texture
+# matrix and offset are from reflectionAffine2D
+# Purpose: ---------
+# the opposite of mirrorPixelNums2D, going from the destination instead of the source so every destination pixel is filled and none are left as gaps
+# finds every pixel whose reflection lands nearest to a changed pixel (the reflection is its own inverse), returning their pixel numbers and the (N, 2) cordinates of their reflections to sample the source at
+# Note: a pixel within half a pixel of a changed pixel's reflection is always one of the 4 pixels around that reflection, so only those are tested
+def mirrorPixelNums2DGather(changedPixels, sizeX, sizeY, matrix, offset):
+    if (len(changedPixels) == 0):
+        return np.empty(0, dtype = np.int64), np.empty((0, 2))
+    cords = np.empty((len(changedPixels), 2))
+    cords[:, 0] = changedPixels % sizeX
+    cords[:, 1] = changedPixels // sizeX
+    corners = np.floor(cords.dot(matrix) + offset).astype(np.int64)
+    candidates = (corners[:, None, :] + np.array([[0, 0], [1, 0], [0, 1], [1, 1]])).reshape(-1, 2)
+    inside = (candidates[:, 0] >= 0) & (candidates[:, 0] < sizeX) & (candidates[:, 1] >= 0) & (candidates[:, 1] < sizeY)
+    targetPixels = np.unique(candidates[inside, 0] + candidates[inside, 1] * sizeX)
+    targetCords = np.empty((len(targetPixels), 2))
+    targetCords[:, 0] = targetPixels % sizeX
+    targetCords[:, 1] = targetPixels // sizeX
+    sourceCords = targetCords.dot(matrix) + offset
+    nearest = np.rint(sourceCords).astype(np.int64)
+    nearestNums = np.clip(nearest[:, 0], 0, sizeX - 1) + np.clip(nearest[:, 1], 0, sizeY - 1) * sizeX
+    position = np.minimum(np.searchsorted(changedPixels, nearestNums), len(changedPixels) - 1)
+    keep = (nearest[:, 0] >= 0) & (nearest[:, 0] < sizeX) & (nearest[:, 1] >= 0) & (nearest[:, 1] < sizeY) & (changedPixels[position] == nearestNums)
+    return targetPixels[keep], sourceCords[keep]
+
+# Inputs: ------------
+# snapshot is the textureSnapshot to sample
+# cords is an (N, 2) array of pixel cordinates, which can be between pixels
+# bilinear is a boolean for whether to blend the 4 nearest pixels (True) or take the nearest one (False)
+# islandBits is np.packbits of the boolean array of the pixels that can be blended (Ex. the ones on a UV island so the background isn't blended in at the island's edge), or None for all of them
+# Purpose: ---------
+# returns the (N, 4) float32 values of the snapshot at the cordinates, cordinates past the edge use the edge pixels
+def sampleSnapshot(snapshot, cords, bilinear = False, islandBits = None):
+    sizeX = snapshot.sizeX
+    sizeY = snapshot.sizeY
+    if (not bilinear):
+        nearest = np.rint(cords).astype(np.int64)
+        return snapshot.gather(np.clip(nearest[:, 0], 0, sizeX - 1) + np.clip(nearest[:, 1], 0, sizeY - 1) * sizeX)
+    low = np.floor(cords)
+    fractionX = (cords[:, 0] - low[:, 0]).astype(np.float32) # how far toward the next pixel on each axis
+    fractionY = (cords[:, 1] - low[:, 1]).astype(np.float32)
+    x0 = np.clip(low[:, 0].astype(np.int64), 0, sizeX - 1)
+    y0 = np.clip(low[:, 1].astype(np.int64), 0, sizeY - 1)
+    x1 = np.clip(x0 + 1, 0, sizeX - 1)
+    y1 = np.clip(y0 + 1, 0, sizeY - 1)
+    pixels = np.stack([x0 + y0 * sizeX, x1 + y0 * sizeX, x0 + y1 * sizeX, x1 + y1 * sizeX]) # (4, N)
+    weights = np.stack([(1 - fractionX) * (1 - fractionY), fractionX * (1 - fractionY), (1 - fractionX) * fractionY, fractionX * fractionY])
+    if (islandBits is not None):
+        usable = weights * ((islandBits[pixels >> 3] >> (7 - (pixels & 7))) & 1) # the pixels off the islands count for nothing
+        totalWeight = usable.sum(axis=0)
+        weights = np.where(totalWeight > 0, usable / np.maximum(totalWeight, 1e-12), weights) # a cordinate with none of its pixels on an island keeps the plain blend
+    values = snapshot.gather(pixels.reshape(-1)).reshape(4, len(cords), 4) # the 4 pixels of every cordinate in one gather
+    return (values * weights[:, :, None]).sum(axis=0)
+
 # helper divide function that prevents divide by zero by returning zero if it were to happen
 def safeDivide(num1, num2):
     if (num2 == 0):
@@ -668,7 +2827,7 @@ def drawSymmetryLineUsingInvert(axisAngle, xPosition, yPosition, image):
     addedVector[1] = addedVector[1] / image.size[1]
     while (endpointUV[0] <= 1 and endpointUV[0] >= 0 and endpointUV[1] <= 1 and endpointUV[1] >= 0):
         # invert current pixel in snapshot
-        tempVal = list(snapshot.pixels[pixelCordToPixelNum(endpointPixel, snapshot.sizeX) * displace : pixelCordToPixelNum(endpointPixel, snapshot.sizeX) * displace + displace])
+        tempVal = snapshot.gather(np.array([pixelCordToPixelNum(endpointPixel, snapshot.sizeX)]))[0].tolist()
         tempVal[0] = 1 - tempVal[0]
         tempVal[1] = 1 - tempVal[1]
         tempVal[2] = 1 - tempVal[2]
@@ -680,7 +2839,7 @@ def drawSymmetryLineUsingInvert(axisAngle, xPosition, yPosition, image):
         endpointPixel = uvToPixel(endpointUV.tolist(), image.size[0], image.size[1])
 
     # updates texture
-    image.pixels = snapshot.pixels
+    snapshot.writeToTexture(image)
     return True
 
 # Helper functions for mirrorChangesFromSnapshotUsingBakingWithMask ------------
@@ -724,8 +2883,13 @@ def mirrorChangesFromSnapshotUsingBakingWithMask(snapshot1, snapshot2, obj, imag
         return False
 
     displace = 4
-    diff = snapshot1.snapshotDifference(snapshot2)
-    snapshot3 = copy.deepcopy(snapshot1)
+    with mirrorStage("diff"):
+        diff = snapshot1.snapshotDifference(snapshot2)
+    if (diff is None): # sizes of the snapshots don't match
+        return False
+    mirrorCount("changed pixels", diff.changedCount())
+    snapshot3 = snapshot1.copy() # shares the tiles with snapshot1 until they are written
+    bakeStart = time.perf_counter()
 
     mirrorScale = [-1, 1, 1] # defaults to x
     if (axis == 'z'):
@@ -759,70 +2923,178 @@ def mirrorChangesFromSnapshotUsingBakingWithMask(snapshot1, snapshot2, obj, imag
     duplicateObject.select_set(True)
     inverseObject.select_set(True)
     bpy.context.view_layer.objects.active = duplicateObject #sets required active object (ex. bpy.context.view_layer.objects.active = obj)
-    bpy.ops.object.bake(type='DIFFUSE', pass_filter={'COLOR'}, use_selected_to_active=True, max_ray_distance=extrusion + 0.001, cage_extrusion=extrusion, use_clear=True, uv_layer=uvmap) # tries to bake with the correct settings (bpy.ops.object.bake(type='DIFFUSE'))
+    mirrorStageTime("bake setup", time.perf_counter() - bakeStart) # everything since the diff was setting up the bake
+    with mirrorStage("bake"):
+        bpy.ops.object.bake(type='DIFFUSE', pass_filter={'COLOR'}, use_selected_to_active=True, max_ray_distance=extrusion + 0.001, cage_extrusion=extrusion, use_clear=True, uv_layer=uvmap) # tries to bake with the correct settings (bpy.ops.object.bake(type='DIFFUSE'))
+    bakeStart = time.perf_counter()
     # delete the objects and materials created
     bpy.data.objects.remove(duplicateObject) # only really have to delete the objects, as the materials should have no users once the objects duplicateObject and inverseObject are deleted
     bpy.data.objects.remove(inverseObject)
     deleteMaterialFromScene(newMaterial)
     deleteMaterialFromScene(newInverseObjectMaterial)
-    snapshot4 = textureSnapshot(bakingImage) # gets the mirror of the texture
+    snapshot4 = textureSnapshot(bakingImage, arena = bpy.types.Scene.snapshotBufferArena) # gets the mirror of the texture
     bpy.data.images.remove(bakingImage, do_unlink=True, do_id_user=True, do_ui_user=True) # deletes the texture
+    mirrorStageTime("bake teardown", time.perf_counter() - bakeStart)
     # use the diff as a mask to determine what should be the mirror of the texture ---------------------
-    length = math.floor(len(diff) / displace)
-    for i in range(length):
-        if diff[i * displace: i * displace + displace] != (0, 0, 0, 0): # if there is a change in a pixel
-            updatePixel(snapshot3, pixelNumToPixelCord(i * displace, snapshot3.sizeX, snapshot3.sizeY), snapshot4.pixels[i * displace : i * displace + displace])
+    with mirrorStage("mirror scatter"):
+        snapshot3.scatter(diff.indices, snapshot4.gather(diff.indices)) # copies the baked mirror into every changed pixel at once
+    snapshot4.release()
     # return the updated texture that contains the mirror
     return snapshot3
 
 
+mirrorMethods2D = ("Scatter", "Gather_Nearest", "Gather_Bilinear") # the identifiers of mirrorMethod2D
+
+# Inputs: ------------------------
+# changedPixels is the sorted pixel numbers of the changes
+# sourceSnapshot is the textureSnapshot the mirrored values are read from
+# destination is the textureSnapshot the mirrored values are written into
+# matrix and offset are from reflectionAffine2D
+# preventOutsidePixels is the same as in mirrorPixelNums2D, only used by the scatter method
+# method is the mirrorMethod2D, 'Scatter' to move each changed pixel to its reflection, 'Gather_Nearest' or 'Gather_Bilinear' to fill every pixel whose reflection is a changed pixel
+# Purpose: -----------------------
+# mirrors the changed pixels into the destination, returning the pixel numbers written
+# the scatter leaves gaps when rotated as some pixels are landed on twice and some never, the gathers don't so no gap fill is needed after them
+# doesn't record stages so tiles can be mirrored with it on separate threads
+def mirrorPixels2D(changedPixels, sourceSnapshot, destination, matrix, offset, preventOutsidePixels = False, method = 'Scatter'):
+    sizeX = sourceSnapshot.sizeX
+    sizeY = sourceSnapshot.sizeY
+    if (method == 'Scatter'):
+        sourcePixels, targetPixels = mirrorPixelNums2D(changedPixels, sizeX, sizeY, matrix, offset, preventOutsidePixels)
+        destination.scatter(targetPixels, sourceSnapshot.gather(sourcePixels)) # updates all of the mirrored pixels in one step
+        return targetPixels
+    targetPixels, sourceCords = mirrorPixelNums2DGather(changedPixels, sizeX, sizeY, matrix, offset)
+    destination.scatter(targetPixels, sampleSnapshot(sourceSnapshot, sourceCords, method == 'Gather_Bilinear'))
+    return targetPixels
+
 # mirrors the changes from the snapshots, but does the mirror over the axis
-def mirrorChangesFromSnapshots2D(snapshot1, snapshot2, image, axisAngle, xPosition, yPosition, mask = False, preventOutsidePixels = False):
+# method is the mirrorMethod2D used (see mirrorPixels2D)
+def mirrorChangesFromSnapshots2D(snapshot1, snapshot2, image, axisAngle, xPosition, yPosition, mask = False, preventOutsidePixels = False, method = 'Scatter'):
     if (image is None):
         print("Error: No image is selected in image viewer")
         return False
 
     displace = 4
-    diff = snapshot1.snapshotDifference(snapshot2)
+    with mirrorStage("diff"):
+        diff = snapshot1.snapshotDifference(snapshot2)
+    if (diff is None): # sizes of the snapshots don't match
+        return False
+    mirrorCount("changed pixels", diff.changedCount())
     snapshot3 = None
     if (mask == False):
-        snapshot3 = copy.deepcopy(snapshot2)
+        snapshot3 = snapshot2.copy() # shares the tiles, only the ones mirrored into get copied
     else:
-        snapshot3 = copy.deepcopy(snapshot1)
-    # create the new basis
-    newBase = newBasis(axisAngle)
-    # use new basis to create a rotation matrix
-    standardBase = np.array([[1, 0], [0, 1]])
-    # loop through pixels that changes, converting them into the new basis, then flipping them over the axis by inversing their Y value. Remember to move the axis origin to the xPosition, yPosition
-    length = math.floor(len(diff) / displace)
-    for i in range(length):
-        if diff[i * displace: i * displace + displace] != (0, 0, 0, 0): # if there is a change in a pixel
-            #tempUV = pixelToUV(i * displace, image.size[0], image.size[1]) # uv of current pixel
-            tempPixel = pixelNumToPixelCord(pixelNum = i * 4, sizeX = snapshot1.sizeX, sizeY = snapshot1.sizeY)
-            #tempUV = [tempUV[0] - xPosition, tempUV[1] - yPosition] # accounts for origin being at cursor
-            tempPixel[0] = tempPixel[0] - (xPosition * (snapshot1.sizeX - 1))
-            tempPixel[1] = tempPixel[1] - (yPosition * (snapshot1.sizeY - 1))
-            newPixel = convertBasis2D(np.array(tempPixel), newBase) # converts to new base using the invert of the newBase
-            newPixel[1] = (newPixel[1] * -1) # inverts y cordinate to mirror
-            newPixel = newPixel.dot(newBase) # converts back to standard base by multiplying the value by its base (since its base is a representation from standard base)
-            # changes origin back to the bottom left of the UV
-            newPixel[0] = newPixel[0] + (xPosition * (snapshot1.sizeX - 1))
-            newPixel[1] = newPixel[1] + (yPosition * (snapshot1.sizeY - 1))
-            newPixel = [round(newPixel[0]), round(newPixel[1])]
-            outX = (newPixel[0] < 0 or newPixel[0] > (snapshot1.sizeX - 1))
-            outY = (newPixel[1] < 0 or newPixel[1] > (snapshot1.sizeY - 1))
-            if (not(outX or outY) or not(preventOutsidePixels)): # for preventing placing pixels that are outside the visible tile to preventing accidental tiling in 2D mirror
-                if (mask == False):
-                    updatePixel(snapshot3, newPixel, snapshot2.pixels[i * displace : i * displace + displace]) # updates pixel in snapshot
-                else:
-                    updatePixel(snapshot3, newPixel, snapshot1.pixels[i * displace : i * displace + displace]) # updates pixel in snapshot
-
-    bpy.types.Scene.snapshotDiff = snapshot2.snapshotDifference(snapshot3) # stores difference for pixelGapFilling
+        snapshot3 = snapshot1.copy()
+    changedPixels = diff.indices # the changed pixels were already found together by the diff
+    # the reflection is the same for every pixel, so it is built once and applied to all of the changed pixels together
+    matrix, offset = reflectionAffine2D(axisAngle, xPosition, yPosition, snapshot1.sizeX, snapshot1.sizeY)
+    if (mask == False):
+        sourceSnapshot = snapshot2
+    else:
+        sourceSnapshot = snapshot1
+    with mirrorStage("mirror compute"):
+        targetPixels = mirrorPixels2D(changedPixels, sourceSnapshot, snapshot3, matrix, offset, preventOutsidePixels, method)
+    mirrorCount("written pixels", len(targetPixels))
+
+    # the stroke and the pixels mirrored into are the only places snapshot3 can differ from snapshot2
+    touchedPixels = [changedPixels if mask else None, targetPixels]
+    with mirrorStage("diff"):
+        bpy.types.Scene.snapshotDiff = snapshot2.snapshotDifferenceAt(snapshot3, targetPixels if not mask else np.concatenate([changedPixels, targetPixels])) # stores difference for pixelGapFilling
     #if (pixelGapFillVerticalLines): # does pixel gap fill if toggled
         #pixelGapFillThreshold(snapshot2.snapshotDifference(snapshot3), snapshot3, threshold, selfBlend)
-    image.pixels = snapshot3.pixels # updates the textures pixels (very time expensive, so only done once at end)
+    with mirrorStage("write back"):
+        snapshot3.writeRegionsToTexture(image, pixelRegions(touchedPixels, snapshot1.sizeX, snapshot1.sizeY)) # only the regions that could have changed are read from the snapshot
+    snapshot3.release()
+    return True
+
+# Inputs: ------------------------
+# changedPixels is an array of the pixel numbers changed in the tile mirrored from
+# sourceSnapshot is the textureSnapshot of the tile the colors are read from, which is only read
+# destination is a copy of the textureSnapshot of the tile mirrored into, which nothing else uses until this returns
+# axisAngle, xPosition and yPosition are the line in the tiles, the same as mirrorChangesFromSnapshots2D
+# method is the mirrorMethod2D used (see mirrorPixels2D)
+# Purpose: -----------------------
+# mirrors the changes of one tile into the destination without touching blender, so tiles can be mirrored on separate threads
+# the diffs and copies are made before this is called, as they change the checksums and tile users that the snapshots of a pair share
+# returns the pixel numbers written in the destination
+def mirrorTile2D(changedPixels, sourceSnapshot, destination, axisAngle, xPosition, yPosition, method = 'Scatter'):
+    matrix, offset = reflectionAffine2D(axisAngle, xPosition, yPosition, sourceSnapshot.sizeX, sourceSnapshot.sizeY)
+    # mirrors landing outside the tile are dropped instead of bleeding into the tile next to it
+    return mirrorPixels2D(changedPixels, sourceSnapshot, destination, matrix, offset, True, method)
+
+# Inputs: ------------------------
+# original is the udimSnapshot of the tiled image before the changes
+# image is the tiled image, whose changed tiles have been saved
+# axisAngle, xPosition and yPosition are the line in each tile, the same as mirrorChangesFromSnapshots2D
+# mask is a boolean for whether the changes are used as a mask or not
+# tilePair is a (tile number, tile number) to mirror the changes of each of the two tiles into the other, or None to mirror every tile within itself
+# method is the mirrorMethod2D used (see mirrorPixels2D)
+# Purpose: -----------------------
+# mirrors the changes of a tiled image, only reading and saving the tiles that changed (and the other tile of the pair), with the tiles mirrored at the same time on a thread pool
+def mirrorChangesFromSnapshotsUDIM2D(original, image, axisAngle, xPosition, yPosition, mask = False, tilePair = None, method = 'Scatter'):
+    error = udimTileError(image)
+    if (error is not None):
+        print(error)
+        return False
+    changed = original.changedTiles(image)
+    if (tilePair is None):
+        pairs = [(number, number) for number in changed]
+    elif (tilePair[0] in changed or tilePair[1] in changed):
+        pairs = [(tilePair[0], tilePair[1]), (tilePair[1], tilePair[0])]
+        if (not all(number in original.udimTiles for number in tilePair)):
+            print("Error: The image has no tile " + str(tilePair[0] if tilePair[0] not in original.udimTiles else tilePair[1]))
+            return False
+        if ((original.udimTiles[tilePair[0]].sizeX, original.udimTiles[tilePair[0]].sizeY) != (original.udimTiles[tilePair[1]].sizeX, original.udimTiles[tilePair[1]].sizeY)):
+            print("Error: The tiles of the pair are of different sizes")
+            return False
+    else:
+        pairs = []
+    if (len(pairs) == 0):
+        print("Error: None of the tiles were saved since the snapshot")
+        return False
+    numbers = sorted(set(number for pair in pairs for number in pair))
+    with mirrorStage("tile read"):
+        tileImages = {number: loadUDIMTile(image, number) for number in numbers}
+        current = {number: textureSnapshot(tileImages[number], arena = bpy.types.Scene.snapshotBufferArena) for number in numbers}
+    mirrorCount("tiles read", len(numbers))
+    # the diffs and copies are made here, as the two directions of a pair share their snapshots and these write to them
+    with mirrorStage("diff"):
+        diffed = set(pair[0] for pair in pairs) | (set(pair[1] for pair in pairs) if mask else set())
+        changedPixels = {number: original.udimTiles[number].snapshotDifference(current[number]).indices for number in diffed}
+    jobs = []
+    for source, destination in pairs:
+        if (mask == False):
+            jobs.append((changedPixels[source], current[source], current[destination].copy(), []))
+        else: # the mask painted on the destination is removed too
+            jobs.append((changedPixels[source], original.udimTiles[source], original.udimTiles[destination].copy(), [changedPixels[destination]]))
+    def mirrorJob(job):
+        return mirrorTile2D(job[0], job[1], job[2], axisAngle, xPosition, yPosition, method)
+    with mirrorStage("mirror compute"):
+        with concurrent.futures.ThreadPoolExecutor(max_workers = min(len(pairs), os.cpu_count() or 1)) as pool: # numpy lets go of the GIL, so the tiles are mirrored at the same time
+            results = list(pool.map(mirrorJob, jobs))
+    written = set()
+    with mirrorStage("write back"):
+        for (source, destination), (changes, sourceSnapshot, snapshot3, touchedPixels), targetPixels in zip(pairs, jobs, results):
+            touchedPixels = touchedPixels + [targetPixels]
+            if (sum(len(pixels) for pixels in touchedPixels) > 0):
+                snapshot3.writeRegionsToTexture(tileImages[destination], pixelRegions(touchedPixels, snapshot3.sizeX, snapshot3.sizeY))
+                written.add(destination)
+            snapshot3.release()
+    mirrorCount("tiles written", len(written))
+    with mirrorStage("tile save"):
+        for number in numbers:
+            saveUDIMTile(tileImages[number], save = number in written)
+            current[number].release()
+        image.reload() # shows the saved tiles
+    bpy.types.Scene.snapshotDiff = None # the gap fill works on single images
     return True
 
+# returns the tile pair chosen in the panel, or None to mirror every tile within itself
+def udimTilePairFromPointers(myPointers):
+    if (not myPointers.udimTilePairEnabled or myPointers.udimTileA == myPointers.udimTileB):
+        return None
+    return (myPointers.udimTileA, myPointers.udimTileB)
+
 # Old Float UV method that suffered from float precision issues causes slight pixel offsets and issues of pixel offsets related to texture boundary
 # Possibly fixable by scaling the UV cord to be the size of the texture to help reduce floating point precision issues
 # mirrors the changes from the snapshots, but does the mirror over the axis
@@ -833,37 +3105,42 @@ def mirrorChangesFromSnapshots2D_Old(snapshot1, snapshot2, image, axisAngle, xPo
 
     displace = 4
     diff = snapshot1.snapshotDifference(snapshot2)
+    if (diff is None): # sizes of the snapshots don't match
+        return False
     snapshot3 = None
     if (mask == False):
-        snapshot3 = copy.deepcopy(snapshot2)
+        snapshot3 = snapshot2.copy()
     else:
-        snapshot3 = copy.deepcopy(snapshot1)
+        snapshot3 = snapshot1.copy()
     # create the new basis
     newBase = newBasis(axisAngle)
     # use new basis to create a rotation matrix
     standardBase = np.array([[1, 0], [0, 1]])
     # loop through pixels that changes, converting them into the new basis, then flipping them over the axis by inversing their Y value. Remember to move the axis origin to the xPosition, yPosition
-    length = math.floor(len(diff) / displace)
-    for i in range(length):
-        if diff[i * displace: i * displace + displace] != (0, 0, 0, 0): # if there is a change in a pixel
-            tempUV = pixelToUV(i * displace, image.size[0], image.size[1]) # uv of current pixel
-            tempUV = [tempUV[0] - xPosition, tempUV[1] - yPosition] # accounts for origin being at cursor
-            newUV = convertBasis2D(np.array(tempUV), newBase) # converts to new base using the invert of the newBase
-            newUV[1] = (newUV[1] * -1) # inverts y cordinate to mirror
-            newUV = newUV.dot(newBase) # converts back to standard base by multiplying the value by its base (since its base is a representation from standard base)
-            # changes origin back to the bottom left of the UV
-            newUV[0] = newUV[0] + xPosition
-            newUV[1] = newUV[1] + yPosition
-            if (newUV[0] >= 0 and newUV[0] <= 1 and newUV[1] >= 0 and newUV[1] <= 1): # ensures within UV bounds
-                if (mask == False):
-                    updatePixel(snapshot3, uvToPixel(newUV.tolist(), image.size[0], image.size[1]), snapshot2.pixels[i * displace : i * displace + displace]) # updates pixel in snapshot
-                else:
-                    updatePixel(snapshot3, uvToPixel(newUV.tolist(), image.size[0], image.size[1]), snapshot1.pixels[i * displace : i * displace + displace]) # updates pixel in snapshot
+    writtenPixels = [] # the pixels mirrored into, the only ones besides the mask that snapshot3 can differ from snapshot2 in
+    for i in diff.indices.tolist(): # only goes through the pixels that changed
+        tempUV = pixelToUV(i * displace, image.size[0], image.size[1]) # uv of current pixel
+        tempUV = [tempUV[0] - xPosition, tempUV[1] - yPosition] # accounts for origin being at cursor
+        newUV = convertBasis2D(np.array(tempUV), newBase) # converts to new base using the invert of the newBase
+        newUV[1] = (newUV[1] * -1) # inverts y cordinate to mirror
+        newUV = newUV.dot(newBase) # converts back to standard base by multiplying the value by its base (since its base is a representation from standard base)
+        # changes origin back to the bottom left of the UV
+        newUV[0] = newUV[0] + xPosition
+        newUV[1] = newUV[1] + yPosition
+        if (newUV[0] >= 0 and newUV[0] <= 1 and newUV[1] >= 0 and newUV[1] <= 1): # ensures within UV bounds
+            newPixel = uvToPixel(newUV.tolist(), image.size[0], image.size[1])
+            writtenPixels.append(pixelCordToPixelNum(newPixel, image.size[0]))
+            if (mask == False):
+                updatePixel(snapshot3, newPixel, snapshot2.gather(np.array([i]))[0]) # updates pixel in snapshot
+            else:
+                updatePixel(snapshot3, newPixel, snapshot1.gather(np.array([i]))[0]) # updates pixel in snapshot
 
-    bpy.types.Scene.snapshotDiff = snapshot2.snapshotDifference(snapshot3) # stores difference for pixelGapFilling
+    touchedPixels = [diff.indices if mask else None, np.array(writtenPixels, dtype=np.int64)]
+    bpy.types.Scene.snapshotDiff = snapshot2.snapshotDifferenceAt(snapshot3, np.concatenate([pixels for pixels in touchedPixels if pixels is not None])) # stores difference for pixelGapFilling
     #if (pixelGapFillVerticalLines): # does pixel gap fill if toggled
         #pixelGapFillThreshold(snapshot2.snapshotDifference(snapshot3), snapshot3, threshold, selfBlend)
-    image.pixels = snapshot3.pixels # updates the textures pixels (very time expensive, so only done once at end)
+    snapshot3.writeRegionsToTexture(image, pixelRegions(touchedPixels, snapshot1.sizeX, snapshot1.sizeY)) # only the regions that could have changed are read from the snapshot
+    snapshot3.release()
     return True
 
 # MirrorChanges2D ----------------------------------------------------------------------
@@ -884,11 +3161,18 @@ class MirrorChanges2D(bpy.types.Operator):
 
         # grabs current selected image in image editor
         startTime = time.time()
-        for area in context.screen.areas:
-            if area.type == 'IMAGE_EDITOR':
-                image = area.spaces.active.image
-                snapshotChanges = textureSnapshot(image)# snapshots it, storing it in a value
-                mirrorChangesFromSnapshots2D(bpy.types.Scene.snapshotOfOriginal, snapshotChanges, image, axisAngle, xValue, yValue, mask, preventOutsidePixels) # should make axis an input
+        with recordMirrorRun("Mirror Changes 2D" + (" As Mask" if mask else ""), context):
+            for area in context.screen.areas:
+                if area.type == 'IMAGE_EDITOR':
+                    image = area.spaces.active.image
+                    snapshotOriginal = originalSnapshot(image)
+                    if (isinstance(snapshotOriginal, udimSnapshot)): # a tiled image, mirrored within each tile or across the chosen pair
+                        mirrorChangesFromSnapshotsUDIM2D(snapshotOriginal, image, axisAngle, xValue, yValue, mask, udimTilePairFromPointers(myPointers), myPointers.mirrorMethod2D)
+                    elif (snapshotOriginal is not None):
+                        with mirrorStage("snapshot capture"):
+                            snapshotChanges = textureSnapshot(image, arena = bpy.types.Scene.snapshotBufferArena)# snapshots it, storing it in a value
+                        mirrorChangesFromSnapshots2D(snapshotOriginal, snapshotChanges, image, axisAngle, xValue, yValue, mask, preventOutsidePixels, myPointers.mirrorMethod2D) # should make axis an input
+                        snapshotChanges.release() # lets the next mirror reuse its buffer
         if (timeDebug): # TIME
             print("MirrorChanges2D time: " + str(time.time() - startTime))
         return {'FINISHED'} # Tells blender the operation is done
@@ -918,11 +3202,18 @@ class MirrorChanges2DAsMask(bpy.types.Operator):
 
         # grabs current selected image in image editor
         startTime = time.time()
-        for area in context.screen.areas:
-            if area.type == 'IMAGE_EDITOR':
-                image = area.spaces.active.image
-                snapshotChanges = textureSnapshot(image)# snapshots it, storing it in a value
-                mirrorChangesFromSnapshots2D(bpy.types.Scene.snapshotOfOriginal, snapshotChanges, image, axisAngle, xValue, yValue, mask, preventOutsidePixels) # should make axis an input
+        with recordMirrorRun("Mirror Changes 2D" + (" As Mask" if mask else ""), context):
+            for area in context.screen.areas:
+                if area.type == 'IMAGE_EDITOR':
+                    image = area.spaces.active.image
+                    snapshotOriginal = originalSnapshot(image)
+                    if (isinstance(snapshotOriginal, udimSnapshot)): # a tiled image, mirrored within each tile or across the chosen pair
+                        mirrorChangesFromSnapshotsUDIM2D(snapshotOriginal, image, axisAngle, xValue, yValue, mask, udimTilePairFromPointers(myPointers), myPointers.mirrorMethod2D)
+                    elif (snapshotOriginal is not None):
+                        with mirrorStage("snapshot capture"):
+                            snapshotChanges = textureSnapshot(image, arena = bpy.types.Scene.snapshotBufferArena)# snapshots it, storing it in a value
+                        mirrorChangesFromSnapshots2D(snapshotOriginal, snapshotChanges, image, axisAngle, xValue, yValue, mask, preventOutsidePixels, myPointers.mirrorMethod2D) # should make axis an input
+                        snapshotChanges.release() # lets the next mirror reuse its buffer
         if (timeDebug): # TIME
             print("MirrorChanges2DAsMask time: " + str(time.time() - startTime))
         return {'FINISHED'} # Tells blender the operation is done
@@ -967,7 +3258,6 @@ class SnapshotOriginal(bpy.types.Operator):
     bl_idname = "image.snapshot_original" # unique identifier for menu items (cannot contain capitals)
     bl_label = "Snapshot" # display name
     bl_options = {'REGISTER', 'UNDO'} # Enables undo for the operator
-    snapshot = textureSnapshot()
 
     def execute(self, context): # function called when operation is run
         myPointers = context.scene.snapshotObjectPointer
@@ -977,8 +3267,17 @@ class SnapshotOriginal(bpy.types.Operator):
             if area.type == 'IMAGE_EDITOR':
                 image = area.spaces.active.image
                 if (image is not None):
-                    snapshot = textureSnapshot(image)# snapshots it, storing it in a value
-                    bpy.types.Scene.snapshotOfOriginal = snapshot
+                    if (isTiledImage(image) and udimTileError(image) is not None):
+                        print(udimTileError(image))
+                        return {'CANCELLED'}
+                    with recordMirrorRun("Snapshot", context):
+                        with mirrorStage("snapshot capture"):
+                            if (isTiledImage(image)):
+                                snapshot = udimSnapshot(image) # every tile, read from their files
+                            else:
+                                snapshot = textureSnapshot(image)# snapshots it, storing it in a value
+                        mirrorCount("pixels", snapshot.sizeX * snapshot.sizeY)
+                        bpy.types.Scene.textureSnapshotStore.put(snapshotImageKey(image), snapshot, myPointers.snapshotMemoryBudget * 1024 * 1024, myPointers.snapshotHistoryLength) # becomes the image's active snapshot
                     bpy.types.Scene.snapshotObject = myPointers.selectedObject # stores what object was used to make the snapshot
                 else:
                     print("Error: No image selected in image viewer")
@@ -1000,15 +3299,16 @@ class SnapshotRevert(bpy.types.Operator):
     def execute(self, context): # function called when operation is run
         # grabs current selected image in image editor
         startTime = time.time()
+        snapshot = None
         for area in bpy.context.screen.areas:
             if area.type == 'IMAGE_EDITOR':
                 image = area.spaces.active.image
-                snapshot = bpy.types.Scene.snapshotOfOriginal
+                if (image is not None):
+                    snapshot = bpy.types.Scene.textureSnapshotStore.get(snapshotImageKey(image)) # the image's active snapshot
         if (snapshot is not None):
-            if (image.size[0] == snapshot.sizeX and image.size[1] == snapshot.sizeY): # ensures the texture and snapshot are the same size
-                image.pixels = snapshot.pixels
-            else:
-                print("Error: Current texture and snapshot are of different sizes")
+            with recordMirrorRun("Revert to Snapshot", context):
+                with mirrorStage("write back"):
+                    snapshot.writeToTexture(image) # checks the texture and snapshot are the same size before writing
         else:
             print("Error: There is no snapshot to revert to")
         if (timeDebug): # TIME
@@ -1018,7 +3318,103 @@ class SnapshotRevert(bpy.types.Operator):
 def menu_func_snapshot_revert(self, context):
     self.layout.operator(SnapshotRevert.bl_idname)
 
+# choose which snapshot of the image is used
+class SelectSnapshot(bpy.types.Operator):
+    """Use this snapshot of the image for mirroring and reverting""" # tooltip for menu items and buttons
+    bl_idname = "image.select_snapshot" # unique identifier for menu items (cannot contain capitals)
+    bl_label = "Select Snapshot" # display name
+    snapshotName : bpy.props.StringProperty() # name of the snapshot in the textureSnapshotStore
+
+    def execute(self, context): # function called when operation is run
+        for area in bpy.context.screen.areas:
+            if area.type == 'IMAGE_EDITOR':
+                image = area.spaces.active.image
+                if (image is not None):
+                    bpy.types.Scene.textureSnapshotStore.setActive(snapshotImageKey(image), self.snapshotName)
+        return {'FINISHED'} # Tells blender the operation is done
+
 # Mirror Changes --------------------------------------------------------------------
+# Modal tasks ---------------------------------------------
+# Inputs: ------------------------
+# operator is the operator running the task, which needs a finishTask(context, cancelled) function and the run from startMirrorRun as operator.run
+# context is the blender context
+# task is a mirrorChangesTask or mirrorMapBuilder (anything with step(timeBudget), progress and cancel()), or None if there is nothing to do
+# label is the text shown with the progress
+# Purpose: -----------------------
+# starts running the task a bit at a time on a timer, so blender stays responsive and shows the progress (Esc cancels)
+# every step is recorded into the operator's own run, which is ended with the task
+def startModalTask(operator, context, task, label):
+    if (task is None):
+        endMirrorRun(operator.run, context, True)
+        return {'CANCELLED'}
+    operator.task = task
+    operator.taskLabel = label
+    operator.taskStartTime = time.time()
+    windowManager = context.window_manager
+    operator.timer = windowManager.event_timer_add(0.05, window = context.window)
+    windowManager.progress_begin(0, 100)
+    windowManager.modal_handler_add(operator)
+    bpy.types.Scene.mirrorTaskStatus = label + ": 0% (Esc to cancel)"
+    return {'RUNNING_MODAL'}
+
+# does the next bit of the operator's task on each timer tick, returning what the operator's modal function should return
+def modalTaskStep(operator, context, event):
+    if (event.type == 'ESC'):
+        operator.task.cancel()
+        endModalTask(operator, context, True)
+        return {'CANCELLED'}
+    if (event.type != 'TIMER'):
+        return {'PASS_THROUGH'} # lets blender handle everything else so it stays usable
+    try:
+        with recordingMirrorRun(operator.run, context):
+            done = operator.task.step(0.1) # only works for about a tenth of a second per tick
+    except Exception as error: # Ex. a worker failing or running out of memory, the timer, progress and pool are still cleaned up
+        operator.task.cancel()
+        endModalTask(operator, context, True)
+        operator.report({'ERROR'}, operator.taskLabel + " failed: " + str(error))
+        return {'CANCELLED'}
+    if (done):
+        endModalTask(operator, context, False)
+        return {'FINISHED'}
+    progress = operator.task.progress
+    status = "{}: {}%".format(operator.taskLabel, int(progress * 100))
+    if (progress > 0):
+        elapsed = time.time() - operator.taskStartTime
+        status += ", about {} left".format(formatDuration(elapsed / progress * (1 - progress)))
+    context.window_manager.progress_update(int(progress * 100))
+    bpy.types.Scene.mirrorTaskStatus = status + " (Esc to cancel)"
+    redrawImageEditors(context)
+    return {'PASS_THROUGH'}
+
+# stops the timer and progress of the operator's task and lets the operator finish up
+def endModalTask(operator, context, cancelled):
+    windowManager = context.window_manager
+    windowManager.event_timer_remove(operator.timer)
+    windowManager.progress_end()
+    with recordingMirrorRun(operator.run, context):
+        operator.finishTask(context, cancelled)
+    endMirrorRun(operator.run, context, cancelled)
+    bpy.types.Scene.mirrorTaskStatus = None
+    redrawImageEditors(context)
+    if (timeDebug): # TIME
+        print(operator.taskLabel + (" cancelled" if cancelled else "") + " time: " + str(time.time() - operator.taskStartTime))
+
+# returns a number of seconds as a short string (Ex. 1h 5m, 3m 20s, or 12s)
+def formatDuration(seconds):
+    seconds = int(seconds)
+    if (seconds >= 3600):
+        return "{}h {}m".format(seconds // 3600, (seconds % 3600) // 60)
+    if (seconds >= 60):
+        return "{}m {}s".format(seconds // 60, seconds % 60)
+    return "{}s".format(seconds)
+
+# redraws the image editors so the panel shows the latest progress
+def redrawImageEditors(context):
+    for area in context.screen.areas:
+        if area.type == 'IMAGE_EDITOR':
+            area.tag_redraw()
+
+# returns the mirrorChangesTask for mirroring the changes made to the image in the image editor, or None if it can't be mirrored
 def MirrorChangesHelperFunction(self, context, masking):
     image = 0
     myPointers = context.scene.snapshotObjectPointer
@@ -1029,29 +3425,24 @@ def MirrorChangesHelperFunction(self, context, masking):
             image = area.spaces.active.image
             if (bpy.types.Scene.snapshotObject == myPointers.selectedObject): # ensures the same object is for snapshots is still being used
                 if (myPointers.selectedObject.type == 'MESH'): # makes sure the object type is right
-                    snapshotChanges = textureSnapshot(image)# snapshots it, storing it in a value
-                    # creates a bmesh
-                    tempBmesh = bmesh.new()
-                    if (faceSelectionMethod == 'Edit_Mode_Selection'): # a setup required for the selectFacesFromEditModeSelection performed later
+                    snapshotOriginal = originalSnapshot(image)
+                    if (snapshotOriginal is None):
+                        return None
+                    if (isinstance(snapshotOriginal, udimSnapshot)): # a tiled image, where pixels can mirror into other tiles
+                        return udimMirrorTask(snapshotOriginal, image, myPointers.selectedObject, self.axis, uv = myPointers.selectedUV, mask = masking, selectedOnly = faceSelectionMethod == 'Edit_Mode_Selection')
+                    with mirrorStage("snapshot capture"):
+                        snapshotChanges = textureSnapshot(image, arena = bpy.types.Scene.snapshotBufferArena)# snapshots it, storing it in a value
+                    if (faceSelectionMethod == 'Edit_Mode_Selection'): # a setup required for reading the vertex selection performed later
                         if (myPointers.selectedObject.mode == 'EDIT'):
                             bpy.ops.object.mode_set(mode='OBJECT') # sets to object mode to flush the selection in edit mode
                             bpy.ops.object.mode_set(mode='EDIT') # sets to edit mode to revert to the state before changed
-                    tempBmesh.from_mesh(myPointers.selectedObject.data)
-                    tempBmesh.faces.ensure_lookup_table()
-                    # gets faces
-                    faces = []
-                    bmesh.ops.triangulate(tempBmesh, faces=tempBmesh.faces, quad_method='BEAUTY', ngon_method='BEAUTY') # needs to be triangulated for the barymetric transformation
-                    # face selection methods (defaults to use all faces)
-                    if (faceSelectionMethod == 'Edit_Mode_Selection'):
-                            faces = selectFacesFromEditModeSelectionUsingVerticeSelection(tempBmesh) # have to check using vertices as triangulation breaks the face selection
-                    else:
-                        faces = tempBmesh.faces
-                    mirrorChangesFromSnapshots(bpy.types.Scene.snapshotOfOriginal, snapshotChanges, myPointers.selectedObject, tempBmesh, image, self.axis, uv = myPointers.selectedUV, faces = faces, mask = masking, pixelMap = bpy.types.Scene.snapshotMapping, pixelMapAxis = bpy.types.Scene.snapshotMappingAxis)
-                    tempBmesh.free()
+                    # the faces are found through the object's UV grid index, so no triangulated bmesh is needed (face selection methods default to use all faces)
+                    return mirrorChangesTask(snapshotOriginal, snapshotChanges, myPointers.selectedObject, image, self.axis, uv = myPointers.selectedUV, mask = masking, pixelMap = bpy.types.Scene.snapshotMapping, pixelMapAxis = bpy.types.Scene.snapshotMappingAxis, mapHoles = bpy.types.Scene.snapshotMappingHoles, selectedOnly = faceSelectionMethod == 'Edit_Mode_Selection')
                 else:
                     print("Error: Object selected is not a MESH object")
             else:
                 print("Error: Snapshot objects do not match")
+    return None
 
 class MirrorChanges(bpy.types.Operator):
     """Texture Mirroring For Image Editor""" # tooltip for menu items and buttons
@@ -1061,16 +3452,31 @@ class MirrorChanges(bpy.types.Operator):
 
     def execute(self, context): # function called when operation is run
         startTime = time.time()
-        if (bpy.types.Scene.snapshotMapping is None or self.axis != bpy.types.Scene.snapshotMappingAxis): # if the mapping is none, then it is instantiated within the mirrorChanges function, so updating axis to account for this
-            bpy.types.Scene.snapshotMappingAxis = self.axis
-        MirrorChangesHelperFunction(self, context, False)
+        with recordMirrorRun("Mirror Changes", context):
+            with mirrorStage("map lookup"):
+                activateMirrorMapForSelection(context, self.axis) # uses the mapping for this object and axis if one is cached (if the mapping is none, then it is instantiated within the mirrorChanges function)
+            task = MirrorChangesHelperFunction(self, context, False)
+            if (task is not None):
+                task.step() # does all of it at once
+                self.finishTask(context, False)
         if (timeDebug): # TIME
             print("MirrorChanges time: " + str(time.time() - startTime))
         return {'FINISHED'} # Tells blender the operation is done
 
     def invoke(self, context, axis): # function used to help add input into the above execute (is called by default when operator is called)
         self.axis = bpy.types.Scene.snapshotAxis # should change to whatever is selected in panel
-        return self.execute(context)
+        self.run = startMirrorRun("Mirror Changes", context)
+        with recordingMirrorRun(self.run, context):
+            with mirrorStage("map lookup"):
+                activateMirrorMapForSelection(context, self.axis)
+            task = MirrorChangesHelperFunction(self, context, False)
+        return startModalTask(self, context, task, "Mirroring") # mirrors a bit at a time so blender doesn't freeze
+
+    def modal(self, context, event): # called for every event while mirroring
+        return modalTaskStep(self, context, event)
+
+    def finishTask(self, context, cancelled): # called once the mirroring is done or cancelled
+        storeActiveMirrorMap(context) # keeps what was learned in this mirroring for when this mapping is used again
 
 def menu_func_mirror_changes(self, context):
     self.layout.operator(MirrorChanges.bl_idname)
@@ -1085,16 +3491,31 @@ class MirrorChangesAsMask(bpy.types.Operator):
 
     def execute(self, context): # function called when operation is run
         startTime = time.time()
-        if (bpy.types.Scene.snapshotMapping is None or self.axis != bpy.types.Scene.snapshotMappingAxis): # if the mapping is none, then it is instantiated within the mirrorChanges function, so updating axis to account for this
-            bpy.types.Scene.snapshotMappingAxis = self.axis
-        MirrorChangesHelperFunction(self, context, True)
+        with recordMirrorRun("Mirror Changes As Mask", context):
+            with mirrorStage("map lookup"):
+                activateMirrorMapForSelection(context, self.axis) # uses the mapping for this object and axis if one is cached (if the mapping is none, then it is instantiated within the mirrorChanges function)
+            task = MirrorChangesHelperFunction(self, context, True)
+            if (task is not None):
+                task.step() # does all of it at once
+                self.finishTask(context, False)
         if (timeDebug): # TIME
             print("MirrorChangesAsMask time: " + str(time.time() - startTime))
         return {'FINISHED'} # Tells blender the operation is done
 
     def invoke(self, context, axis): # function used to help add input into the above execute (is called by default when operator is called)
         self.axis = bpy.types.Scene.snapshotAxis # should change to whatever is selected in panel
-        return self.execute(context)
+        self.run = startMirrorRun("Mirror Changes As Mask", context)
+        with recordingMirrorRun(self.run, context):
+            with mirrorStage("map lookup"):
+                activateMirrorMapForSelection(context, self.axis)
+            task = MirrorChangesHelperFunction(self, context, True)
+        return startModalTask(self, context, task, "Mirroring As Mask") # mirrors a bit at a time so blender doesn't freeze
+
+    def modal(self, context, event): # called for every event while mirroring
+        return modalTaskStep(self, context, event)
+
+    def finishTask(self, context, cancelled): # called once the mirroring is done or cancelled
+        storeActiveMirrorMap(context) # keeps what was learned in this mirroring for when this mapping is used again
 
 def menu_func_mirror_changes_as_mask(self, context):
     self.layout.operator(MirrorChangesAsMask.bl_idname)
@@ -1120,18 +3541,30 @@ class MirrorChangesUsingBakingWithMask(bpy.types.Operator):
         myPointers.selectedObject.select_set(True) # selects the object
         bpy.context.view_layer.objects.active = myPointers.selectedObject # sets the object as active
 
-        snapshotChanges = textureSnapshot(image) # snapshots it, storing it in a value
-        image.pixels = bpy.types.Scene.snapshotOfOriginal.pixels # needs image to be like the snapshot for the baking parts to work, as they use images not snapshots
-        snapshotUpdate = mirrorChangesFromSnapshotUsingBakingWithMask(bpy.types.Scene.snapshotOfOriginal, snapshotChanges, myPointers.selectedObject, image, bpy.types.Scene.snapshotAxis, myPointers.cageExtension, myPointers.selectedUV) # run method for performing baking of mirror where the texture is updated to only cover the parts marked with the mask
-        image.pixels = snapshotUpdate.pixels # updates the textures pixels (very time expensive, so only done once at end)
-
-        # make sure the original object is selected again
-        myPointers.selectedObject.select_set(True) # selects the object
-        bpy.context.view_layer.objects.active = myPointers.selectedObject # sets the object as active
-        # makes sure the original image is selected again (necessary as the image generation of the function causes blender to view an empty image otherwise)
-        for area in context.screen.areas:
-            if area.type == 'IMAGE_EDITOR':
-                area.spaces.active.image = image
+        snapshotOriginal = originalSnapshot(image)
+        if (snapshotOriginal is None):
+            return {'CANCELLED'}
+        if (isTiledImage(image)):
+            print("Error: Mirroring by baking only works on images that aren't tiled")
+            return {'CANCELLED'}
+        with recordMirrorRun("Mirror Changes Using Baking With Mask", context):
+            with mirrorStage("snapshot capture"):
+                snapshotChanges = textureSnapshot(image, arena = bpy.types.Scene.snapshotBufferArena) # snapshots it, storing it in a value
+            with mirrorStage("bake setup"):
+                snapshotOriginal.writeToTexture(image) # needs image to be like the snapshot for the baking parts to work, as they use images not snapshots
+            snapshotUpdate = mirrorChangesFromSnapshotUsingBakingWithMask(snapshotOriginal, snapshotChanges, myPointers.selectedObject, image, bpy.types.Scene.snapshotAxis, myPointers.cageExtension, myPointers.selectedUV) # run method for performing baking of mirror where the texture is updated to only cover the parts marked with the mask
+            with mirrorStage("write back"):
+                snapshotUpdate.writeToTexture(image) # updates the textures pixels (very time expensive, so only done once at end)
+            snapshotUpdate.release()
+            snapshotChanges.release()
+
+            # make sure the original object is selected again
+            myPointers.selectedObject.select_set(True) # selects the object
+            bpy.context.view_layer.objects.active = myPointers.selectedObject # sets the object as active
+            # makes sure the original image is selected again (necessary as the image generation of the function causes blender to view an empty image otherwise)
+            for area in context.screen.areas:
+                if area.type == 'IMAGE_EDITOR':
+                    area.spaces.active.image = image
 
         if (timeDebug): # TIME
             print("MirrorChangesUsingBakingWithMask time: " + str(time.time() - startTime))
@@ -1158,16 +3591,28 @@ class PixelGapFill(bpy.types.Operator):
             if area.type == 'IMAGE_EDITOR':
                 image = area.spaces.active.image
 
-        snapshotChanges = textureSnapshot(image)
-        myPointers = context.scene.snapshotObjectPointer
-        # TODO: add function or method that performs some sanity checks (should replace the checks in other functions with this as well), like whether the object is the same, whether the image is the same size, etc
-        if (myPointers.pixelGapFillVerticalLines): # have call one of the pixel gap fills depending on whether the toggle is checked
-            if (bpy.types.Scene.snapshotDiff != 0):
-                pixelGapFill(bpy.types.Scene.snapshotDiff, snapshotChanges, selfBlend = myPointers.pixelGapFillSelfBlend)
-        else:
-            if (bpy.types.Scene.snapshotDiff != 0):
-                pixelGapFillThreshold(bpy.types.Scene.snapshotDiff, snapshotChanges, threshold = myPointers.pixelGapFillThreshold, selfBlend = myPointers.pixelGapFillSelfBlend)
-        image.pixels = snapshotChanges.pixels # updates the textures pixels (very time expensive, so only done once at end)
+        if (isTiledImage(image)):
+            print("Error: Pixel gap fill only works on images that aren't tiled")
+            return {'CANCELLED'}
+        with recordMirrorRun("Pixel Gap Fill", context):
+            with mirrorStage("snapshot capture"):
+                snapshotChanges = textureSnapshot(image, arena = bpy.types.Scene.snapshotBufferArena)
+            myPointers = context.scene.snapshotObjectPointer
+            # TODO: add function or method that performs some sanity checks (should replace the checks in other functions with this as well), like whether the object is the same, whether the image is the same size, etc
+            with mirrorStage("gap fill"):
+                if (myPointers.pixelGapFillVerticalLines): # have call one of the pixel gap fills depending on whether the toggle is checked
+                    if (bpy.types.Scene.snapshotDiff is not None):
+                        pixelGapFill(bpy.types.Scene.snapshotDiff, snapshotChanges, selfBlend = myPointers.pixelGapFillSelfBlend)
+                else:
+                    if (bpy.types.Scene.snapshotDiff is not None):
+                        pixelGapFillThreshold(bpy.types.Scene.snapshotDiff, snapshotChanges, threshold = myPointers.pixelGapFillThreshold, selfBlend = myPointers.pixelGapFillSelfBlend)
+            with mirrorStage("write back"):
+                if (bpy.types.Scene.snapshotDiff is not None and (myPointers.pixelGapFillVerticalLines or myPointers.pixelGapFillThreshold > 0) and bpy.types.Scene.snapshotDiff.sizeX == snapshotChanges.sizeX and bpy.types.Scene.snapshotDiff.sizeY == snapshotChanges.sizeY):
+                    # the filled pixels all border a pixel of the diff, so the diff's rectangle grown by one pixel holds every change
+                    snapshotChanges.writeRegionsToTexture(image, pixelRegions([bpy.types.Scene.snapshotDiff.indices], snapshotChanges.sizeX, snapshotChanges.sizeY, margin = 1))
+                else:
+                    snapshotChanges.writeToTexture(image) # updates the textures pixels (very time expensive, so only done once at end)
+            snapshotChanges.release()
         return {'FINISHED'} # Tells blender the operation is done
 
     def invoke(self, context, axis): # function used to help add input into the above execute (is called by default when operator is called)
@@ -1183,38 +3628,55 @@ class CreateMirrorMapping(bpy.types.Operator):
     bl_label = "Create Mirror Map" # display name
     bl_options = {'REGISTER', 'UNDO'} # Enables undo for the operator
 
-    def execute(self, context): # function called when operation is run
+    # returns the mirrorMapBuilder for making the mapping of the selected object and image, or None if there is nothing to make
+    def startBuilder(self, context):
         image = 0
         myPointers = context.scene.snapshotObjectPointer
         # grabs current selected image in image editor
-        startTime = time.time()
         for area in context.screen.areas:
             if area.type == 'IMAGE_EDITOR':
                 image = area.spaces.active.image
-                #snapshotChanges = textureSnapshot(image)# snapshots it, storing it in a value
                 if (bpy.types.Scene.snapshotObject == myPointers.selectedObject): # ensures the same object is for snapshots is still being used
-                    # creates the bmesh of the object
                     if (myPointers.selectedObject.type == 'MESH'):
-                        tempBmesh = bmesh.new()
-                        tempBmesh.from_mesh(myPointers.selectedObject.data)
-                        tempBmesh.faces.ensure_lookup_table()
-                        bmesh.ops.triangulate(tempBmesh, faces=tempBmesh.faces, quad_method='BEAUTY', ngon_method='BEAUTY') # needs to be triangulated for the barymetric transformation
-                        # creates the mapping and notes the axis used
-                        bpy.types.Scene.snapshotMapping = createSnapshotMapping(object = myPointers.selectedObject, tempBmesh = tempBmesh, texture = image, snapshot = None, axis = self.axis, uv = myPointers.selectedUV, pixelMap = bpy.types.Scene.snapshotMapping) # makes a pixel map
-                        bpy.types.Scene.snapshotMappingAxis = self.axis # updates what axis was used in the mapping
-                        # frees the bmesh
-                        tempBmesh.free()
+                        activateMirrorMapForSelection(context, self.axis) # a mapping made before (even in another session) is used instead of remade, and a lazily started or cancelled one for this axis is finished
+                        if (bpy.types.Scene.snapshotMappingHoles is None): # only finished mappings have their holes found
+                            return mirrorMapBuilder(object = myPointers.selectedObject, texture = image, axis = self.axis, uv = myPointers.selectedUV, pixelMap = bpy.types.Scene.snapshotMapping, remapAll = bpy.types.Scene.snapshotMappingAxis != self.axis)
+                        storeActiveMirrorMap(context)
                     else:
                         print("Error: Object selected is not a MESH object")
                 else:
                     print("Error: Snapshot objects do not match")
+        return None
+
+    def execute(self, context): # function called when operation is run
+        startTime = time.time()
+        with recordMirrorRun("Create Mirror Map", context):
+            self.task = self.startBuilder(context)
+            if (self.task is not None):
+                self.task.step() # makes all of it at once
+                self.finishTask(context, False)
         if (timeDebug): # TIME
             print("CreateMirrorMapping time: " + str(time.time() - startTime))
         return {'FINISHED'} # Tells blender the operation is done
 
     def invoke(self, context, axis): # function used to help add input into the above execute (is called by default when operator is called)
         self.axis = bpy.types.Scene.snapshotAxis # should change to whatever is selected in panel
-        return self.execute(context)
+        self.run = startMirrorRun("Create Mirror Map", context)
+        with recordingMirrorRun(self.run, context):
+            self.task = self.startBuilder(context)
+        return startModalTask(self, context, self.task, "Creating Mirror Map") # makes the mapping a bit at a time so blender doesn't freeze
+
+    def modal(self, context, event): # called for every event while making the mapping
+        return modalTaskStep(self, context, event)
+
+    def finishTask(self, context, cancelled): # called once the mapping is made or cancelled (a cancelled mapping keeps what was mapped and is finished the next time)
+        myPointers = context.scene.snapshotObjectPointer
+        bpy.types.Scene.snapshotMapping = self.task.pixelMap
+        bpy.types.Scene.snapshotMappingHoles = self.task.mapHoles
+        if (not cancelled):
+            memoryKey, diskKey, meshData = mirrorMapKeysForSelection(context, self.axis)
+            saveMirrorMapToCache(diskKey, bpy.types.Scene.snapshotMapping, bpy.types.Scene.snapshotMappingHoles, myPointers.mirrorMapCacheSize * 1024 * 1024)
+        storeActiveMirrorMap(context)
 
 def menu_func_mirror_changes(self, context):
     self.layout.operator(CreateMirrorMapping.bl_idname)
@@ -1232,7 +3694,16 @@ class ClearMirrorMapping(bpy.types.Operator):
         # grabs current selected image in image editor
         startTime = time.time()
 
+        # removes every axis' mapping of the selected object from memory and the disk cache, so they are remade instead of reloaded
+        for axis in ['x', 'y', 'z']:
+            memoryKey, diskKey, meshData = mirrorMapKeysForSelection(context, axis)
+            bpy.types.Scene.mirrorMapMemoryCache.remove(memoryKey)
+            if (diskKey is not None):
+                shutil.rmtree(os.path.join(mirrorMapCacheDirectory(), diskKey), ignore_errors=True)
         bpy.types.Scene.snapshotMapping = None # sets the mapping to None
+        bpy.types.Scene.snapshotMappingHoles = None
+        bpy.types.Scene.snapshotMappingKey = None
+        bpy.types.Scene.snapshotMappingMeshData = None
 
         if (timeDebug): # TIME
             print("ClearMirrorMapping time: " + str(time.time() - startTime))
@@ -1285,6 +3756,286 @@ class ChooseZAxis(bpy.types.Operator):
 def menu_func_mirror_axis_z(self, context):
     self.layout.operator(ChooseZAxis.bl_idname)
 
+# Batch Mirroring -----------------------------------------
+# Run headless with:
+# blender -b file.blend --python MirrorAddon.py -- [options]
+# One job is given by the options, or many by a manifest (--manifest jobs.json) that is either a list of jobs or {"defaults": {...}, "jobs": [...]}
+# A job is a dictionary of these keys (the options are the same with dashes, Ex. --position-x), anything left out uses the settings saved in the panel of the .blend:
+# image is the name of an image in the .blend or the path of one to load, which is mirrored into
+# original is the image before the changes were painted, the changes between it and image are mirrored (like "Mirror Changes")
+# mask is a copy of image painted over where to mirror, what it covers of image is mirrored (like "Mirror Changes As Mask"), give either original or mask
+# mode is "2D", "3D" or "BAKE"
+# object and uv are the mesh and UV map used by the 3D and BAKE modes, and axis is 'x', 'y' or 'z'
+# angle, positionX, positionY and preventOutsidePixels are the line of the 2D mode
+# method2D is how the 2D mode mirrors, "Scatter", "Gather_Nearest" or "Gather_Bilinear" (see mirrorPixels2D)
+# gapFill is "lines" or a pixel gap fill threshold to run after mirroring
+# mirrorMap is whether to make the whole mirror map before a 3D job instead of learning it as it mirrors (worth it when many jobs share the object, axis and size)
+# cageExtension is the cage extension of the BAKE mode
+# output is the path the image is saved to (.png files of 8 bit images are written on a background thread while the next job runs)
+batchJobKeys = ("image", "original", "mask", "mode", "object", "uv", "axis", "angle", "positionX", "positionY", "preventOutsidePixels", "method2D", "gapFill", "mirrorMap", "cageExtension", "output")
+
+# Inputs: ------------------------
+# path is the .png file to write
+# pixels is the float32 array of the image's pixels (RGBA, bottom row first like image.pixels)
+# sizeX and sizeY are the size of the image
+# Purpose: -----------------------
+# writes the pixels as an 8 bit RGBA png without going through blender, so it can be done on a thread (bpy can only be used from the main one)
+def writePNG(path, pixels, sizeX, sizeY):
+    rows = np.clip(np.rint(pixels.reshape(sizeY, sizeX, 4)[::-1] * 255), 0, 255).astype(np.uint8) # png rows start at the top
+    raw = np.zeros((sizeY, sizeX * 4 + 1), dtype=np.uint8) # each row starts with its filter type, 0 is none
+    raw[:, 1:] = rows.reshape(sizeY, sizeX * 4)
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xffffffff)
+    data = b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", sizeX, sizeY, 8, 6, 0, 0, 0)) + chunk(b"IDAT", zlib.compress(raw.tobytes(), 6)) + chunk(b"IEND", b"")
+    with open(path + ".tmp", "wb") as file:
+        file.write(data)
+    os.replace(path + ".tmp", path) # so a half written file is never left at the path
+
+# saves the image to path through blender, with the format picked from the extension
+def saveImageWithBlender(image, path):
+    formats = {".png": 'PNG', ".exr": 'OPEN_EXR', ".tga": 'TARGA', ".tif": 'TIFF', ".tiff": 'TIFF', ".jpg": 'JPEG', ".jpeg": 'JPEG', ".bmp": 'BMP'}
+    oldPath = image.filepath_raw
+    oldFormat = image.file_format
+    image.filepath_raw = path
+    image.file_format = formats.get(os.path.splitext(path)[1].lower(), oldFormat)
+    try:
+        image.save()
+    finally:
+        image.filepath_raw = oldPath # the image still comes from where it did
+        image.file_format = oldFormat
+
+class batchImageWriter():
+
+    # Inputs: ---------------------
+    # maxPending is how many saves can wait on the thread before the next save waits for the oldest, which bounds the memory held by their pixels
+    # Purpose: --------------------
+    # saves the outputs of batch jobs, writing the ones that don't need blender on a thread so the next job's mirroring overlaps with it
+    def __init__(self, maxPending = 2):
+        self.pool = concurrent.futures.ThreadPoolExecutor(max_workers = 1)
+        self.pending = collections.deque() # (path, future) of the saves on the thread, oldest first
+        self.maxPending = maxPending
+        self.errors = {} # path to the error of each save that failed
+
+    # saves a copy of the image's pixels as they are now to path
+    def save(self, image, path):
+        path = bpy.path.abspath(path)
+        directory = os.path.dirname(path)
+        if (directory != ""):
+            os.makedirs(directory, exist_ok = True)
+        if (path.lower().endswith(".png") and not image.is_float):
+            pixels = np.empty(image.size[0] * image.size[1] * 4, dtype=np.float32)
+            image.pixels.foreach_get(pixels) # the copy the thread writes, so the next job can change the image
+            while (len(self.pending) >= self.maxPending):
+                self.wait(*self.pending.popleft())
+            self.pending.append((path, self.pool.submit(writePNG, path, pixels, image.size[0], image.size[1])))
+        else: # float images and other formats need blender's writers (Ex. for the colour management of an exr)
+            try:
+                saveImageWithBlender(image, path)
+            except RuntimeError as error:
+                self.errors[path] = str(error)
+
+    # waits for a save on the thread to finish, recording its error if it failed
+    def wait(self, path, future):
+        try:
+            future.result()
+        except OSError as error:
+            self.errors[path] = str(error)
+
+    # waits for every save to finish and stops the thread, returning the errors
+    def close(self):
+        while (self.pending):
+            self.wait(*self.pending.popleft())
+        self.pool.shutdown()
+        return self.errors
+
+# returns the image with the name in the .blend, loading it if it is a path instead (loaded once and reused by later jobs), or None if value is None
+def batchImage(value, label):
+    if (value is None):
+        return None
+    image = bpy.data.images.get(value)
+    if (image is None):
+        path = bpy.path.abspath(value)
+        if (not os.path.exists(path)):
+            raise ValueError("the " + label + " image " + value + " is not in the .blend or a file")
+        image = bpy.data.images.load(path, check_existing = True)
+    return image
+
+# Inputs: ------------------------
+# job is the dictionary of the job (see batchJobKeys)
+# myPointers is the MirrorAddonPointers, whose settings are used for what the job leaves out
+# Purpose: -----------------------
+# mirrors the job's image, raising ValueError if the job can't be done
+# the mesh data, UV grid and mirror maps are kept in the addon's caches, so later jobs on the same object reuse them
+def runBatchJob(job, myPointers):
+    unknownKeys = set(job) - set(batchJobKeys)
+    if (unknownKeys):
+        raise ValueError("unknown job keys " + ", ".join(sorted(unknownKeys)))
+    mode = str(job.get("mode", "3D")).upper()
+    if (mode not in ("2D", "3D", "BAKE")):
+        raise ValueError("mode must be 2D, 3D or BAKE, not " + mode)
+    image = batchImage(job.get("image"), "image")
+    if (image is None):
+        raise ValueError("no image given")
+    original = batchImage(job.get("original"), "original")
+    mask = batchImage(job.get("mask"), "mask")
+    if ((original is None) == (mask is None)):
+        raise ValueError("give either an original (to mirror the changes) or a mask (to mirror what it covers)")
+    useMask = mask is not None
+    if (isTiledImage(image) or isTiledImage(mask if useMask else original)):
+        raise ValueError("tiled (UDIM) images are mirrored from the panel, as their tiles are read from their files")
+    if (tuple((mask if useMask else original).size) != tuple(image.size)):
+        raise ValueError("the images are not the same size")
+    arena = bpy.types.Scene.snapshotBufferArena
+    bpy.types.Scene.snapshotDiff = None # so a gap fill never uses the last job's
+    with mirrorStage("snapshot capture"):
+        snapshot1 = textureSnapshot(image if useMask else original, arena = arena)
+        snapshot2 = textureSnapshot(mask if useMask else image, arena = arena)
+
+    if (mode == "2D"):
+        method = job.get("method2D", myPointers.mirrorMethod2D)
+        if (method not in mirrorMethods2D):
+            raise ValueError("method2D must be " + ", ".join(mirrorMethods2D) + ", not " + str(method))
+        mirrorChangesFromSnapshots2D(snapshot1, snapshot2, image, float(job.get("angle", myPointers.axisAngle2D)), float(job.get("positionX", myPointers.position2Dx)), float(job.get("positionY", myPointers.position2Dy)), mask = useMask, preventOutsidePixels = bool(job.get("preventOutsidePixels", myPointers.preventOutsidePixelsIn2D)), method = method)
+    else:
+        object = bpy.data.objects.get(job["object"]) if "object" in job else myPointers.selectedObject
+        if (object is None or object.type != 'MESH'):
+            raise ValueError("the object " + str(job.get("object")) + " is not a mesh in the .blend")
+        uv = job.get("uv", myPointers.selectedUV)
+        if (object.data.uv_layers.get(uv) is None):
+            raise ValueError("the object " + object.name + " has no UV map " + uv)
+        axis = str(job.get("axis", bpy.types.Scene.snapshotAxis)).lower()
+        if (axis not in ('x', 'y', 'z')):
+            raise ValueError("axis must be x, y or z, not " + axis)
+        if (mode == "3D"):
+            bpy.types.Scene.snapshotObject = object
+            keys = mirrorMapKeys(object, uv, image, axis)
+            with mirrorStage("map lookup"):
+                activateMirrorMap(myPointers, keys, axis) # the mapping left by an earlier job on this object and axis, or one from the disk cache
+            if (job.get("mirrorMap", False) and bpy.types.Scene.snapshotMappingHoles is None):
+                builder = mirrorMapBuilder(object = object, texture = image, axis = axis, uv = uv, pixelMap = bpy.types.Scene.snapshotMapping, remapAll = bpy.types.Scene.snapshotMappingAxis != axis)
+                builder.step()
+                bpy.types.Scene.snapshotMapping = builder.pixelMap
+                bpy.types.Scene.snapshotMappingHoles = builder.mapHoles
+                saveMirrorMapToCache(keys[1], builder.pixelMap, builder.mapHoles, myPointers.mirrorMapCacheSize * 1024 * 1024)
+            task = mirrorChangesTask(snapshot1, snapshot2, object, image, axis, uv = uv, mask = useMask, pixelMap = bpy.types.Scene.snapshotMapping, pixelMapAxis = bpy.types.Scene.snapshotMappingAxis, mapHoles = bpy.types.Scene.snapshotMappingHoles)
+            task.step()
+            storeActiveMirrorMap(bpy.context) # keeps what was learned for the next job
+        else:
+            bpy.context.view_layer.objects.active = object # the bake needs the object selected and active, like the operator does from the panel
+            bpy.ops.object.mode_set(mode='OBJECT')
+            bpy.ops.object.select_all(action='DESELECT')
+            object.select_set(True)
+            with mirrorStage("bake setup"):
+                snapshot1.writeToTexture(image) # the bake reads the image, so it has to be what is mirrored from
+            snapshotUpdate = mirrorChangesFromSnapshotUsingBakingWithMask(snapshot1, snapshot2, object, image, axis, float(job.get("cageExtension", myPointers.cageExtension)), uv)
+            with mirrorStage("write back"):
+                snapshotUpdate.writeToTexture(image)
+            snapshotUpdate.release()
+    snapshot1.release()
+    snapshot2.release() # already given back by the 3D task, which owns it
+
+    gapFill = job.get("gapFill")
+    if (gapFill is not None and bpy.types.Scene.snapshotDiff is not None):
+        verticalLines = str(gapFill).lower() == "lines"
+        threshold = 0 if verticalLines else int(gapFill)
+        with mirrorStage("snapshot capture"):
+            snapshot = textureSnapshot(image, arena = arena)
+        with mirrorStage("gap fill"):
+            if (verticalLines):
+                pixelGapFill(bpy.types.Scene.snapshotDiff, snapshot, selfBlend = myPointers.pixelGapFillSelfBlend)
+            else:
+                pixelGapFillThreshold(bpy.types.Scene.snapshotDiff, snapshot, threshold = threshold, selfBlend = myPointers.pixelGapFillSelfBlend)
+        with mirrorStage("write back"):
+            if (verticalLines or threshold > 0): # the filled pixels all border the diff, the same as the Pixel Gap Fill button
+                snapshot.writeRegionsToTexture(image, pixelRegions([bpy.types.Scene.snapshotDiff.indices], snapshot.sizeX, snapshot.sizeY, margin = 1))
+            else:
+                snapshot.writeToTexture(image)
+        snapshot.release()
+    return image
+
+# Inputs: ------------------------
+# jobs is a list of job dictionaries (see batchJobKeys)
+# reportPath is the path of a JSON file the result of every job is written to (or None)
+# saveBlend is whether to save the .blend once every job is done (Ex. to keep the changes to images packed in it)
+# Purpose: -----------------------
+# runs the jobs one after another in this blender session, returning a list of the result of each ("error" is None for the ones that worked)
+def runBatch(jobs, reportPath = None, saveBlend = False):
+    myPointers = bpy.context.scene.snapshotObjectPointer
+    writer = batchImageWriter()
+    results = []
+    outputJobs = {} # output path to the result of the job that saves to it
+    for number, job in enumerate(jobs):
+        run = startMirrorRun("Batch " + str(job.get("mode", "3D")).upper(), bpy.context)
+        result = {"job": number, "image": job.get("image"), "output": job.get("output"), "error": None}
+        try:
+            with recordingMirrorRun(run, bpy.context): # ends the run as cancelled if the job fails
+                image = runBatchJob(job, myPointers)
+                if (job.get("output") is not None):
+                    with mirrorStage("save"):
+                        writer.save(image, job["output"]) # only waits for the copy of the pixels, not the writing
+                    outputJobs[bpy.path.abspath(job["output"])] = result
+            endMirrorRun(run, bpy.context)
+        except (ValueError, KeyError, RuntimeError, OSError) as error: # RuntimeError is what blender's operators raise
+            result["error"] = str(error)
+            print("Error: Batch job " + str(number) + " failed: " + str(error))
+        result["run"] = run.toDict()
+        results.append(result)
+    for path, error in writer.close().items():
+        outputJobs[path]["error"] = "could not save " + path + ": " + error
+        print("Error: Batch job " + str(outputJobs[path]["job"]) + " could not save " + path + ": " + error)
+    if (saveBlend):
+        bpy.ops.wm.save_mainfile()
+    if (reportPath is not None):
+        with open(reportPath, "w") as file:
+            json.dump(results, file, indent = 1)
+    return results
+
+# returns the parsed options given after the "--" on blender's command line
+def parseBatchArguments(argv):
+    parser = argparse.ArgumentParser(prog = "blender -b file.blend --python MirrorAddon.py --", description = "Mirrors textures without the interface. The options make one job, or are the defaults of the jobs of a manifest")
+    parser.add_argument("--manifest", help = "JSON file of jobs, a list of them or {\"defaults\": {...}, \"jobs\": [...]}")
+    parser.add_argument("--image", help = "name of the image in the .blend or path of one to load, which is mirrored into")
+    parser.add_argument("--original", help = "the image before the changes were painted, to mirror the changes")
+    parser.add_argument("--mask", help = "a copy of the image painted over where to mirror, to mirror what it covers")
+    parser.add_argument("--mode", type = str.upper, choices = ["2D", "3D", "BAKE"])
+    parser.add_argument("--object")
+    parser.add_argument("--uv")
+    parser.add_argument("--axis", type = str.lower, choices = ["x", "y", "z"])
+    parser.add_argument("--angle", type = float, help = "angle of the 2D line in degrees")
+    parser.add_argument("--position-x", dest = "positionX", type = float, help = "point the 2D line goes through, 0 to 1 across the image")
+    parser.add_argument("--position-y", dest = "positionY", type = float)
+    parser.add_argument("--prevent-outside-pixels", dest = "preventOutsidePixels", action = "store_const", const = True)
+    parser.add_argument("--method-2d", dest = "method2D", choices = mirrorMethods2D, help = "how the 2D mode mirrors, the gathers leave no gaps")
+    parser.add_argument("--gap-fill", dest = "gapFill", help = "lines, or a pixel gap fill threshold")
+    parser.add_argument("--mirror-map", dest = "mirrorMap", action = "store_const", const = True, help = "make the whole mirror map before 3D jobs")
+    parser.add_argument("--cage-extension", dest = "cageExtension", type = float)
+    parser.add_argument("--output", help = "path to save the image to")
+    parser.add_argument("--report", help = "JSON file to write the result of every job to")
+    parser.add_argument("--save-blend", dest = "saveBlend", action = "store_true", help = "save the .blend once every job is done")
+    return parser.parse_args(argv)
+
+# returns the list of jobs from the parsed options, a job's own keys win over the options, which win over the manifest's defaults
+def batchJobsFromArguments(options):
+    optionDefaults = {key: getattr(options, key) for key in batchJobKeys if getattr(options, key) is not None}
+    if (options.manifest is None):
+        return [optionDefaults]
+    with open(options.manifest) as file:
+        manifest = json.load(file)
+    manifestDefaults = {}
+    if (isinstance(manifest, dict)):
+        manifestDefaults = manifest.get("defaults", {})
+        manifest = manifest.get("jobs", [])
+    return [{**manifestDefaults, **optionDefaults, **job} for job in manifest]
+
+# runs the batch given on the command line, quitting blender with an error code if a job failed
+def runBatchFromCommandLine(argv):
+    options = parseBatchArguments(argv)
+    results = runBatch(batchJobsFromArguments(options), options.report, options.saveBlend)
+    failed = [result for result in results if result["error"] is not None]
+    print("Batch: " + str(len(results) - len(failed)) + " of " + str(len(results)) + " jobs done")
+    if (failed):
+        sys.exit(1)
+
 # Pointers For Addon -----------------------------------------
 class MirrorAddonPointers(bpy.types.PropertyGroup):
     selectedObject : bpy.props.PointerProperty(
@@ -1338,6 +4089,15 @@ class MirrorAddonPointers(bpy.types.PropertyGroup):
         default = True,
     )
 
+    mirrorMethod2D : bpy.props.EnumProperty(
+        name = "2D Method",
+        default = "Gather_Nearest",
+        items = [
+            ('Scatter', 'Scatter', 'Moves each changed pixel to its mirror. Rotated axes can leave gaps that need a pixel gap fill'),
+            ('Gather_Nearest', 'Gather Nearest', 'Fills every pixel whose mirror is a changed pixel with the pixel nearest its mirror. Leaves no gaps'),
+            ('Gather_Bilinear', 'Gather Bilinear', 'Fills every pixel whose mirror is a changed pixel with a blend of the 4 pixels around its mirror. Leaves no gaps and is smoother on rotated axes')],
+    )
+
     pixelGapFillVerticalLines : bpy.props.BoolProperty(
         name = "Pixel Gap Fill Vertical Lines",
         description = "Toggles whether pixel gap fill uses a threshold or simply fills in vertical gaps in the mirroring",
@@ -1358,6 +4118,69 @@ class MirrorAddonPointers(bpy.types.PropertyGroup):
         default = False,
     )
 
+    snapshotMemoryBudget : bpy.props.IntProperty(
+        name = "Snapshot Memory (MB)",
+        description = "How much memory the snapshots of every image can use. The least recently used snapshots are moved to temporary files on disk when it is full",
+        default = 2048,
+        min = 0,
+    )
+
+    snapshotHistoryLength : bpy.props.IntProperty(
+        name = "Snapshots Per Image",
+        description = "How many snapshots of each image are kept. The oldest is removed when another is taken",
+        default = 5,
+        min = 1,
+    )
+
+    mirrorMapCacheSize : bpy.props.IntProperty(
+        name = "Mirror Map Cache Size (MB)",
+        description = "How much disk space mirror maps saved between sessions can use. The least recently used maps are removed when it is full. 0 turns off the cache",
+        default = 4096,
+        min = 0,
+    )
+
+    mirrorMapMemoryBudget : bpy.props.IntProperty(
+        name = "Mirror Map Memory (MB)",
+        description = "How much memory the mirror maps kept loaded can use (several axes and objects can be kept at once). The least recently used maps are removed when it is full",
+        default = 4096,
+        min = 0,
+    )
+
+    udimTilePairEnabled : bpy.props.BoolProperty(
+        name = "Mirror Across Tile Pair",
+        description = "For tiled (UDIM) images, mirrors the changes of each tile of the pair into the other tile instead of mirroring every tile within itself",
+        default = False,
+    )
+
+    udimTileA : bpy.props.IntProperty(
+        name = "Tile",
+        description = "First tile of the pair",
+        default = 1001,
+        min = 1001,
+        max = 2000,
+    )
+
+    udimTileB : bpy.props.IntProperty(
+        name = "Tile",
+        description = "Second tile of the pair",
+        default = 1002,
+        min = 1001,
+        max = 2000,
+    )
+
+    trackPeakMemory : bpy.props.BoolProperty(
+        name = "Track Peak Memory",
+        description = "Records the peak memory of each run. Slows down the addon while it is on",
+        default = False,
+    )
+
+    mirrorRunLogPath : bpy.props.StringProperty(
+        name = "Run Log",
+        description = "File each run's timings and counts are added to as a line of JSON. Leave empty to not log",
+        default = "",
+        subtype = 'FILE_PATH',
+    )
+
     cageExtension : bpy.props.FloatProperty(
         name = "Cage Extension",
         description = "The amount the object is extended for ray baking. Want really close to 0, but normally greater than 0 to help prevent z fighting.",
@@ -1412,6 +4235,14 @@ class MirrorAddonPanel(bpy.types.Panel):
             b1row1.label(text = "Current Snapshot Object: " + bpy.types.Scene.snapshotObject.name)
         else:
             b1row1.label(text = "No Current Snapshot")
+        image = context.space_data.image
+        if (image is not None): # lists the snapshots of the image, the pressed one is used
+            activeName = bpy.types.Scene.textureSnapshotStore.active.get(snapshotImageKey(image))
+            for name, line in bpy.types.Scene.textureSnapshotStore.describe(snapshotImageKey(image)):
+                box.row().operator("image.select_snapshot", text = line, depress = (name == activeName)).snapshotName = name
+        b1row1_5 = box.row()
+        b1row1_5.prop(myPointers, "snapshotMemoryBudget")
+        b1row1_5.prop(myPointers, "snapshotHistoryLength")
         b1row2 = box.row()
         b1row2.operator("image.snapshot_revert")
         b1row3 = box.row()
@@ -1431,6 +4262,15 @@ class MirrorAddonPanel(bpy.types.Panel):
         b2row3 = box2.row()
         b2row3.prop(myPointers, "axisAngle2D")
         b2row3.prop(myPointers, "preventOutsidePixelsIn2D")
+        b2row3_4 = box2.row()
+        b2row3_4.prop(myPointers, "mirrorMethod2D")
+        if (isTiledImage(image)): # tiles are mirrored within themselves, or across a pair
+            b2row3_5 = box2.row()
+            b2row3_5.prop(myPointers, "udimTilePairEnabled")
+            b2row3_6 = box2.row()
+            b2row3_6.prop(myPointers, "udimTileA")
+            b2row3_6.prop(myPointers, "udimTileB")
+            b2row3_6.enabled = myPointers.udimTilePairEnabled
         b2row4 = box2.row()
         #b2row4.operator("image.draw_symmetry_line")
         # Controls
@@ -1446,6 +4286,8 @@ class MirrorAddonPanel(bpy.types.Panel):
         # 3D Mirroring
         box3 = layout.box()
         box3.label(text = "Mirror 3D Settings")
+        if (bpy.types.Scene.mirrorTaskStatus is not None): # progress of the mirror or mapping being made
+            box3.row().label(text = bpy.types.Scene.mirrorTaskStatus)
         b3row1 = box3.row() # creates row in the box
         b3row1.operator("image.mirror_changes") # adds a button to the next row that is a button for its operator
         b3row2 = box3.row()
@@ -1455,11 +4297,19 @@ class MirrorAddonPanel(bpy.types.Panel):
         b3row3 = box3.row()
         b3row3.operator("image.mirror_mapping")
         b3row3.operator("image.clear_mirror_mapping")
+        b3row3_5 = box3.row()
+        b3row3_5.prop(myPointers, "mirrorMapCacheSize")
+        b3row3_6 = box3.row()
+        b3row3_6.prop(myPointers, "mirrorMapMemoryBudget")
         b5row4 = box3.row()
         if (bpy.types.Scene.snapshotMappingAxis != None):
             b5row4.label(text = "Mapping Axis: " + bpy.types.Scene.snapshotMappingAxis)
+            if (bpy.types.Scene.snapshotMappingHoles is not None):
+                b5row4.label(text = "Coverage: " + str(round(bpy.types.Scene.snapshotMappingHoles.coverage * 100, 2)) + "%")
         else:
             b5row4.label(text = "No current mapping")
+        for line in bpy.types.Scene.mirrorMapMemoryCache.describe(): # lists the mappings kept in memory
+            box3.row().label(text = line)
         b3row5 = box3.row()
         b3row5.operator("image.mirror_axis_x")
         b3row5.operator("image.mirror_axis_y")
@@ -1482,6 +4332,19 @@ class MirrorAddonPanel(bpy.types.Panel):
         b4row3 = box4.row()
         b4row3.prop(myPointers, "pixelGapFillSelfBlend")
 
+        # Run Statistics
+        box5 = layout.box()
+        box5.label(text = "Last Run")
+        if (bpy.types.Scene.mirrorRun is not None and bpy.types.Scene.mirrorRun.finished):
+            for line in bpy.types.Scene.mirrorRun.describe(): # time of each stage and how many pixels went through them
+                box5.row().label(text = line)
+        else:
+            box5.row().label(text = "Nothing run yet")
+        b5row1 = box5.row()
+        b5row1.prop(myPointers, "trackPeakMemory")
+        b5row2 = box5.row()
+        b5row2.prop(myPointers, "mirrorRunLogPath")
+
 # Registering Addon ---------------------------------------------
 handler_refs = [] # stores draw handler reference
 
@@ -1491,6 +4354,7 @@ def register():
     #bpy.types.IMAGE_MT_image.append(menu_func_snapshot) # adds operator to an existing menu
     # snapshot revert
     bpy.utils.register_class(SnapshotRevert)
+    bpy.utils.register_class(SelectSnapshot)
     # mirror changes
     bpy.utils.register_class(MirrorChanges)
     #bpy.types.IMAGE_MT_image.append(menu_func_mirror_changes)
@@ -1521,14 +4385,23 @@ def register():
     # panel
     bpy.utils.register_class(MirrorAddonPanel)
     # variables
-    bpy.types.Scene.snapshotOfOriginal = textureSnapshot() # holds the snapshot
-    bpy.types.Scene.snapshotDiff = 0 # holds what is changed for the pixel gap fill
+    bpy.types.Scene.textureSnapshotStore = textureSnapshotStore() # holds the snapshots of each image
+    bpy.types.Scene.snapshotDiff = None # holds what is changed for the pixel gap fill
     bpy.types.Scene.snapshotMapping = None # holds the mapping for a snapshot for one axis
+    bpy.types.Scene.snapshotMappingHoles = None # holds the pixels on the UV islands the mapping has no mirror for
     bpy.types.Scene.snapshotAxis = 'x' # the axis currently selected
     bpy.types.Scene.snapshotMappingAxis = None # axis used in making the mapping
+    bpy.types.Scene.snapshotMappingKey = None # key of the mapping in use in the mirrorMapMemoryCache
+    bpy.types.Scene.snapshotMappingMeshData = None # uvMeshData of the mesh the mapping in use is for
+    bpy.types.Scene.mirrorMapMemoryCache = mirrorMapMemoryCache() # holds the mappings of several axes and objects at once
+    bpy.types.Scene.snapshotBufferArena = snapshotBufferArena() # reuses the texture sized buffers between mirrors
     bpy.types.Scene.snapshotObject = None # holds the object the snapshot was made on
     bpy.types.Scene.snapshotObjectModifierPointUV = None
     bpy.types.Scene.snapshotObjectModifierPointModel = None
+    bpy.types.Scene.mirrorTaskStatus = None # progress text of the mirror or mapping running in the background
+    bpy.types.Scene.mirrorRun = None # the mirrorRunStats of the last run, shown in the panel
+    bpy.types.Scene.recordingMirrorRun = None # the mirrorRunStats the stages and counts are added to right now, set by recordingMirrorRun
+    bpy.types.Scene.uvMeshDataCache = {} # holds the triangles, surface grid and UV grid of each object and UV map used, keyed by (object name, uv)
     bpy.types.Scene.snapshotObjectPointer = bpy.props.PointerProperty(type=MirrorAddonPointers)
     bpy.types.Scene.symmetry_line_props = bpy.props.PointerProperty(type=SymmetryLineProperties)
 
@@ -1541,6 +4414,7 @@ def register():
 def unregister():
     bpy.utils.unregister_class(SnapshotOriginal)
     bpy.utils.unregister_class(SnapshotRevert)
+    bpy.utils.unregister_class(SelectSnapshot)
     bpy.utils.unregister_class(MirrorChanges)
     bpy.utils.unregister_class(MirrorChangesAsMask)
     bpy.utils.unregister_class(CreateMirrorMapping)
@@ -1556,14 +4430,25 @@ def unregister():
     bpy.utils.unregister_class(MirrorAddonPointers)
     bpy.utils.unregister_class(SymmetryLineProperties)
     bpy.utils.unregister_class(MirrorAddonPanel)
-    del bpy.types.Scene.snapshotOfOriginal
+    bpy.types.Scene.textureSnapshotStore.clear() # removes the spilled snapshots from disk
+    del bpy.types.Scene.textureSnapshotStore
     del bpy.types.Scene.snapshotDiff
     del bpy.types.Scene.snapshotMapping
+    del bpy.types.Scene.snapshotMappingHoles
     del bpy.types.Scene.snapshotAxis
     del bpy.types.Scene.snapshotMappingAxis
+    del bpy.types.Scene.snapshotMappingKey
+    del bpy.types.Scene.snapshotMappingMeshData
+    del bpy.types.Scene.mirrorMapMemoryCache
+    bpy.types.Scene.snapshotBufferArena.clear()
+    del bpy.types.Scene.snapshotBufferArena
     del bpy.types.Scene.snapshotObject
     del bpy.types.Scene.snapshotObjectModifierPointUV
     del bpy.types.Scene.snapshotObjectModifierPointModel
+    del bpy.types.Scene.mirrorTaskStatus
+    del bpy.types.Scene.mirrorRun
+    del bpy.types.Scene.recordingMirrorRun
+    del bpy.types.Scene.uvMeshDataCache
     del bpy.types.Scene.snapshotObjectPointer
     del bpy.types.Scene.symmetry_line_props
 
@@ -1575,3 +4460,5 @@ def unregister():
 # For testing addon by running in text editor
 if __name__ == "__main__":
     register()
+    if (bpy.app.background and "--" in sys.argv): # run headless for batch mirroring (see Batch Mirroring)
+        runBatchFromCommandLine(sys.argv[sys.argv.index("--") + 1:])
@@ -0,0 +1,286 @@
+# Benchmarks For The Mirror Texture Changes Addon
+
+# Run headless with:
+# blender -b --python MirrorBenchmark.py -- [options]
+# Options:
+# --sizes 1024,2048,4096,8192 is the texture sizes to run (square)
+# --segments 16,64,256 is the segments of the UV spheres used as meshes (a sphere of n segments has about n * n triangles)
+# --repeat 3 is how many times each benchmark is run, the fastest is kept
+# --stroke 0.03 is the radius of the painted dots as a fraction of the texture size
+# --lazy-max-size 2048 is the largest texture the 3D mirror without a mapping is run on (it is far slower than with one)
+# --float uses float textures instead of 8 bit ones
+# --golden golden.json is a file of hashes of the output pixels, made by the first run and checked against by later ones
+# --output results.json is where the results go (printed if not given)
+# Every result has the seconds and pixels per second of one hot path of the addon, and the checks say whether the faster paths gave the same pixels as the simple ones
+# A golden hash that wasn't in the file yet has the status "recorded" instead of passing, as there was nothing to compare it to
+# createSnapshotMapping is also run with 1 worker, its "scaling" is how many times faster the run across every core was
+# The nearest points the 3D mirror finds on each sphere are checked against blender's BVHTree.find_nearest
+
+import sys
+import os
+import time
+import json
+import argparse
+import hashlib
+import numpy as np
+import bpy
+from mathutils.bvhtree import BVHTree
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__))) # so the addon next to this script is the one imported
+import MirrorAddon
+
+
+# returns the parsed options given after the "--" on blender's command line
+def parseArguments():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description = "Benchmarks the hot paths of the mirror addon")
+    parser.add_argument("--sizes", default = "1024,2048,4096")
+    parser.add_argument("--segments", default = "16,64,256")
+    parser.add_argument("--repeat", type = int, default = 3)
+    parser.add_argument("--stroke", type = float, default = 0.03)
+    parser.add_argument("--lazy-max-size", type = int, default = 2048)
+    parser.add_argument("--float", action = "store_true")
+    parser.add_argument("--golden", default = None)
+    parser.add_argument("--output", default = None)
+    return parser.parse_args(argv)
+
+# Inputs: ------------------
+# function is what is being timed
+# repeat is how many times to run it
+# setup is run before each run without being timed (Ex. resetting the texture), or None
+# Purpose: ----------------
+# returns the fastest time of the runs in seconds and what the last run returned
+def timeBest(function, repeat, setup = None):
+    best = float("inf")
+    result = None
+    for i in range(max(repeat, 1)):
+        if (setup is not None):
+            setup()
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+# Inputs: ------------------
+# size is the width and height of the texture
+# floatBuffer is whether the texture is float instead of 8 bit
+# Purpose: ----------------
+# returns a new image with a smooth pattern on it and its pixels as a (size, size, 4) float32 array
+def makeImage(size, floatBuffer):
+    image = bpy.data.images.new("MirrorBenchmark" + str(size), size, size, alpha = True, float_buffer = floatBuffer)
+    y, x = np.mgrid[0:size, 0:size].astype(np.float32) / size
+    pixels = np.stack([x, y, (x * y) % 1, np.ones_like(x)], axis = 2).astype(np.float32)
+    image.pixels.foreach_set(pixels.reshape(-1))
+    image.pixels.foreach_get(pixels.reshape(-1)) # what the image actually holds (Ex. rounded to 8 bits)
+    return image, pixels
+
+# Inputs: ------------------
+# pixels is the (size, size, 4) float32 array of the image before painting
+# radius is the radius of the dots as a fraction of the size
+# Purpose: ----------------
+# returns a copy of the pixels with a few dots of colour painted on the left half, like a touch up stroke
+def paintStroke(pixels, radius):
+    size = pixels.shape[0]
+    painted = pixels.copy()
+    rng = np.random.default_rng(0) # the same stroke every run so the outputs can be compared to the golden hashes
+    y, x = np.mgrid[0:size, 0:size]
+    for i in range(5):
+        centerX = rng.uniform(0.1, 0.4) * size
+        centerY = rng.uniform(0.1, 0.9) * size
+        inside = (x - centerX) ** 2 + (y - centerY) ** 2 <= (radius * size) ** 2
+        painted[inside] = np.append(rng.uniform(0, 1, 3), 1).astype(np.float32)
+    return painted
+
+# Input: ------------------
+# segments is the number of segments of the UV sphere
+# Purpose: ----------------
+# returns a new UV sphere object (symmetric over x and has a UV map named UVMap) and its number of triangles
+def makeMesh(segments):
+    bpy.ops.mesh.primitive_uv_sphere_add(segments = segments, ring_count = max(segments // 2, 3), location = (0, 0, 0))
+    object = bpy.context.active_object
+    object.data.calc_loop_triangles()
+    return object, len(object.data.loop_triangles)
+
+# Inputs: ------------------
+# meshData is the uvMeshData of a benchmark sphere
+# name is the end of the name of the check
+# count is how many points are looked up
+# Purpose: ----------------
+# returns a check of whether findUVsFromPoints finds the same UVs as blender's BVHTree.find_nearest under the 3D mirror's threshold
+# half of the points are mirrors of points on the sphere (what the 3D mirror looks up), the other half are pushed off of it so neither should find them
+# a UV that differs is only allowed where both found the same point on two triangles (Ex. on a UV seam, where either triangle is right)
+def checkNearestAgainstBVH(meshData, name, count = 5000):
+    threshold = 0.0005
+    tree = BVHTree.FromPolygons(meshData.vertexPositions.tolist(), meshData.triangleVertices.tolist(), all_triangles = True)
+    rng = np.random.default_rng(1)
+    weights = rng.uniform(0.1, 1, (count, 3))
+    weights /= weights.sum(axis = 1, keepdims = True)
+    points = meshData.pointsFromBarycentric(rng.integers(0, len(meshData.triangleVertices), count), weights) * np.array([-1, 1, 1]) # mirrored over x like the 3D mirror
+    points[count // 2:] *= 1 + 10 * threshold # the sphere has a radius of 1, so these are well past the threshold
+    uvs, found = meshData.findUVsFromPoints(points, threshold)
+    triangleNums, weights = meshData.getSurfaceGrid(threshold).findNearest(points)
+    locations = np.zeros((count, 3))
+    locations[found] = meshData.pointsFromBarycentric(triangleNums[found], weights[found])
+    bvhFound = np.zeros(count, dtype = bool)
+    bvhLocations = np.zeros((count, 3))
+    bvhTriangles = np.zeros(count, dtype = np.int64)
+    for i, point in enumerate(points.tolist()):
+        location, normal, index, distance = tree.find_nearest(point, threshold)
+        if (index is not None):
+            bvhFound[i] = True
+            bvhLocations[i] = location
+            bvhTriangles[i] = index
+    bvhUVs = np.zeros((count, 2))
+    bvhWeights = MirrorAddon.closestPointWeights(bvhLocations[bvhFound], meshData.trianglePositions[bvhTriangles[bvhFound]]) # the weights of the point on its own triangle
+    bvhUVs[bvhFound] = meshData.uvsFromBarycentric(bvhTriangles[bvhFound], bvhWeights)
+    both = found & bvhFound
+    uvDiffers = both & np.any(np.abs(uvs - bvhUVs) > 1e-4, axis = 1)
+    samePoint = np.all(np.abs(locations - bvhLocations) < 1e-5, axis = 1)
+    foundMismatches = int(np.count_nonzero(found != bvhFound))
+    uvMismatches = int(np.count_nonzero(uvDiffers & ~samePoint))
+    return {"check": "findUVsFromPoints matches BVHTree.find_nearest " + name, "passed": foundMismatches == 0 and uvMismatches == 0, "points": count, "foundMismatches": foundMismatches, "uvMismatches": uvMismatches, "seamTies": int(np.count_nonzero(uvDiffers & samePoint))}
+
+# returns the sha1 of the image's pixels, used to compare outputs between runs
+def imageHash(image):
+    pixels = np.empty(len(image.pixels), dtype = np.float32)
+    image.pixels.foreach_get(pixels)
+    return hashlib.sha1(pixels.tobytes()).hexdigest()
+
+# returns a result for the JSON output
+def result(name, seconds, pixels, size, triangles = None):
+    return {"benchmark": name, "size": size, "triangles": triangles, "seconds": seconds, "pixels": int(pixels), "pixelsPerSecond": pixels / seconds if seconds > 0 else None}
+
+# Inputs: ------------------
+# options are the parsed options
+# golden is the dictionary of golden hashes, which missing hashes are added to
+# checks is the list the checks are added to
+# Purpose: ----------------
+# runs every benchmark of one texture size, returning the results
+def benchmarkSize(size, options, golden, checks):
+    results = []
+    repeat = options.repeat
+    image, originalPixels = makeImage(size, options.float)
+    changedPixels = paintStroke(originalPixels, options.stroke)
+    def resetToChanged():
+        image.pixels.foreach_set(changedPixels.reshape(-1))
+    def checkGolden(name):
+        digest = imageHash(image)
+        key = name + " " + str(size) + ("f" if options.float else "")
+        if (key not in golden):
+            golden[key] = digest
+            checks.append({"check": "golden " + key, "status": "recorded"})
+        else:
+            checks.append({"check": "golden " + key, "passed": golden[key] == digest})
+
+    # snapshots
+    image.pixels.foreach_set(originalPixels.reshape(-1))
+    seconds, original = timeBest(lambda: MirrorAddon.textureSnapshot(image), repeat)
+    results.append(result("textureSnapshot", seconds, size * size, size))
+    resetToChanged()
+    changed = MirrorAddon.textureSnapshot(image)
+    def forgetChecksums(): # so every run works the checksums out again like the first diff after a capture does
+        original.tileChecksums = [None] * len(original.tiles)
+        changed.tileChecksums = [None] * len(changed.tiles)
+    seconds, diff = timeBest(lambda: original.snapshotDifference(changed), repeat, forgetChecksums)
+    results.append(result("snapshotDifference", seconds, size * size, size))
+    denseIndices = np.flatnonzero(np.any(originalPixels != changedPixels, axis = 2))
+    checks.append({"check": "snapshotDifference matches a dense compare " + str(size), "passed": bool(np.array_equal(diff.indices, denseIndices))})
+
+    # write back of a tall thin stroke, patched into the texture against writing the whole snapshot (the image already holds changed's pixels, so neither changes it)
+    tallStroke = [(size // 2 - 8, 0, size // 2 + 8, size)]
+    seconds, done = timeBest(lambda: changed.writeRegionsToTexture(image, tallStroke), repeat)
+    results.append(result("writeRegionsToTexture (tall stroke)", seconds, 16 * size, size))
+    seconds, done = timeBest(lambda: changed.writeToTexture(image), repeat)
+    results.append(result("writeToTexture", seconds, size * size, size))
+
+    # 2D mirror
+    seconds, done = timeBest(lambda: MirrorAddon.mirrorChangesFromSnapshots2D(original, changed, image, 90, 0.5, 0.5), repeat, resetToChanged)
+    results.append(result("mirrorChangesFromSnapshots2D", seconds, diff.changedCount(), size))
+    checkGolden("mirrorChangesFromSnapshots2D")
+    scatterHash = imageHash(image)
+    seconds, done = timeBest(lambda: MirrorAddon.mirrorChangesFromSnapshots2D(original, changed, image, 90, 0.5, 0.5, method = 'Gather_Nearest'), repeat, resetToChanged)
+    results.append(result("mirrorChangesFromSnapshots2D (gather)", seconds, diff.changedCount(), size))
+    checks.append({"check": "gather 2D mirror matches scatter 2D mirror " + str(size), "passed": imageHash(image) == scatterHash}) # a 90 degree line maps pixels one to one, so both fill the same pixels
+    seconds, done = timeBest(lambda: MirrorAddon.mirrorChangesFromSnapshots2D(original, changed, image, 90, 0.5, 0.5), 1, resetToChanged) # the gap fills below use the scatter's diff
+
+    # gap fills, on the diff the 2D mirror left
+    mirrorDiff = bpy.types.Scene.snapshotDiff
+    mirrored = np.empty(size * size * 4, dtype = np.float32)
+    image.pixels.foreach_get(mirrored)
+    gapFillSnapshot = [None] # the snapshot the gap fill writes into, captured by the untimed setup
+    def resetToMirrored():
+        image.pixels.foreach_set(mirrored)
+        if (gapFillSnapshot[0] is not None):
+            gapFillSnapshot[0].release()
+        gapFillSnapshot[0] = MirrorAddon.textureSnapshot(image)
+    def gapFill(function):
+        function(mirrorDiff, gapFillSnapshot[0])
+        gapFillSnapshot[0].writeToTexture(image)
+    seconds, done = timeBest(lambda: gapFill(MirrorAddon.pixelGapFill), repeat, resetToMirrored)
+    results.append(result("pixelGapFill", seconds, size * size, size))
+    checkGolden("pixelGapFill")
+    seconds, done = timeBest(lambda: gapFill(MirrorAddon.pixelGapFillThreshold), repeat, resetToMirrored)
+    results.append(result("pixelGapFillThreshold", seconds, size * size, size))
+    checkGolden("pixelGapFillThreshold")
+    gapFillSnapshot[0].release()
+
+    # 3D mirror and mappings for each mesh
+    for segments in [int(value) for value in options.segments.split(",")]:
+        object, triangles = makeMesh(segments)
+        bpy.types.Scene.snapshotObject = object
+        bpy.types.Scene.uvMeshDataCache = {}
+        seconds, meshData = timeBest(lambda: MirrorAddon.getUVMeshData(object, "UVMap"), 1)
+        results.append(result("getUVMeshData", seconds, triangles, size, triangles))
+        checks.append(checkNearestAgainstBVH(meshData, str(size) + " " + str(segments)))
+        seconds, mapping = timeBest(lambda: MirrorAddon.createSnapshotMapping(object = object, sizeX = size, sizeY = size, axis = 'x', uv = "UVMap"), repeat)
+        results.append(result("createSnapshotMapping", seconds, size * size, size, triangles))
+        workerSeconds, done = timeBest(lambda: MirrorAddon.createSnapshotMapping(object = object, sizeX = size, sizeY = size, axis = 'x', uv = "UVMap", threads = 1), repeat)
+        results.append(result("createSnapshotMapping (1 worker)", workerSeconds, size * size, size, triangles))
+        results[-2]["scaling"] = workerSeconds / seconds if seconds > 0 else None # how many times faster all of the cores are than one
+        pixelMap, mapHoles = mapping
+        seconds, done = timeBest(lambda: MirrorAddon.mirrorChangesFromSnapshots(original, changed, object, None, image, 'x', "UVMap", pixelMap = pixelMap, pixelMapAxis = 'x', mapHoles = mapHoles), repeat, resetToChanged)
+        results.append(result("mirrorChangesFromSnapshots (mapped)", seconds, diff.changedCount(), size, triangles))
+        mappedHash = imageHash(image)
+        checkGolden("mirrorChangesFromSnapshots inverse " + str(segments)) # the mapping's inverse gathers into every mirrored pixel, so its output differs from the older scatter's hashes
+        if (size <= options.lazy_max_size):
+            # without holes to fill, so it is compared to a mapped mirror that doesn't fill them either
+            seconds, done = timeBest(lambda: MirrorAddon.mirrorChangesFromSnapshots(original, changed, object, None, image, 'x', "UVMap", pixelMap = None, pixelMapAxis = None), 1, resetToChanged)
+            results.append(result("mirrorChangesFromSnapshots (lazy)", seconds, diff.changedCount(), size, triangles))
+            lazyHash = imageHash(image)
+            resetToChanged()
+            MirrorAddon.mirrorChangesFromSnapshots(original, changed, object, None, image, 'x', "UVMap", pixelMap = pixelMap, pixelMapAxis = 'x', mapHoles = None)
+            checks.append({"check": "mapped mirror matches lazy mirror " + str(size) + " " + str(segments), "passed": imageHash(image) == lazyHash})
+        bpy.data.objects.remove(object, do_unlink = True)
+    bpy.data.images.remove(image)
+    return results
+
+def main():
+    options = parseArguments()
+    MirrorAddon.timeDebug = False # the results replace the prints
+    MirrorAddon.register()
+    golden = {}
+    if (options.golden is not None and os.path.exists(options.golden)):
+        with open(options.golden) as file:
+            golden = json.load(file)
+    results = []
+    checks = []
+    try:
+        for size in [int(value) for value in options.sizes.split(",")]:
+            results += benchmarkSize(size, options, golden, checks)
+    finally:
+        MirrorAddon.unregister()
+    if (options.golden is not None):
+        with open(options.golden, "w") as file:
+            json.dump(golden, file, indent = 1, sort_keys = True)
+    output = {"blender": bpy.app.version_string, "float": options.float, "results": results, "checks": checks}
+    if (options.output is not None):
+        with open(options.output, "w") as file:
+            json.dump(output, file, indent = 1)
+    else:
+        print(json.dumps(output, indent = 1))
+    if (not all(check.get("passed", True) for check in checks)): # recorded golden hashes had nothing to fail against
+        print("Error: the outputs of some checks did not match")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()